@@ -2,11 +2,35 @@ from __future__ import annotations
 
 import argparse
 import time
-from typing import Any
+from collections import deque
+from typing import Any, NamedTuple
 
+from adapters.time import FakeClockPort, FakeSleeperPort
+from domain.agent import FixedRateScheduler
+from domain.agent.service import fill_percent
+from domain.input import HumanPreemption, InputExecutor, PrecisionSleeper
+from ports.logs import LogEvent
+from ports.vision import ROI, Frame
 from shared.config.loader import load_agent_settings
+from shared.utils.merge import StreamMerge, queue_source
 
-from apps.agent.compose import build_ipc
+from apps.agent.compose import (
+    RecordingTelemetryPub,
+    build_human_input,
+    build_input,
+    build_ipc,
+    build_log_matcher,
+    build_log_tail,
+    build_template_library,
+    build_vision,
+    build_vision_scheduler,
+)
+
+
+class _Captured(NamedTuple):
+    ts: float
+    roi: ROI | None
+    frame: Frame
 
 
 class _AgentState:
@@ -16,7 +40,9 @@ class _AgentState:
         self.hold: bool = False
 
 
-def _make_dispatcher(telem_pub, agent_id: str, state: _AgentState):
+def _make_dispatcher(
+    telem_pub, agent_id: str, state: _AgentState, executor: InputExecutor | None = None
+):
     """Return a function(cmd_dict)->dict that handles
     PING/HOLD/RESUME and tags telemetry with agent_id."""
 
@@ -35,10 +61,14 @@ def _make_dispatcher(telem_pub, agent_id: str, state: _AgentState):
             return {"pong": True, "agent_id": agent_id, "hold": state.hold}
         if ctype == "HOLD":
             state.hold = True
+            if executor is not None:
+                executor.hold()
             _publish("state", {"state": "HOLD", "hold": True})
             return {"ok": True, "agent_id": agent_id, "hold": True}
         if ctype == "RESUME":
             state.hold = False
+            if executor is not None:
+                executor.resume()
             _publish("state", {"state": "RUN", "hold": False})
             return {"ok": True, "agent_id": agent_id, "hold": False}
         # Unknown command
@@ -52,6 +82,14 @@ def main() -> int:
     ap = argparse.ArgumentParser(prog="eventful-qualm-agent")
     ap.add_argument("--tick-ms", type=int, default=10, help="Loop sleep between polls.")
     ap.add_argument("--quiet", action="store_true", help="Reduce console output.")
+    ap.add_argument("--record", metavar="PATH", help="Record frames + telemetry to an .everrec.")
+    ap.add_argument(
+        "--record-frames",
+        choices=("raw", "hash", "store"),
+        default="raw",
+        help="Frame pixels in the bundle, hashes only, or a deduplicating store shared "
+        "by every bundle in the same directory.",
+    )
     args = ap.parse_args()
 
     settings = load_agent_settings()  # uses your loader/env/profile
@@ -65,12 +103,82 @@ def main() -> int:
             f"agent_id={settings.agent_id}"
         )
 
+    clock = FakeClockPort()
+    recorder = None
+    if args.record:
+        from shared.utils.everrec import EverrecWriter
+
+        recorder = EverrecWriter(
+            args.record,
+            frames=args.record_frames,
+            meta={"agent_id": settings.agent_id, "roi_profile": settings.roi_profile},
+        ).start()
+        telem_pub = RecordingTelemetryPub(telem_pub, recorder, clock)
+
     state = _AgentState()
-    handle = _make_dispatcher(telem_pub, settings.agent_id, state)
+    executor = build_input(settings, clock)
+    handle = _make_dispatcher(telem_pub, settings.agent_id, state, executor)
+
+    # Human input holds the agent from the hook's own thread, without waiting
+    # for a tick. The publisher socket belongs to this loop, so the state event
+    # is queued and sent from here.
+    preempt_events: deque[tuple[str, dict[str, Any]]] = deque()
+    human = build_human_input(settings)
+    preempt = None
+    if human is not None:
+
+        def _set_hold() -> None:
+            state.hold = True
+
+        preempt = HumanPreemption(
+            human,
+            executor,
+            clock,
+            publish=lambda topic, payload: preempt_events.append(
+                (topic, {"agent_id": settings.agent_id, **payload})
+            ),
+            on_hold=_set_hold,
+        )
+
+    capture, bars = build_vision(settings)
+    templates = build_template_library(settings)  # manifest/bundle opened on first match
+    vision = build_vision_scheduler(settings, clock, capture, bars, templates)
+    log_tail = build_log_tail(settings)
+    log_matcher = build_log_matcher(settings) if log_tail is not None else None
+    log_lines = log_events = 0
+
+    # Frames and log events are handled in timestamp order, whichever poll produced them.
+    frame_q: deque[_Captured] = deque()
+    event_q: deque[LogEvent] = deque()
+    observations: StreamMerge[_Captured | LogEvent] = StreamMerge()
+    frames_src, events_src = queue_source(frame_q), queue_source(event_q)
+    observations.add("frames", frames_src)
+    observations.add("log_events", events_src)
+    if recorder is not None:
+
+        def _capture(roi: ROI | None, frame: Frame) -> None:
+            frame_q.append(_Captured(frame.ts, roi, frame))
 
-    hb_period_s = 1.0 / max(getattr(settings, "heartbeat_hz", 1.0), 0.1)
-    next_hb = time.monotonic() + hb_period_s
+        vision.on_frame = _capture
+
+    def _observe(obs: _Captured | LogEvent) -> None:
+        if isinstance(obs, _Captured):
+            if recorder is not None:
+                recorder.frame(obs.ts, obs.frame.rgba, obs.roi)
+        else:
+            # captures are nested so a group named agent_id/kind can't overwrite those keys
+            telem_pub.publish(
+                "log_event",
+                {"agent_id": settings.agent_id, "kind": obs.kind, "fields": dict(obs.fields)},
+            )
+
+    # heartbeats on an absolute grid: a late poll doesn't push the next one back
+    heartbeat = FixedRateScheduler(
+        clock, FakeSleeperPort(), max(getattr(settings, "heartbeat_hz", 1.0), 0.1)
+    )
     tick_s = max(args.tick_ms, 1) / 1000.0
+    # plain sleeps between polls; spin only when waking for a key release
+    precise = PrecisionSleeper(clock, FakeSleeperPort(), settings.input_spin_ms / 1000.0)
 
     try:
         while True:
@@ -80,18 +188,80 @@ def main() -> int:
                 if not args.quiet:
                     print(f"[agent] handler error: {ex!r}")
 
-            now = time.monotonic()
-            if now >= next_hb:
-                # periodic heartbeat
+            try:
+                vision.run_pending(budget_s=tick_s)
+            except Exception as ex:
+                if not args.quiet:
+                    print(f"[agent] vision error: {ex!r}")
+
+            if log_tail is not None:
+                try:
+                    lines = log_tail.read_batch()
+                    log_lines += len(lines)
+                    if recorder is not None:
+                        for line in lines:
+                            recorder.log(clock.now(), line)
+                    if log_matcher is not None and lines:
+                        events = log_matcher.match_batch(lines, clock.now())
+                        log_events += len(events)
+                        event_q.extend(events)
+                except OSError as ex:
+                    if not args.quiet:
+                        print(f"[agent] log tail error: {ex!r}")
+
+            try:
+                for _, obs in observations.drain(clock.now()):
+                    _observe(obs)
+            except Exception as ex:
+                if not args.quiet:
+                    print(f"[agent] observation error: {ex!r}")
+
+            while preempt_events:
+                try:
+                    telem_pub.publish(*preempt_events.popleft())
+                except Exception:
+                    pass
+
+            try:
+                executor.pump()
+            except Exception as ex:
+                if not args.quiet:
+                    print(f"[agent] input error: {ex!r}")
+
+            if heartbeat.due():
+                # periodic heartbeat (+ schedule jitter, vision rates/skips)
                 try:
+                    vstats = vision.stats()
                     telem_pub.publish(
-                        "heartbeat", {"ok": True, "agent_id": settings.agent_id, "hold": state.hold}
+                        "heartbeat",
+                        {
+                            "ok": True,
+                            "agent_id": settings.agent_id,
+                            "hold": state.hold,
+                            # fastest vision task's measured rate: how often frames are analyzed
+                            "fps": max((t["actual_hz"] for t in vstats.values()), default=0.0),
+                            "hp": fill_percent(vision.latest.get("hp")),
+                            "mana": fill_percent(vision.latest.get("mana")),
+                            "templates": vision.latest.get("templates"),
+                            "log_lines": log_lines,
+                            "log_events": log_events,
+                            "tick": heartbeat.stats(),
+                            "input": {**executor.stats(), **precise.stats()},
+                            "preempt": preempt.stats() if preempt is not None else None,
+                        },
                     )
+                    telem_pub.publish("vision", {"agent_id": settings.agent_id, "tasks": vstats})
                 except Exception:
                     pass
-                next_hb = now + hb_period_s
+                heartbeat.done()
 
-            time.sleep(tick_s)
+            now = clock.now()
+            wake = min(now + tick_s, heartbeat.next_deadline)
+            input_due = executor.next_due()
+            if input_due is not None and input_due <= wake:
+                precise.sleep_until(input_due)
+            else:
+                time.sleep(max(0.0, wake - now))
     except KeyboardInterrupt:
         if not args.quiet:
             print("\n[agent] shutting down...")
@@ -100,6 +270,10 @@ def main() -> int:
             cmd_server.close()
         except Exception:
             pass
+        if log_tail is not None:
+            log_tail.close()
+        if recorder is not None:
+            recorder.close()
     return 0
 
 
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from domain.agent.vision import VisionScheduler, VisionTask
+from domain.input import InputExecutor
+from ports.input import HumanInputPort
 from ports.ipc import CommandServerPort, TelemetryPubPort
+from ports.logs import LogTailPort
+from ports.time import ClockPort
+from ports.vision import ROI, Frame, ScreenCapturePort
+from shared.config.loader import load_roi_profile
 
 from apps.agent.settings import AgentSettings
 
+if TYPE_CHECKING:
+    from adapters.logs_tail import LogEventMatcher
+    from adapters.vision_numpy import NumpyBarReader, TemplateLibrary
+    from shared.utils.everrec import EverrecWriter
+
 
 def build_ipc(settings: AgentSettings) -> tuple[CommandServerPort, TelemetryPubPort]:
     cmd_server: CommandServerPort
@@ -21,3 +36,145 @@ def build_ipc(settings: AgentSettings) -> tuple[CommandServerPort, TelemetryPubP
         telem_pub = InprocTelemetryPubPort.create()
 
     return cmd_server, telem_pub
+
+
+def build_vision(settings: AgentSettings) -> tuple[ScreenCapturePort, NumpyBarReader]:
+    """Capture + bar gauges calibrated from the `roi_profile` (configs/rois/*.toml)."""
+    from adapters.dx_capture import FakeScreenCapturePort
+    from adapters.vision_numpy import NumpyBarReader
+
+    capture: ScreenCapturePort = FakeScreenCapturePort()
+    bars = NumpyBarReader.from_profile(load_roi_profile(settings.roi_profile))
+    return capture, bars
+
+
+def build_log_tail(settings: AgentSettings) -> LogTailPort | None:
+    """Follower for the game log at `log_path`; None when log tailing is off."""
+    if not settings.log_path:
+        return None
+    from adapters.logs_tail import FileTailLogPort
+
+    return FileTailLogPort(
+        settings.log_path,
+        offset_path=settings.log_offset_path,
+        from_start=settings.log_from_start,
+    )
+
+
+def build_log_matcher(settings: AgentSettings) -> LogEventMatcher | None:
+    """Event rules compiled from `log_rules`; None when no rules are configured."""
+    if not settings.log_rules:
+        return None
+    from adapters.logs_tail import LogEventMatcher
+
+    return LogEventMatcher.from_toml(settings.log_rules)
+
+
+def build_input(settings: AgentSettings, clock: ClockPort) -> InputExecutor:
+    """Rate-limited, batching executor in front of the keyboard/mouse port."""
+    from adapters.win_input import FakeKeyboardMousePort
+
+    return InputExecutor(
+        FakeKeyboardMousePort(),
+        clock,
+        max_rate_hz=settings.input_max_rate_hz,
+        burst=settings.input_burst,
+        tap_ms=settings.input_tap_ms,
+    )
+
+
+def build_human_input(settings: AgentSettings) -> HumanInputPort | None:
+    """Source of human keyboard/mouse activity; None when preemption is off."""
+    if not settings.human_preempt:
+        return None
+    from adapters.win_input import FakeHumanInputPort
+
+    return FakeHumanInputPort()
+
+
+def build_template_library(settings: AgentSettings) -> TemplateLibrary | None:
+    """Lazy handle on the compiled template bundle; no I/O until first match."""
+    if not settings.template_library:
+        return None
+    from adapters.vision_numpy import TemplateLibrary
+
+    return TemplateLibrary(settings.template_library)
+
+
+def build_vision_scheduler(
+    settings: AgentSettings,
+    clock: ClockPort,
+    capture: ScreenCapturePort,
+    bars: NumpyBarReader,
+    templates: TemplateLibrary | None = None,
+) -> VisionScheduler:
+    """
+    One task per calibrated bar, at the profile's `rate_hz` / `priority`, plus
+    a "templates" task matching the library in one pass per frame when given
+    (profile `[templates]`: rate_hz, priority, roi, threshold, names).
+    """
+    profile = load_roi_profile(settings.roi_profile)
+    sched = VisionScheduler(clock, capture)
+    for name, table in (profile.get("bars", {}) or {}).items():
+        sched.add(
+            VisionTask(
+                name=name,
+                rate_hz=float(table.get("rate_hz", settings.heartbeat_hz)),
+                priority=int(table.get("priority", 0)),
+                analyze=_bar_analyzer(bars, name),
+            )
+        )
+    if templates is not None:
+        table = profile.get("templates", {}) or {}
+        roi = ROI(*table["roi"]) if "roi" in table else None
+        sched.add(
+            VisionTask(
+                name="templates",
+                rate_hz=float(table.get("rate_hz", settings.heartbeat_hz)),
+                priority=int(table.get("priority", 1)),
+                roi=roi,
+                analyze=_template_analyzer(
+                    templates, table.get("names"), float(table.get("threshold", 0.9)), roi
+                ),
+            )
+        )
+    return sched
+
+
+def _bar_analyzer(bars: NumpyBarReader, name: str) -> Callable[[Frame], float | None]:
+    def analyze(frame: Frame) -> float | None:
+        return bars.read_one(frame.rgba, name)
+
+    return analyze
+
+
+class RecordingTelemetryPub(TelemetryPubPort):
+    """Publishes as usual and tees every message into an .everrec recorder."""
+
+    def __init__(self, inner: TelemetryPubPort, recorder: EverrecWriter, clock: ClockPort) -> None:
+        self._inner = inner
+        self._recorder = recorder
+        self._clock = clock
+
+    def publish(self, topic: str, payload: Mapping[str, Any]) -> None:
+        self._inner.publish(topic, payload)
+        self._recorder.telemetry(self._clock.now(), topic, payload)
+
+
+def _template_analyzer(
+    library: TemplateLibrary, names: list[str] | None, threshold: float, roi: ROI | None
+) -> Callable[[Frame], dict[str, list[float]] | None]:
+    """{name: [x, y, score]} (frame coordinates) for templates scoring >= threshold."""
+    dx, dy = (roi.x, roi.y) if roi is not None else (0, 0)
+
+    def analyze(frame: Frame) -> dict[str, list[float]] | None:
+        if frame.rgba is None:
+            return None
+        hits = library.match_all(frame.rgba, names)
+        return {
+            name: [r.x + dx, r.y + dy, round(r.score, 4)]
+            for name, r in hits.items()
+            if r is not None and r.score >= threshold
+        }
+
+    return analyze
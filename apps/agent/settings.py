@@ -14,6 +14,27 @@ class AgentSettings(BaseSettings):
     # choose transport impl
     ipc_impl: Literal["inproc", "zmq"] = "inproc"
 
+    # ROI profile under configs/rois/ (calibrated bars, anchors, ...)
+    roi_profile: str = "1600x900"
+    # compiled template bundle dir (see apps/tools/template_lib); opened lazily
+    template_library: str | None = None
+
+    # game log to follow (None = off); the offset file lets restarts resume in place
+    log_path: str | None = None
+    log_offset_path: str | None = None
+    log_from_start: bool = False
+    # TOML of [[rule]] tables turning log lines into events (see adapters.logs_tail.events)
+    log_rules: str | None = None
+
+    # input executor: actions/s admitted (bursts up to input_burst), default tap length
+    input_max_rate_hz: float = 30.0
+    input_burst: int = 4
+    input_tap_ms: float = 45.0
+    # spin this long before an input deadline instead of trusting the OS sleep
+    input_spin_ms: float = 2.0
+    # hold (and release every key) as soon as the human touches keyboard/mouse
+    human_preempt: bool = True
+
     # Already present in your profiles:
     cmd_bind: str = "tcp://127.0.0.1:7788"
     telem_bind: str = "tcp://127.0.0.1:7789"
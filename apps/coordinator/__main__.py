@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import sys
 import time
 from types import SimpleNamespace
 
 from shared.config.loader import load_coordinator_settings
 
-from apps.coordinator.compose import build_ipc
+from apps.coordinator.compose import build_archive, build_ipc
+from apps.coordinator.stats import CoordinatorStats
 
 
 def main() -> int:
@@ -25,6 +27,9 @@ def main() -> int:
     ap.add_argument("--hold", metavar="AGENT", help="Send HOLD to agent and exit.")
     ap.add_argument("--resume", metavar="AGENT", help="Send RESUME to agent and exit.")
     ap.add_argument("--tui", action="store_true", help="Run the Textual TUI.")
+    ap.add_argument(
+        "--archive", metavar="DIR", help="Persist received telemetry (default: EVQ_ARCHIVE_DIR)."
+    )
     args = ap.parse_args()
     topics = {t.strip() for t in args.topics.split(",") if t.strip()} if args.topics else set()
 
@@ -32,7 +37,7 @@ def main() -> int:
         # Launch the TUI app; it builds its own IPC via the loader.
         from apps.coordinator.tui import CoordinatorTUI
 
-        app = CoordinatorTUI()
+        app = CoordinatorTUI(archive_dir=args.archive)
         app.run()
         return 0
 
@@ -81,11 +86,32 @@ def main() -> int:
 
     # Telemetry tail
     if args.watch:
+        archive = build_archive(settings, args.archive)
+        stats = CoordinatorStats(
+            settings.stats_window, settings.stats_rate_window_s, settings.heartbeat_hz
+        )
+        next_digest = time.monotonic() + settings.stats_print_s
+        archive_failing = False
         try:
             while True:
                 msg = telem_sub.recv(timeout_ms=250)
+                now = time.monotonic()
+                if settings.stats_print_s > 0 and now >= next_digest:
+                    for agent_id in stats.agents:
+                        print(f"[coord] STATS {stats.format_line(agent_id, now)}")
+                    next_digest = now + settings.stats_print_s
                 if not msg:
                     continue
+                if archive is not None:
+                    try:
+                        archive.record(msg)  # everything, regardless of --topics
+                        archive_failing = False
+                    except Exception as ex:
+                        if not archive_failing:  # once per failure streak, not per message
+                            print(f"[coord] archive write failed: {ex!r}", file=sys.stderr)
+                        archive_failing = True
+                data = msg.get("data") or {}
+                stats.observe(str(data.get("agent_id") or "?"), msg.get("topic"), data, now)
                 if topics and msg.get("topic") not in topics:
                     continue
                 if not args.quiet:
@@ -94,6 +120,9 @@ def main() -> int:
             if not args.quiet:
                 print("\n[coord] exiting.")
             return 0
+        finally:
+            if archive is not None:
+                archive.close()
 
     return 0
 
@@ -1,7 +1,14 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from ports.ipc import AgentCommandPort, TelemetrySubPort
 
 from apps.coordinator.settings import CoordinatorSettings
 
+if TYPE_CHECKING:
+    from shared.telemetry.archive import TelemetryArchive
+
 
 def build_ipc(settings: CoordinatorSettings) -> tuple[AgentCommandPort, TelemetrySubPort]:
     cmd: AgentCommandPort
@@ -20,3 +27,19 @@ def build_ipc(settings: CoordinatorSettings) -> tuple[AgentCommandPort, Telemetr
         cmd = InprocAgentCommandPort.create()
         telem_sub = InprocTelemetrySubPort.create()
     return cmd, telem_sub
+
+
+def build_archive(
+    settings: CoordinatorSettings, path: str | None = None
+) -> TelemetryArchive | None:
+    """Telemetry archive at `path` (or settings.archive_dir); None when archiving is off."""
+    target = path or settings.archive_dir
+    if not target:
+        return None
+    from shared.telemetry.archive import TelemetryArchive
+
+    return TelemetryArchive(
+        target,
+        segment_rows=settings.archive_segment_rows,
+        segment_s=settings.archive_segment_s,
+    )
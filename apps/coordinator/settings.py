@@ -9,9 +9,22 @@ class CoordinatorSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="EVQ_", extra="ignore")
 
     refresh_hz: float = 5.0
+    # agents' heartbeat rate (same as their profiles): staleness and jitter are measured against it
+    heartbeat_hz: float = 5.0
 
     # choose transport impl
     ipc_impl: Literal["inproc", "zmq"] = "inproc"
 
     agents_cmd: dict[str, str] = {}  # name -> REQ endpoint
     telem_subs: list[str] = []  # list of SUB endpoints
+
+    # per-agent rolling stats: samples kept per metric, message-rate window
+    stats_window: int = 256
+    stats_rate_window_s: float = 10.0
+    # --watch prints a per-agent stats digest this often (0 = never)
+    stats_print_s: float = 5.0
+
+    # optional telemetry archive (columnar segments; see shared.telemetry.archive)
+    archive_dir: str | None = None
+    archive_segment_rows: int = 50_000
+    archive_segment_s: float = 300.0
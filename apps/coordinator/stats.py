@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+
+
+class Ring:
+    """
+    The last `size` samples of one metric. `push()` is O(1); the summary is
+    computed from the (bounded) window on demand and cached until the next
+    push, so a table redrawing at a few Hz never re-derives it per message.
+    """
+
+    __slots__ = ("_buf", "_n", "_i", "_summary")
+
+    def __init__(self, size: int = 256) -> None:
+        self._buf = np.zeros(max(1, int(size)), dtype=np.float64)
+        self._n = 0
+        self._i = 0
+        self._summary: dict[str, float] | None = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def push(self, value: float) -> None:
+        self._buf[self._i] = value
+        self._i = (self._i + 1) % self._buf.shape[0]
+        self._n = min(self._n + 1, self._buf.shape[0])
+        self._summary = None
+
+    @property
+    def last(self) -> float | None:
+        return float(self._buf[self._i - 1]) if self._n else None
+
+    def values(self) -> np.ndarray:
+        """The window, oldest first."""
+        if self._n < self._buf.shape[0]:
+            return self._buf[: self._n].copy()
+        return np.roll(self._buf, -self._i)
+
+    def summary(self) -> dict[str, float]:
+        """count, p50, p95, max and last over the window ({} when empty)."""
+        if self._summary is None:
+            if not self._n:
+                self._summary = {}
+            else:
+                window = self._buf[: self._n]
+                p50, p95 = np.percentile(window, (50, 95))
+                self._summary = {
+                    "count": float(self._n),
+                    "p50": float(p50),
+                    "p95": float(p95),
+                    "max": float(window.max()),
+                    "last": float(self._buf[self._i - 1]),
+                }
+        return self._summary
+
+
+class RateMeter:
+    """
+    Events per second over the last `window_s`, in `buckets` time slices:
+    `add()` bumps the current slice (O(1), old slices are zeroed as time
+    moves on), `rate()` sums at most `buckets` counters.
+    """
+
+    __slots__ = ("window_s", "_width", "_counts", "_slot", "_first")
+
+    def __init__(self, window_s: float = 10.0, buckets: int = 10) -> None:
+        self.window_s = max(float(window_s), 1e-3)
+        self._counts = [0] * max(1, int(buckets))
+        self._width = self.window_s / len(self._counts)
+        self._slot: int | None = None
+        self._first: float | None = None
+
+    def _advance(self, now: float) -> int:
+        slot = math.floor(now / self._width)
+        if self._slot is None:
+            self._slot = slot
+        elif slot > self._slot:
+            n = len(self._counts)
+            for s in range(self._slot + 1, min(slot, self._slot + n) + 1):
+                self._counts[s % n] = 0
+            self._slot = slot
+        return self._slot
+
+    def add(self, now: float, n: int = 1) -> None:
+        if self._first is None:
+            self._first = now
+        self._counts[self._advance(now) % len(self._counts)] += n
+
+    def rate(self, now: float) -> float:
+        if self._first is None:
+            return 0.0
+        self._advance(now)
+        span = min(self.window_s, now - self._first)
+        return sum(self._counts) / span if span > 0 else 0.0
+
+
+class AgentStats:
+    """Rolling windows for one agent; see `CoordinatorStats`."""
+
+    __slots__ = ("hb_interval", "hb_jitter", "rtt", "fps", "messages", "last_hb", "period")
+
+    def __init__(self, window: int, rate_window_s: float) -> None:
+        self.hb_interval = Ring(window)
+        self.hb_jitter = Ring(window)
+        self.rtt = Ring(window)
+        self.fps = Ring(window)
+        self.messages = RateMeter(rate_window_s)
+        self.last_hb: float | None = None
+        self.period: float | None = None  # smoothed heartbeat interval
+
+
+class CoordinatorStats:
+    """
+    Per-agent rolling statistics, updated in O(1) per telemetry message.
+
+    Keeps fixed-size windows (`window` samples) of heartbeat interval and
+    jitter, command round-trip time and reported fps, plus a message-rate
+    meter over `rate_window_s`. Heartbeat jitter is how far each interval
+    lands from the expected period: 1 / `heartbeat_hz` when given, else a
+    smoothed average of the agent's own intervals.
+
+    `summary()` reports windowed p50/p95/max (ms for times) and rates
+    without touching history older than the window.
+    """
+
+    def __init__(
+        self, window: int = 256, rate_window_s: float = 10.0, heartbeat_hz: float | None = None
+    ) -> None:
+        self.window = max(1, int(window))
+        self.rate_window_s = float(rate_window_s)
+        self.expected_period = 1.0 / heartbeat_hz if heartbeat_hz else None
+        self._agents: dict[str, AgentStats] = {}
+
+    def agent(self, agent_id: str) -> AgentStats:
+        stats = self._agents.get(agent_id)
+        if stats is None:
+            stats = self._agents[agent_id] = AgentStats(self.window, self.rate_window_s)
+        return stats
+
+    @property
+    def agents(self) -> list[str]:
+        return sorted(self._agents)
+
+    def observe(
+        self, agent_id: str, topic: str | None, data: Mapping[str, Any], now: float
+    ) -> None:
+        """Fold one telemetry message (received at monotonic `now`) into the agent's windows."""
+        a = self.agent(agent_id)
+        a.messages.add(now)
+        if topic == "heartbeat":
+            if a.last_hb is not None:
+                interval = now - a.last_hb
+                a.hb_interval.push(interval)
+                expected = self.expected_period
+                if expected is None:
+                    a.period = interval if a.period is None else 0.9 * a.period + 0.1 * interval
+                    expected = a.period
+                a.hb_jitter.push(abs(interval - expected))
+            a.last_hb = now
+        fps = data.get("fps")
+        if fps is not None:
+            try:
+                a.fps.push(float(fps))
+            except (TypeError, ValueError):
+                pass
+
+    def command_rtt(self, agent_id: str, rtt_s: float) -> None:
+        self.agent(agent_id).rtt.push(rtt_s)
+
+    def summary(self, agent_id: str, now: float) -> dict[str, float | None]:
+        """Flat per-agent numbers; None where a metric has no samples yet."""
+        a = self.agent(agent_id)
+        out: dict[str, float | None] = {"msg_rate": a.messages.rate(now)}
+        for name, ring, scale in (
+            ("hb_interval", a.hb_interval, 1e3),
+            ("hb_jitter", a.hb_jitter, 1e3),
+            ("rtt", a.rtt, 1e3),
+            ("fps", a.fps, 1.0),
+        ):
+            s = ring.summary()
+            unit = "_ms" if scale != 1.0 else ""
+            for stat in ("p50", "p95", "max"):
+                v = s.get(stat)
+                out[f"{name}_{stat}{unit}"] = v * scale if v is not None else None
+        return out
+
+    def summaries(self, now: float) -> dict[str, dict[str, float | None]]:
+        return {agent_id: self.summary(agent_id, now) for agent_id in self.agents}
+
+    def format_line(self, agent_id: str, now: float) -> str:
+        """One-line digest for `--watch`: rates, then p50/p95/max per metric."""
+        s = self.summary(agent_id, now)
+
+        def trio(name: str, unit: str = "_ms") -> str:
+            vals = [s.get(f"{name}_{k}{unit}") for k in ("p50", "p95", "max")]
+            return "/".join(f"{v:.1f}" for v in vals) if None not in vals else "-"
+
+        return (
+            f"{agent_id}: {s['msg_rate'] or 0.0:.1f} msg/s • hb {trio('hb_interval')} ms"
+            f" • jitter {trio('hb_jitter')} ms • rtt {trio('rtt')} ms • fps {trio('fps', '')}"
+        )
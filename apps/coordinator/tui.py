@@ -5,21 +5,30 @@ import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
-from typing import cast
 
 from rich.text import Text
 from shared.config.loader import load_coordinator_settings
 from textual.app import App, ComposeResult
+from textual.coordinate import Coordinate
 from textual.reactive import reactive
 from textual.widgets import DataTable, Footer, Header, Static
 
-from apps.coordinator.compose import build_ipc
+from apps.coordinator.compose import build_archive, build_ipc
+from apps.coordinator.stats import CoordinatorStats
 
 
 def _utc_now_iso() -> str:
     return datetime.now(UTC).replace(microsecond=0).isoformat()
 
 
+def _trio(summary: dict[str, float | None], name: str) -> str:
+    """'p50/p95/max' of a `CoordinatorStats` time metric, in ms."""
+    vals = [summary.get(f"{name}_{k}_ms") for k in ("p50", "p95", "max")]
+    if any(v is None for v in vals):
+        return "-"
+    return "/".join(f"{v:.0f}" for v in vals if v is not None)
+
+
 # helper for safe dt age
 def _age_seconds(ts: datetime | None) -> float | None:
     if not ts:
@@ -27,6 +36,20 @@ def _age_seconds(ts: datetime | None) -> float | None:
     return (datetime.now(UTC) - ts).total_seconds()
 
 
+# (column key, header); the key doubles as the DataTable column key
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("agent", "Agent"),
+    ("last", "Last Seen (UTC)"),
+    ("state", "State"),
+    ("heartbeats", "Heartbeats"),
+    ("fps", "FPS"),
+    ("rate", "Msg/s"),
+    ("jitter", "HB Jitter ms p50/p95/max"),
+    ("rtt", "RTT ms p50/p95/max"),
+    ("endpoint", "Endpoint"),
+)
+
+
 @dataclass
 class AgentRow:
     name: str
@@ -53,11 +76,18 @@ class CoordinatorTUI(App):
     # UI state
     rows: reactive[dict[str, AgentRow]] = reactive(dict)
 
-    def __init__(self) -> None:
+    def __init__(self, archive_dir: str | None = None) -> None:
         super().__init__()
         # Load settings and build IPC
         self.settings = load_coordinator_settings()
         self.cmd_port, self.sub_port = build_ipc(self.settings)
+        self.archive = build_archive(self.settings, archive_dir)
+        self._archive_lock = threading.Lock()  # record() on the telemetry thread vs close()
+        self.stats = CoordinatorStats(
+            window=getattr(self.settings, "stats_window", 256),
+            rate_window_s=getattr(self.settings, "stats_rate_window_s", 10.0),
+            heartbeat_hz=getattr(self.settings, "heartbeat_hz", None),
+        )
         self._sub_thread: threading.Thread | None = None
         self._stop = threading.Event()
         self._table: DataTable | None = None
@@ -71,6 +101,18 @@ class CoordinatorTUI(App):
         self._ttl_factor: float = getattr(ui, "ttl_factor", 3.0)
         self._sort_mode: str = "last"  # last | agent | state
 
+        # Incremental rendering: the telemetry thread only marks rows dirty; a
+        # timer at `refresh_hz` pushes changed cells to the table.
+        self._refresh_hz: float = max(float(getattr(self.settings, "refresh_hz", 5.0)), 0.1)
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._rendered: dict[str, dict[str, object]] = {}  # row -> column -> last cell
+        self._sort_keys: dict[str, object] = {}
+        self._status_rendered: str | None = None
+        self.redraws = 0
+        self.cell_updates = 0
+        self.resorts = 0
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         yield Static(
@@ -78,7 +120,8 @@ class CoordinatorTUI(App):
                                                                     .join(self.settings.agents_cmd.keys())}"
         )
         table = DataTable(zebra_stripes=True)
-        table.add_columns("Agent", "Last Seen (UTC)", "State", "Heartbeats", "FPS", "Endpoint")
+        for key, label in COLUMNS:
+            table.add_column(label, key=key)
         self._table = table
         # status bar under table (dynamic)
         self._status = Static("")
@@ -92,6 +135,7 @@ class CoordinatorTUI(App):
             name: AgentRow(name=name, cmd_ep=ep) for name, ep in self.settings.agents_cmd.items()
         }
         self._refresh_table()
+        self.set_interval(1.0 / self._refresh_hz, self._redraw)
 
         # Start telemetry reader
         self._stop.clear()
@@ -105,6 +149,11 @@ class CoordinatorTUI(App):
         self._stop.set()
         if self._sub_thread and self._sub_thread.is_alive():
             self._sub_thread.join(timeout=1.0)
+        # The thread may still be inside record() if the join timed out.
+        with self._archive_lock:
+            archive, self.archive = self.archive, None
+            if archive is not None:
+                archive.close()
 
     # ----- Actions (key bindings) -----
 
@@ -115,11 +164,11 @@ class CoordinatorTUI(App):
         if not self._table or not self.rows:
             return None
         row_idx = self._table.cursor_row
-        # respect current visible ordering
-        keys = [r.name for r in self._sorted_rows()]
-        if 0 <= row_idx < len(keys):
-            return cast(AgentRow, self.rows[keys[row_idx]])
-        return None
+        if not 0 <= row_idx < self._table.row_count:
+            return None
+        # rows are keyed by agent name, whatever order they are shown in
+        key = self._table.coordinate_to_cell_key(Coordinate(row_idx, 0)).row_key.value
+        return self.rows.get(key) if key is not None else None
 
     def action_refresh(self) -> None:
         self._refresh_table()
@@ -136,7 +185,9 @@ class CoordinatorTUI(App):
     def action_sort(self) -> None:
         self._sort_mode = {"last": "agent", "agent": "state", "state": "last"}[self._sort_mode]
         self.notify(f"Sort: {self._sort_mode}", severity="information")
-        self._refresh_table()
+        self._sort_keys = {name: self._sort_key(row) for name, row in self.rows.items()}
+        self._resort()
+        self._update_status()
 
     def action_help(self) -> None:
         self.notify(
@@ -154,7 +205,11 @@ class CoordinatorTUI(App):
         try:
             t0 = time.perf_counter()
             resp = self.cmd_port.send(ag.cmd_ep, SimpleNamespace(type=ctype))
-            dt_ms = int((time.perf_counter() - t0) * 1000)
+            dt = time.perf_counter() - t0
+            dt_ms = int(dt * 1000)
+            with self._lock:
+                self.stats.command_rtt(ag.name, dt)
+                self._dirty.add(ag.name)
             ok = bool(resp.get("ok"))
             err_code = (resp.get("error") or {}).get("code", "timeout" if not ok else "")
             self.notify(
@@ -175,6 +230,12 @@ class CoordinatorTUI(App):
                 msg = None
             if not msg:
                 continue
+            with self._archive_lock:
+                if self.archive is not None:
+                    try:
+                        self.archive.record(msg)
+                    except Exception:
+                        pass  # archiving must never take the UI down
 
             topic = msg.get("topic")
             data = msg.get("data", {}) or {}
@@ -190,59 +251,145 @@ class CoordinatorTUI(App):
 
             now_iso = _utc_now_iso()
             now_dt = datetime.now(UTC)
-            for row in targets:
-                row.last_seen = now_iso
-                row.last_seen_ts = now_dt
-                if topic == "heartbeat":
-                    row.heartbeats += 1
-                    # optional: reflect hold in state if provided
-                    if "hold" in data:
-                        row.state = "HOLD" if data.get("hold") else "RUN"
-                elif topic == "state":
-                    s = str(data.get("state") or "").upper()
-                    if s:
-                        row.state = s
-                # fps metric (when published)
-                if "fps" in data:
-                    try:
-                        row.fps = float(data["fps"])
-                    except Exception:
-                        pass
-
-            self._last_msg_ts = now_dt
-            self.call_from_thread(self._refresh_table)
+            with self._lock:
+                self._apply_message(targets, topic, data, now_iso, now_dt)
         # end loop
 
+    def _apply_message(
+        self,
+        targets: list[AgentRow],
+        topic: str | None,
+        data: dict,
+        now_iso: str,
+        now_dt: datetime,
+        mono: float | None = None,
+    ) -> None:
+        """Fold one telemetry message into its rows and mark them for the next redraw."""
+        mono = time.monotonic() if mono is None else mono
+        for row in targets:
+            self.stats.observe(row.name, topic, data, mono)
+            row.last_seen = now_iso
+            row.last_seen_ts = now_dt
+            if topic == "heartbeat":
+                row.heartbeats += 1
+                # optional: reflect hold in state if provided
+                if "hold" in data:
+                    row.state = "HOLD" if data.get("hold") else "RUN"
+            elif topic == "state":
+                s = str(data.get("state") or "").upper()
+                if s:
+                    row.state = s
+            # fps metric (when published)
+            if "fps" in data:
+                try:
+                    row.fps = float(data["fps"])
+                except Exception:
+                    pass
+
+        self._dirty.update(row.name for row in targets)
+        self._last_msg_ts = now_dt
+
     # ----- Table rendering -----
 
     def _refresh_table(self) -> None:
+        """Full redraw: every row and cell re-added in sort order."""
+        with self._lock:
+            self._dirty.clear()
+        self._rendered.clear()
+        self._sort_keys.clear()
+        self._status_rendered = None
         if not self._table:
             return
         self._table.clear()
         for row in self._sorted_rows():
-            status = self._classify(row)
-            # state cell with color + stale/down hints
-            if status == "DOWN":
-                state_cell = Text("DOWN", style="red")
-            elif status == "STALE":
-                state_cell = Text((row.state or "-") + " (STALE)", style="yellow")
-            else:
-                state_cell = Text(
-                    row.state or "-",
-                    style="green" if (row.state or "").upper() in {"RUN", "OK"} else "",
-                )
-
-            self._table.add_row(
-                row.name,
-                row.last_seen,
-                state_cell,
-                str(row.heartbeats),
-                f"{row.fps:.1f}" if row.fps is not None else "-",
-                row.cmd_ep,
-            )
-        # update status bar
-        if self._status:
-            self._status.update(self._status_text())
+            cells = self._cells(row)
+            self._table.add_row(*cells.values(), key=row.name)
+            self._rendered[row.name] = cells
+            self._sort_keys[row.name] = self._sort_key(row)
+        self.redraws += 1
+        self._update_status()
+
+    def _redraw(self) -> None:
+        """
+        Timer tick (at most `refresh_hz`): push only the cells that changed
+        since the last draw, and re-sort only if a sort key moved.
+        """
+        if not self._table:
+            return
+        if set(self._rendered) != set(self.rows):
+            self._refresh_table()  # rows added/removed: rebuild once
+            return
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        updated = 0
+        resort = False
+        for name, row in self.rows.items():
+            # clean rows still age (staleness, message rate): only those cells are checked
+            cells = self._cells(row) if name in dirty else self._aging_cells(row)
+            rendered = self._rendered[name]
+            for col, cell in cells.items():
+                if rendered.get(col) != cell:
+                    self._table.update_cell(name, col, cell)
+                    rendered[col] = cell
+                    updated += 1
+            if name in dirty:
+                key = self._sort_key(row)
+                if self._sort_keys.get(name) != key:
+                    self._sort_keys[name] = key
+                    resort = True
+        if resort:
+            self._resort()
+        if updated or resort:
+            self.redraws += 1
+            self.cell_updates += updated
+        self._update_status()
+
+    def _resort(self) -> None:
+        if not self._table:
+            return
+        keys = self._sort_keys
+        self._table.sort("agent", key=lambda name: keys[name])
+        self.resorts += 1
+
+    def _update_status(self) -> None:
+        text = self._status_text()
+        if self._status and text != self._status_rendered:
+            self._status.update(text)
+            self._status_rendered = text
+
+    def _state_cell(self, row: AgentRow) -> Text:
+        status = self._classify(row)
+        # state cell with color + stale/down hints
+        if status == "DOWN":
+            return Text("DOWN", style="red")
+        if status == "STALE":
+            return Text((row.state or "-") + " (STALE)", style="yellow")
+        return Text(
+            row.state or "-",
+            style="green" if (row.state or "").upper() in {"RUN", "OK"} else "",
+        )
+
+    def _cells(self, row: AgentRow) -> dict[str, object]:
+        """Column key -> cell for one row, in COLUMNS order."""
+        with self._lock:
+            st = self.stats.summary(row.name, time.monotonic())
+        return {
+            "agent": row.name,
+            "last": row.last_seen,
+            "state": self._state_cell(row),
+            "heartbeats": str(row.heartbeats),
+            "fps": f"{row.fps:.1f}" if row.fps is not None else "-",
+            "rate": f"{st['msg_rate'] or 0.0:.1f}",
+            "jitter": _trio(st, "hb_jitter"),
+            "rtt": _trio(st, "rtt"),
+            "endpoint": row.cmd_ep,
+        }
+
+    def _aging_cells(self, row: AgentRow) -> dict[str, object]:
+        """The cells that change with time alone, for rows without new telemetry."""
+        with self._lock:
+            rate = self.stats.agent(row.name).messages.rate(time.monotonic())
+        return {"state": self._state_cell(row), "rate": f"{rate:.1f}"}
 
     def _classify(self, row: AgentRow) -> str:
         """Return OK | STALE | DOWN based on last_seen_ts."""
@@ -252,15 +399,18 @@ class CoordinatorTUI(App):
         stale_threshold = self._stale_factor * (1.0 / max(self._heartbeat_hz, 0.001))
         return "STALE" if age > stale_threshold else "OK"
 
-    def _sorted_rows(self) -> list[AgentRow]:
-        items = list(self.rows.values())
+    def _sort_key(self, row: AgentRow) -> tuple:
         if self._sort_mode == "agent":
-            items.sort(key=lambda r: r.name.lower())
-        elif self._sort_mode == "state":
-            items.sort(key=lambda r: (r.state, r.name.lower()))
-        else:  # "last"
-            items.sort(key=lambda r: r.last_seen_ts or datetime.fromtimestamp(0, UTC), reverse=True)
-        return items
+            return (row.name.lower(),)
+        if self._sort_mode == "state":
+            return (row.state, row.name.lower())
+        # "last": most recent first at the displayed (whole second) resolution, so
+        # heartbeats within a second don't reshuffle rows; never-seen rows last
+        seen = -int(row.last_seen_ts.timestamp()) if row.last_seen_ts else 0
+        return (seen, row.name.lower())
+
+    def _sorted_rows(self) -> list[AgentRow]:
+        return sorted(self.rows.values(), key=self._sort_key)
 
     def _status_text(self) -> str:
         configured = len(self.rows)
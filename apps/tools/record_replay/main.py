@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+
+from shared.utils.replay import ReplayReader
+from shared.utils.telemetry_diff import diff_telemetry, iter_jsonl
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="eventful-qualm-replay",
+        description="Inspect an .everrec recording (recorded with `agent --record`).",
+    )
+    ap.add_argument("bundle", help=".everrec directory")
+    ap.add_argument("--t0", type=float, default=-math.inf, help="Window start (inclusive).")
+    ap.add_argument("--t1", type=float, default=math.inf, help="Window end (exclusive).")
+    ap.add_argument("--stream", action="append", help="Only these streams (repeatable).")
+    ap.add_argument("--dump", action="store_true", help="Print the window's records as JSONL.")
+    ap.add_argument(
+        "--diff",
+        metavar="JSONL",
+        help="Compare the bundle's telemetry (expected) with produced telemetry JSONL.",
+    )
+    ap.add_argument("--ts-tol", type=float, default=1e-3, help="Timestamp pairing tolerance (s).")
+    args = ap.parse_args(argv)
+
+    try:
+        reader = ReplayReader(args.bundle)
+    except (OSError, ValueError, RuntimeError) as ex:
+        print(f"[replay] {ex}", file=sys.stderr)
+        return 2
+    with reader:
+        if args.diff:
+            expected = (r.data for r in reader.window(args.t0, args.t1, ["telemetry"]))
+            produced = (r for r in iter_jsonl(args.diff) if args.t0 <= r["ts"] < args.t1)
+            report = diff_telemetry(expected, produced, ts_tol=args.ts_tol)
+            print(report.summary())
+            return 0 if report.ok else 1
+        if not args.dump:
+            counts = {s: reader.count(s) for s in reader.streams}
+            state = "" if reader.complete else " (incomplete recording)"
+            print(f"[replay] {reader.path}{state} t0={reader.t0} t1={reader.t1} {counts}")
+            return 0
+        for rec in reader.window(args.t0, args.t1, args.stream):
+            data = {k: v for k, v in rec.data.items() if k != "image"}
+            print(json.dumps({"stream": rec.stream, **data}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
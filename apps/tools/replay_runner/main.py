@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+
+from .runner import ClipCheck, report_dict, run_replays
+
+
+def _load_check(spec: str) -> ClipCheck:
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"--check must look like 'package.module:function', got {spec!r}")
+    check: ClipCheck = getattr(importlib.import_module(module), name)
+    return check
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="eventful-qualm-replay-run",
+        description="Run a check over every .everrec clip, sharded across processes.",
+    )
+    ap.add_argument("clips", nargs="+", help="Clip folders or bundles.")
+    ap.add_argument("--check", required=True, help="ClipCheck as 'package.module:function'.")
+    ap.add_argument("--workers", type=int, default=None, help="Processes (default: CPUs).")
+    ap.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = ap.parse_args(argv)
+
+    try:
+        check = _load_check(args.check)
+    except (ImportError, AttributeError, ValueError) as ex:
+        print(f"[replay-run] {ex}", file=sys.stderr)
+        return 2
+    report = run_replays(args.clips, check, workers=args.workers)
+    print(json.dumps(report_dict(report), indent=2) if args.json else report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+"""
+pytest plugin for replay tests (ADR 0004).
+
+    @pytest.mark.replay(clips="tests/replay/clips", workers=4)
+    def test_vitals_match(replay_run):
+        report = replay_run(check_vitals)   # module-level ClipCheck
+        assert report.ok, report.summary()
+
+Clip folders resolve as: `replay_run(clips=...)` > marker `clips=` >
+`--replay-dir` > `tests/replay/clips`. Tests without clips are skipped, every
+test using `replay_run` is marked `replay` (so `-m "not replay"` deselects
+them), and the merged per-clip report is printed in the terminal summary.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from .runner import ClipCheck, ReplayReport, discover, run_replays
+
+DEFAULT_CLIPS = "tests/replay/clips"
+_REPORTS = pytest.StashKey[list[tuple[str, ReplayReport]]]()
+
+
+def pytest_addoption(parser: Any) -> None:
+    group = parser.getgroup("replay")
+    group.addoption(
+        "--replay-dir", action="append", default=None, help=".everrec clip folder (repeatable)."
+    )
+    group.addoption(
+        "--replay-workers", type=int, default=None, help="Replay processes (default: CPUs)."
+    )
+
+
+def pytest_configure(config: Any) -> None:
+    config.addinivalue_line(
+        "markers", "replay(clips=None, workers=None): replay-driven test over .everrec clips"
+    )
+    config.stash[_REPORTS] = []
+
+
+def pytest_collection_modifyitems(config: Any, items: list[Any]) -> None:
+    for item in items:
+        if "replay_run" in getattr(item, "fixturenames", ()) and not item.get_closest_marker(
+            "replay"
+        ):
+            item.add_marker(pytest.mark.replay)
+
+
+@pytest.fixture
+def replay_run(request: Any) -> Callable[..., ReplayReport]:
+    config = request.config
+    marker = request.node.get_closest_marker("replay")
+    mk: dict[str, Any] = dict(marker.kwargs) if marker else {}
+
+    def run(
+        check: ClipCheck,
+        clips: str | Path | Iterable[str | Path] | None = None,
+        workers: int | None = None,
+    ) -> ReplayReport:
+        spec = clips or mk.get("clips") or config.getoption("replay_dir") or DEFAULT_CLIPS
+        paths = [spec] if isinstance(spec, str | Path) else list(spec)
+        roots = [p if Path(p).is_absolute() else config.rootpath / p for p in paths]
+        if not discover(roots):
+            pytest.skip(f"no .everrec clips under {', '.join(map(str, roots))}")
+        report = run_replays(
+            roots, check, workers=workers or mk.get("workers") or config.getoption("replay_workers")
+        )
+        config.stash[_REPORTS].append((request.node.nodeid, report))
+        return report
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: Any) -> None:
+    reports = config.stash.get(_REPORTS, [])
+    if not reports:
+        return
+    terminalreporter.section("replay")
+    for nodeid, report in reports:
+        terminalreporter.write_line(nodeid)
+        terminalreporter.write_line(report.summary())
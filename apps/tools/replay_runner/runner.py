@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from adapters.time import VirtualClockPort
+from shared.utils.everrec import META_NAME
+from shared.utils.replay import ReplayReader
+
+TIMINGS_NAME = ".replay-timings.json"
+_DEFAULT_S_PER_BYTE = 1e-8  # first run, nothing measured yet: ~100 MB/s
+
+# A check replays one clip against domain logic on the virtual clock (which
+# starts at the clip's first timestamp) and raises (usually AssertionError) to
+# fail it. It must be a module-level function so worker processes can import it.
+ClipCheck = Callable[[ReplayReader, VirtualClockPort], None]
+
+
+@dataclass(frozen=True)
+class ClipResult:
+    clip: str
+    ok: bool
+    seconds: float
+    shard: int
+    error: str | None = None
+
+
+@dataclass
+class ReplayReport:
+    results: list[ClipResult] = field(default_factory=list)
+    shards: int = 1
+    wall_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    @property
+    def failed(self) -> list[ClipResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def cpu_s(self) -> float:
+        return sum(r.seconds for r in self.results)
+
+    def summary(self) -> str:
+        lines = [
+            f"replay: {len(self.results) - len(self.failed)}/{len(self.results)} clips passed "
+            f"in {self.wall_s:.2f}s wall ({self.cpu_s:.2f}s across {self.shards} shards)"
+        ]
+        for r in sorted(self.results, key=lambda r: -r.seconds):
+            mark = "ok  " if r.ok else "FAIL"
+            lines.append(f"  {mark} {r.seconds:7.3f}s  [shard {r.shard}] {r.clip}")
+            if r.error:
+                lines.extend(f"         {e}" for e in r.error.splitlines()[-3:])
+        return "\n".join(lines)
+
+
+# ----- discovery & cost model -----
+
+
+def discover(paths: Iterable[str | Path]) -> list[Path]:
+    """Every `.everrec` bundle (a directory holding meta.json) under `paths`, sorted."""
+    found: set[Path] = set()
+    for root in map(Path, paths):
+        if (root / META_NAME).is_file():
+            found.add(root)
+        elif root.is_dir():
+            found.update(m.parent for m in root.rglob(META_NAME) if m.parent.suffix == ".everrec")
+    return sorted(found)
+
+
+def clip_bytes(clip: Path) -> int:
+    return sum(p.stat().st_size for p in clip.rglob("*") if p.is_file())
+
+
+def load_timings(path: Path) -> dict[str, dict[str, float]]:
+    try:
+        data = json.loads(path.read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def estimate_costs(
+    clips: Sequence[Path], timings: dict[str, dict[str, float]], root: Path
+) -> dict[Path, float]:
+    """
+    Previous runtime when the clip was timed before at the same size; otherwise
+    size x the library's measured seconds-per-byte.
+    """
+    sizes = {c: clip_bytes(c) for c in clips}
+    known = [t for t in timings.values() if t.get("bytes")]
+    rate = (
+        sum(t["seconds"] for t in known) / sum(t["bytes"] for t in known)
+        if known
+        else _DEFAULT_S_PER_BYTE
+    )
+    costs: dict[Path, float] = {}
+    for c in clips:
+        prev = timings.get(_key(c, root))
+        if prev and prev.get("bytes") == sizes[c]:
+            costs[c] = float(prev["seconds"])
+        else:
+            costs[c] = sizes[c] * rate
+    return costs
+
+
+def shard(costs: dict[Path, float], n: int) -> list[list[Path]]:
+    """Longest-processing-time-first: each clip goes to the currently lightest shard."""
+    n = max(1, min(n, len(costs)))
+    heap = [(0.0, i) for i in range(n)]
+    shards: list[list[Path]] = [[] for _ in range(n)]
+    for clip, cost in sorted(costs.items(), key=lambda kv: (-kv[1], str(kv[0]))):
+        load, i = heapq.heappop(heap)
+        shards[i].append(clip)
+        heapq.heappush(heap, (load + cost, i))
+    return shards
+
+
+def _key(clip: Path, root: Path) -> str:
+    try:
+        return clip.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return clip.resolve().as_posix()
+
+
+# ----- execution -----
+
+
+def run_clip(clip: Path, check: ClipCheck, shard_no: int = 0) -> ClipResult:
+    t = time.perf_counter()
+    try:
+        with ReplayReader(clip) as reader:
+            check(reader, VirtualClockPort(start=reader.t0 or 0.0))
+    except Exception as ex:
+        err = "".join(traceback.format_exception_only(ex)).strip() or type(ex).__name__
+        return ClipResult(str(clip), False, time.perf_counter() - t, shard_no, err)
+    return ClipResult(str(clip), True, time.perf_counter() - t, shard_no)
+
+
+def _run_shard(clips: list[Path], check: ClipCheck, shard_no: int) -> list[ClipResult]:
+    return [run_clip(c, check, shard_no) for c in clips]
+
+
+def _init_worker(path: list[str]) -> None:
+    sys.path[:] = path  # spawned workers need the parent's libs/ + test roots
+
+
+def run_replays(
+    paths: Iterable[str | Path],
+    check: ClipCheck,
+    workers: int | None = None,
+    timings_path: str | Path | None = None,
+) -> ReplayReport:
+    """
+    Discover clips under `paths`, shard them by estimated cost across a process
+    pool, run `check` on each and merge the results. Measured times are written
+    back to `timings_path` (default: `.replay-timings.json` in the first path)
+    to balance the next run.
+    """
+    roots = [Path(p) for p in paths]
+    clips = discover(roots)
+    report = ReplayReport()
+    if not clips:
+        return report
+    root = roots[0] if roots[0].is_dir() else roots[0].parent
+    tpath = Path(timings_path) if timings_path else root / TIMINGS_NAME
+    timings = load_timings(tpath)
+
+    t = time.perf_counter()
+    shards = shard(estimate_costs(clips, timings, root), workers or os.cpu_count() or 1)
+    report.shards = len(shards)
+    if len(shards) == 1:
+        report.results = _run_shard(shards[0], check, 0)
+    else:
+        # spawn everywhere: same semantics as Windows CI, and safe from threaded parents
+        with ProcessPoolExecutor(
+            len(shards),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(list(sys.path),),
+        ) as pool:
+            futures = [pool.submit(_run_shard, s, check, i) for i, s in enumerate(shards)]
+            report.results = [r for f in futures for r in f.result()]
+    report.wall_s = time.perf_counter() - t
+
+    for r in report.results:
+        c = Path(r.clip)
+        timings[_key(c, root)] = {"seconds": round(r.seconds, 6), "bytes": clip_bytes(c)}
+    try:
+        tpath.write_text(json.dumps(timings, indent=2, sort_keys=True), encoding="utf-8")
+    except OSError:
+        pass  # read-only clip library: just don't learn
+    return report
+
+
+def report_dict(report: ReplayReport) -> dict[str, Any]:
+    return {
+        "ok": report.ok,
+        "shards": report.shards,
+        "wall_s": report.wall_s,
+        "results": [asdict(r) for r in report.results],
+    }
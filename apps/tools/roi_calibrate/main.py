@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import sys
+import tomllib
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from adapters.vision_numpy import NumpyTemplateMatcher, PreparedImage
+from adapters.vision_numpy.library import load_template_file
+
+_FRAME_SUFFIXES = (".npy", ".png", ".bmp")
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+
+
+# --- inputs -------------------------------------------------------------------
+
+
+def load_frames(paths: Iterable[str | Path]) -> list[np.ndarray]:
+    """Frames from files or folders (.npy natively, PNG/BMP with Pillow), sorted by name."""
+    files: list[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(f for f in p.iterdir() if f.suffix.lower() in _FRAME_SUFFIXES))
+        else:
+            files.append(p)
+    return [load_template_file(f) for f in files]
+
+
+def load_spec(path: str | Path) -> dict[str, Any]:
+    """
+    Anchor spec TOML:
+
+        [anchors.hud]
+        template = "hud.npy"        # relative to the spec file
+        threshold = 0.9
+
+        [rois.bars.hp]
+        anchor = "hud"
+        offset = [dx, dy, w, h]     # relative to the anchor's top-left
+        color = [196, 36, 36]       # any other keys are copied through
+    """
+    path = Path(path)
+    spec = tomllib.loads(path.read_text("utf-8"))
+    spec["_base_dir"] = path.parent
+    return spec
+
+
+# --- calibration --------------------------------------------------------------
+
+
+class CalibrationError(RuntimeError):
+    pass
+
+
+def locate_anchors(
+    frames: Sequence[np.ndarray], spec: Mapping[str, Any], matcher: NumpyTemplateMatcher
+) -> dict[str, dict[str, Any]]:
+    """Median top-left of each anchor over the frames where it matched."""
+    base = Path(spec.get("_base_dir", "."))
+    prepared = [PreparedImage(f) for f in frames]
+    found: dict[str, dict[str, Any]] = {}
+    missing: list[str] = []
+    for name, a in (spec.get("anchors", {}) or {}).items():
+        tpl = matcher.prepare(load_template_file(base / a["template"]))
+        threshold = float(a.get("threshold", 0.9))
+        hits = [
+            r for r in (matcher.best(img, tpl) for img in prepared) if r and r.score >= threshold
+        ]
+        if not hits:
+            missing.append(name)
+            continue
+        h, w = tpl.shape
+        found[name] = {
+            "roi": [
+                int(statistics.median(r.x for r in hits)),
+                int(statistics.median(r.y for r in hits)),
+                w,
+                h,
+            ],
+            "score": round(min(r.score for r in hits), 4),
+            "frames": len(hits),
+        }
+    if missing:
+        raise CalibrationError(f"anchors not found in any frame: {', '.join(missing)}")
+    return found
+
+
+def calibrate(
+    frames: Sequence[np.ndarray],
+    spec: Mapping[str, Any],
+    matcher: NumpyTemplateMatcher | None = None,
+) -> dict[str, Any]:
+    """Build a ROI profile (same schema as configs/rois/*.toml) from frames + spec."""
+    if not frames:
+        raise CalibrationError("no frames to calibrate from")
+    h, w = frames[0].shape[:2]
+    if any(f.shape[:2] != (h, w) for f in frames):
+        raise CalibrationError("frames must share one resolution")
+
+    matcher = matcher or NumpyTemplateMatcher(track=False)
+    anchors = locate_anchors(frames, spec, matcher)
+    profile: dict[str, Any] = {"resolution": [w, h], "anchors": anchors}
+    for kind, entries in (spec.get("rois", {}) or {}).items():
+        section: dict[str, Any] = {}
+        for name, e in entries.items():
+            ax, ay, _, _ = anchors[e["anchor"]]["roi"]
+            dx, dy, rw, rh = (int(v) for v in e["offset"])
+            extra = {k: v for k, v in e.items() if k not in ("anchor", "offset")}
+            section[name] = {"roi": [ax + dx, ay + dy, rw, rh], **extra}
+        profile[kind] = section
+    return profile
+
+
+def scale_profile(profile: Mapping[str, Any], width: int, height: int) -> dict[str, Any]:
+    """Rescale every `roi` in a profile to another client resolution."""
+    bw, bh = profile["resolution"]
+    sx, sy = width / bw, height / bh
+
+    def scale(node: Any) -> Any:
+        if isinstance(node, Mapping):
+            out = {k: scale(v) for k, v in node.items()}
+            if "roi" in node:
+                x, y, w, h = node["roi"]
+                out["roi"] = [
+                    round(x * sx),
+                    round(y * sy),
+                    max(1, round(w * sx)),
+                    max(1, round(h * sy)),
+                ]
+            return out
+        return node
+
+    out: dict[str, Any] = scale(profile)
+    out["resolution"] = [width, height]
+    out["scaled_from"] = f"{bw}x{bh}"
+    return out
+
+
+# --- output -------------------------------------------------------------------
+
+
+def _toml_value(v: Any) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, int | float):
+        return repr(v)
+    if isinstance(v, str):
+        return '"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    if isinstance(v, list | tuple):
+        return "[" + ", ".join(_toml_value(x) for x in v) + "]"
+    raise TypeError(f"unsupported TOML value: {v!r}")
+
+
+def _toml_key(k: str) -> str:
+    return k if _BARE_KEY.fullmatch(k) else _toml_value(k)
+
+
+def dump_toml(data: Mapping[str, Any], header: str = "") -> str:
+    """Minimal TOML writer for profile-shaped data (scalars, lists, nested tables)."""
+    lines = [f"# {line}" for line in header.splitlines()]
+
+    def emit(table: Mapping[str, Any], path: list[str]) -> None:
+        scalars = {k: v for k, v in table.items() if not isinstance(v, Mapping)}
+        tables = {k: v for k, v in table.items() if isinstance(v, Mapping)}
+        if path and scalars:
+            lines.append("")
+            lines.append(f"[{'.'.join(map(_toml_key, path))}]")
+        for k, v in scalars.items():
+            lines.append(f"{_toml_key(k)} = {_toml_value(v)}")
+        for k, v in tables.items():
+            emit(v, [*path, k])
+
+    emit(data, [])
+    return "\n".join(lines) + "\n"
+
+
+def _parse_resolution(text: str) -> tuple[int, int]:
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def write_profiles(
+    profile: Mapping[str, Any],
+    out_dir: str | Path,
+    targets: Iterable[tuple[int, int]] = (),
+    overwrite: bool = False,
+) -> list[Path]:
+    """
+    Write <W>x<H>.toml for the calibrated resolution and every target.
+    Existing profiles may be hand-tuned, so nothing is written if any of them
+    already exists unless `overwrite` is set.
+    """
+    out = Path(out_dir)
+    w, h = profile["resolution"]
+    res = list(dict.fromkeys([(w, h), *targets]))
+    paths = [out / f"{tw}x{th}.toml" for tw, th in res]
+    existing = [str(p) for p in paths if p.exists()]
+    if existing and not overwrite:
+        raise FileExistsError(f"refusing to overwrite {', '.join(existing)} (use --force)")
+    out.mkdir(parents=True, exist_ok=True)
+    written = []
+    for (tw, th), p in zip(res, paths, strict=True):
+        data = profile if (tw, th) == (w, h) else scale_profile(profile, tw, th)
+        p.write_text(
+            dump_toml(data, header=f"ROI profile for a {tw}x{th} client area (roi_calibrate)."),
+            encoding="utf-8",
+        )
+        written.append(p)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="eventful-qualm-roi-calibrate",
+        description="Locate UI anchors in recorded frames and write ROI profiles.",
+    )
+    ap.add_argument("--frames", nargs="+", required=True, help="Frame files or folders.")
+    ap.add_argument("--spec", required=True, help="Anchor/ROI spec TOML.")
+    ap.add_argument("--out", required=True, help="Output directory for <W>x<H>.toml.")
+    ap.add_argument("--force", action="store_true", help="Overwrite existing profiles in --out.")
+    ap.add_argument(
+        "--targets",
+        default="",
+        help="Comma-separated extra resolutions to precompute (e.g. 1920x1080,1280x720).",
+    )
+    ap.add_argument("--quiet", action="store_true", help="Reduce console output.")
+    args = ap.parse_args(argv)
+
+    try:
+        targets = [_parse_resolution(t) for t in args.targets.split(",") if t.strip()]
+        profile = calibrate(load_frames(args.frames), load_spec(args.spec))
+    except (CalibrationError, OSError, ValueError, KeyError, RuntimeError) as ex:
+        print(f"[roi-calibrate] {ex}", file=sys.stderr)
+        return 2
+
+    try:
+        written = write_profiles(profile, args.out, targets, overwrite=args.force)
+    except OSError as ex:
+        print(f"[roi-calibrate] {ex}", file=sys.stderr)
+        return 2
+    for p in written:
+        if not args.quiet:
+            print(f"[roi-calibrate] wrote {p}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import sys
+
+from shared.telemetry.archive import TelemetryArchive
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="eventful-qualm-telemetry-query",
+        description="Query a coordinator telemetry archive by topic, agent and time range.",
+    )
+    ap.add_argument("archive", help="Archive directory (coordinator --archive).")
+    ap.add_argument("--topic", help="Topic to read; omit to list topics and segments.")
+    ap.add_argument("--agent", help="Only this agent_id.")
+    ap.add_argument("--t0", type=float, default=-math.inf, help="Start (inclusive, epoch s).")
+    ap.add_argument("--t1", type=float, default=math.inf, help="End (exclusive, epoch s).")
+    ap.add_argument("--fields", default="", help="Comma-separated fields (default: all).")
+    ap.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    args = ap.parse_args(argv)
+
+    archive = TelemetryArchive(args.archive)
+    segments = archive.segments()
+    if not segments:
+        print(f"[telemetry-query] no sealed segments in {args.archive}", file=sys.stderr)
+        return 2
+    if not args.topic:
+        for e in segments:
+            rows = {t: m["rows"] for t, m in e["topics"].items()}
+            print(f"{e['segment']} {e['t0']:.3f}..{e['t1']:.3f} {rows}")
+        return 0
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] or None
+    result = archive.query(args.topic, agent_id=args.agent, t0=args.t0, t1=args.t1, fields=fields)
+    if args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(result.columns))
+        writer.writeheader()
+        writer.writerows(result.rows())
+    else:
+        for row in result.rows():
+            print(json.dumps(row))
+    print(
+        f"[telemetry-query] {len(result)} rows from {result.segments_read}/{len(segments)} "
+        "segments",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from adapters.vision_numpy import TemplateLibrary, compile_library
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="eventful-qualm-template-lib",
+        description="Compile a folder of UI templates into a memory-mapped bundle.",
+    )
+    ap.add_argument("src", help="Folder of templates (.npy, or .png/.bmp with Pillow).")
+    ap.add_argument("out", help="Output bundle directory (manifest.json + templates.npy).")
+    args = ap.parse_args(argv)
+
+    try:
+        manifest = compile_library(args.src, args.out)
+    except (OSError, ValueError, RuntimeError) as ex:
+        print(f"[template-lib] {ex}", file=sys.stderr)
+        return 2
+    names = TemplateLibrary(manifest.parent).names
+    print(f"[template-lib] {len(names)} templates -> {manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,15 +7,21 @@ from ports.vision import ROI, Frame, ScreenCapturePort
 
 
 class FakeScreenCapturePort(ScreenCapturePort):
-    """Returns a dummy Frame; rgba is None for now to avoid numpy dependency."""
+    """
+    Returns a canned Frame. `rgba` is None unless a test supplies `image`
+    (any HxWxC array-like); with a ROI the image is cropped like a real grab.
+    """
 
-    def __init__(self, fps_value: float = 30.0) -> None:
+    def __init__(self, fps_value: float = 30.0, image: Any = None) -> None:
         self._fps = float(fps_value)
         self._clock = FakeClockPort()
+        self.image = image
 
     def grab(self, roi: ROI | None = None) -> Frame:
-        # rgba can be set to None or a simple placeholder; domain shouldn’t assume ndarray yet.
-        rgba: Any = None
+        # domain shouldn’t assume ndarray; crop only when an image was supplied.
+        rgba: Any = self.image
+        if rgba is not None and roi is not None:
+            rgba = rgba[roi.y : roi.y + roi.h, roi.x : roi.x + roi.w]
         return Frame(rgba=rgba, ts=self._clock.now())
 
     def fps(self) -> float:
@@ -0,0 +1,12 @@
+from .events import LogEventMatcher, LogRule, RuleStats, load_log_rules
+from .fakes import FakeLogTailPort
+from .tail import FileTailLogPort
+
+__all__ = [
+    "FakeLogTailPort",
+    "FileTailLogPort",
+    "LogEventMatcher",
+    "LogRule",
+    "RuleStats",
+    "load_log_rules",
+]
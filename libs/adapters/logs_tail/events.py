@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import re
+import time
+import tomllib
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+from ports.logs import LogEvent
+
+
+def _bool(raw: str) -> bool:
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": _bool,
+}
+
+
+@dataclass(frozen=True)
+class LogRule:
+    """
+    One event pattern.
+
+    `pattern` is a regex whose named groups become the event fields, converted
+    with `types` ("str" | "int" | "float" | "bool"; default str). `literals` are
+    substrings every matching line must contain (any one of them); they feed
+    the prefilter, so a rule without literals is tried on every line.
+    """
+
+    name: str
+    pattern: str
+    literals: tuple[str, ...] = ()
+    types: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RuleStats:
+    name: str
+    candidates: int = 0  # lines the prefilter handed to this rule
+    hits: int = 0
+    errors: int = 0  # matched, but a field failed to convert
+    cost_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.cost_ns / self.candidates if self.candidates else 0.0
+
+
+class _Compiled:
+    __slots__ = ("name", "regex", "converters", "stats")
+
+    def __init__(self, rule: LogRule, encoding: str) -> None:
+        self.name = rule.name
+        self.regex = re.compile(rule.pattern.encode(encoding))
+        unknown = set(rule.types) - set(self.regex.groupindex)
+        if unknown:
+            raise ValueError(f"rule {rule.name!r}: types for unknown groups {sorted(unknown)}")
+        self.converters: dict[str, Callable[[str], Any]] = {}
+        for group in self.regex.groupindex:
+            kind = rule.types.get(group, "str")
+            if kind not in _CONVERTERS:
+                raise ValueError(f"rule {rule.name!r}: unknown type {kind!r} for {group!r}")
+            self.converters[group] = _CONVERTERS[kind]
+        self.stats = RuleStats(rule.name)
+
+
+class LogEventMatcher:
+    """
+    Turns raw log lines into typed LogEvents against many rules at once.
+
+    Rules are compiled once. Their literals are joined into one alternation
+    that is run over the whole batch (not line by line), so lines containing
+    none of them are rejected without any per-rule work. Surviving lines look
+    up a dispatch table (literal -> bitmask of rules) and only the rules whose
+    literal is present run their regex, in declaration order; the first match
+    wins. Per-rule candidates/hits/time are kept so an expensive rule shows up
+    in `profile()`.
+    """
+
+    def __init__(
+        self, rules: Iterable[LogRule], encoding: str = "utf-8", profile: bool = True
+    ) -> None:
+        self.encoding = encoding
+        self._rules: list[_Compiled] = []
+        dispatch: dict[bytes, int] = {}
+        always = 0
+        for bit, rule in enumerate(rules):
+            if any(r.name == rule.name for r in self._rules):
+                raise ValueError(f"duplicate rule name {rule.name!r}")
+            self._rules.append(_Compiled(rule, encoding))
+            if not rule.literals:
+                always |= 1 << bit
+            for lit in rule.literals:
+                raw = lit.encode(encoding)
+                if not raw or b"\n" in raw:
+                    raise ValueError(f"rule {rule.name!r}: literal must be one non-empty line")
+                dispatch[raw] = dispatch.get(raw, 0) | (1 << bit)
+        self._dispatch = dispatch
+        self._always = always
+        self._prefilter = (
+            re.compile(b"|".join(map(re.escape, sorted(dispatch, key=len, reverse=True))))
+            if dispatch
+            else None
+        )
+        self._profile = profile
+        self.lines = 0  # lines seen
+        self.candidate_lines = 0  # lines that passed the prefilter
+
+    @classmethod
+    def from_toml(cls, path: str | Path, **kw: Any) -> LogEventMatcher:
+        return cls(load_log_rules(path), **kw)
+
+    @property
+    def rules(self) -> list[str]:
+        return [r.name for r in self._rules]
+
+    def _candidates(self, lines: Sequence[bytes]) -> list[int]:
+        """Indexes of lines containing at least one literal, in order."""
+        pf = self._prefilter
+        if pf is None:
+            return []
+        buf = b"\n".join(lines)
+        starts = [0, *accumulate(len(ln) + 1 for ln in lines)]
+        out: list[int] = []
+        pos = 0
+        while (m := pf.search(buf, pos)) is not None:
+            i = bisect_right(starts, m.start()) - 1
+            out.append(i)
+            pos = starts[i + 1]  # next line; literals never span one
+        return out
+
+    def match_batch(self, lines: Sequence[bytes], ts: float = 0.0) -> list[LogEvent]:
+        """Events for the lines that match a rule, in line order, all stamped `ts`."""
+        self.lines += len(lines)
+        always = self._always
+        # line index -> rules to try; insertion order is line order either way
+        masks = dict.fromkeys(range(len(lines)), always) if always else {}
+        for i in self._candidates(lines):
+            line, mask = lines[i], always
+            for lit, bits in self._dispatch.items():
+                if lit in line:
+                    mask |= bits
+            masks[i] = mask
+        self.candidate_lines += len(masks)
+        events: list[LogEvent] = []
+        for i, mask in masks.items():
+            ev = self._match_line(lines[i], mask, ts)
+            if ev is not None:
+                events.append(ev)
+        return events
+
+    def _match_line(self, line: bytes, mask: int, ts: float) -> LogEvent | None:
+        bit = 0
+        while mask:
+            if mask & 1:
+                rule = self._rules[bit]
+                stats = rule.stats
+                stats.candidates += 1
+                t = time.perf_counter_ns() if self._profile else 0
+                ev = self._apply(rule, line, ts)
+                if self._profile:
+                    stats.cost_ns += time.perf_counter_ns() - t
+                if ev is not None:
+                    return ev
+            mask >>= 1
+            bit += 1
+        return None
+
+    def _apply(self, rule: _Compiled, line: bytes, ts: float) -> LogEvent | None:
+        m = rule.regex.search(line)
+        if m is None:
+            return None
+        fields: dict[str, Any] = {}
+        try:
+            for name, raw in m.groupdict().items():
+                if raw is None:
+                    fields[name] = None
+                else:
+                    fields[name] = rule.converters[name](raw.decode(self.encoding, "replace"))
+        except ValueError:
+            rule.stats.errors += 1
+            return None
+        rule.stats.hits += 1
+        return LogEvent(rule.name, ts, fields, line)
+
+    def profile(self) -> list[RuleStats]:
+        """Per-rule counters, most expensive first."""
+        return sorted((r.stats for r in self._rules), key=lambda s: -s.cost_ns)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "lines": self.lines,
+            "candidate_lines": self.candidate_lines,
+            "rules": {
+                s.name: {"candidates": s.candidates, "hits": s.hits, "cost_us": s.cost_ns // 1000}
+                for s in self.profile()
+            },
+        }
+
+
+def load_log_rules(path: str | Path) -> list[LogRule]:
+    """
+    Rules from a TOML file of `[[rule]]` tables:
+
+        [[rule]]
+        name = "damage_taken"
+        pattern = '(?P<source>.+) hits you for (?P<amount>\\d+) damage'
+        literals = [" hits you for "]
+        types = { amount = "int" }
+    """
+    try:
+        data = tomllib.loads(Path(path).read_text("utf-8"))
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse log rules TOML: {path}") from e
+    rules = []
+    for table in data.get("rule", []):
+        rules.append(
+            LogRule(
+                name=str(table["name"]),
+                pattern=str(table["pattern"]),
+                literals=tuple(table.get("literals", ())),
+                types=dict(table.get("types", {})),
+            )
+        )
+    return rules
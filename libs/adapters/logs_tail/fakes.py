@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from ports.logs import LogTailPort
+
+
+class FakeLogTailPort(LogTailPort):
+    """Serves lines pushed by a test, in batches of at most `max_batch_lines`."""
+
+    def __init__(self, lines: Iterable[bytes | str] = (), max_batch_lines: int = 10_000) -> None:
+        self._lines: list[bytes] = []
+        self._max = max(1, max_batch_lines)
+        self.closed = False
+        self.push(*lines)
+
+    def push(self, *lines: bytes | str) -> None:
+        self._lines.extend(x.encode("utf-8") if isinstance(x, str) else x for x in lines)
+
+    def read_batch(self, timeout_s: float = 0.0) -> list[bytes]:
+        batch = self._lines[: self._max]
+        del self._lines[: self._max]
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import logging
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Literal
+
+from ports.logs import LogTailPort
+
+Watcher = Literal["auto", "inotify", "poll"]
+
+log = logging.getLogger(__name__)
+
+# inotify(7): anything that can mean "new bytes" or "the file was swapped"
+_IN_MODIFY = 0x002
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+class _Inotify:
+    """Directory watch via libc inotify; `wait()` returns early on any change."""
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def wait(self, timeout_s: float) -> None:
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout_s))
+        if ready:
+            try:
+                while os.read(self.fd, 64 * 1024):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileTailLogPort(LogTailPort):
+    """
+    Follows a log file like `tail -F`, cheaply.
+
+    Reads use `os.read` with a large buffer and lines are split on raw bytes
+    (one `split` per read, no per-line decode). Rotation (the path now names a
+    different file) is detected by device/inode: the old file is drained, then
+    the new one is read from its start. Truncation (size below our offset)
+    restarts from 0. Waiting uses inotify on Linux, otherwise short polls.
+
+    With `offset_path`, the byte offset just past the last delivered line is
+    persisted (throttled, and on close) with the file identity, so a restart
+    resumes exactly where it left off, or from the start of a rotated file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        offset_path: str | Path | None = None,
+        from_start: bool = False,
+        read_size: int = 1 << 20,
+        max_batch_lines: int = 10_000,
+        watcher: Watcher = "auto",
+        poll_interval_s: float = 0.1,
+        persist_interval_s: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.offset_path = Path(offset_path) if offset_path else None
+        self._from_start = from_start
+        self._read_size = max(4096, int(read_size))
+        self._max_lines = max(1, int(max_batch_lines))
+        self._poll_s = float(poll_interval_s)
+        self._persist_s = float(persist_interval_s)
+        self._fd: int | None = None
+        self._ident: tuple[int, int] | None = None
+        self._offset = 0  # bytes consumed from the open file (including `_partial`)
+        self._partial = b""
+        self._pending: list[bytes] = []  # split but not yet delivered (batch cap)
+        self._saved_at = 0.0
+        self._saved_offset: int | None = None
+        self.rotations = 0
+        self.truncations = 0
+        self.persist_errors = 0  # offset saves that failed (reading carried on)
+        self._watch: _Inotify | None = None
+        if watcher == "inotify" or (watcher == "auto" and sys.platform.startswith("linux")):
+            try:
+                self._watch = _Inotify(self.path.parent)
+            except (OSError, AttributeError):
+                if watcher == "inotify":
+                    raise
+        self._open(initial=True)
+
+    @property
+    def watcher(self) -> str:
+        return "inotify" if self._watch is not None else "poll"
+
+    @property
+    def offset(self) -> int:
+        """Offset just past the last complete line read from the current file."""
+        return self._offset - len(self._partial)
+
+    # ----- file handling -----
+
+    def _stat(self) -> os.stat_result | None:
+        try:
+            return os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+    def _open(self, initial: bool = False) -> bool:
+        st = self._stat()
+        if st is None:
+            return False
+        try:
+            fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            return False
+        ident = (st.st_dev, st.st_ino)
+        start = 0
+        if initial:
+            saved = self._load_offset()
+            if saved is not None and tuple(saved["ident"]) == ident:
+                start = min(int(saved["offset"]), st.st_size)
+            elif saved is None and not self._from_start:
+                start = st.st_size  # like `tail -f`: only new lines
+        os.lseek(fd, start, os.SEEK_SET)
+        self._fd, self._ident, self._offset, self._partial = fd, ident, start, b""
+        return True
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_available(self) -> None:
+        """Read to EOF (or until a batch is full) and split complete lines."""
+        assert self._fd is not None
+        while len(self._pending) < self._max_lines:
+            chunk = os.read(self._fd, self._read_size)
+            if not chunk:
+                return
+            self._offset += len(chunk)
+            data = self._partial + chunk if self._partial else chunk
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                self._partial = data
+                continue
+            self._partial = data[cut + 1 :]
+            lines = data[:cut].split(b"\n")
+            if b"\r" in data:
+                lines = [ln[:-1] if ln.endswith(b"\r") else ln for ln in lines]
+            self._pending.extend(lines)
+
+    def _check_swap(self) -> bool:
+        """Handle rotation/truncation; True when the position changed."""
+        st = self._stat()
+        if st is None:
+            return False  # rotated away and not recreated yet: keep the old fd
+        if self._fd is None:
+            return self._open()
+        if (st.st_dev, st.st_ino) != self._ident:
+            self._read_available()  # drain what the old file still had
+            if len(self._pending) >= self._max_lines:
+                return False  # deliver first; swap on the next call
+            if self._partial:
+                self._pending.append(self._partial)  # last line had no newline
+            self._close_fd()
+            self.rotations += 1
+            return self._open()
+        if st.st_size < self._offset:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            self._offset, self._partial = 0, b""
+            self.truncations += 1
+            return True
+        return False
+
+    # ----- LogTailPort -----
+
+    def read_batch(self, timeout_s: float = 0.0) -> list[bytes]:
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        while True:
+            if self._fd is not None and len(self._pending) < self._max_lines:
+                self._read_available()
+            if len(self._pending) < self._max_lines and self._check_swap() and self._fd is not None:
+                self._read_available()
+            if self._pending:
+                batch = self._pending[: self._max_lines]
+                del self._pending[: self._max_lines]
+                self._maybe_persist()
+                return batch
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            if self._watch is not None:
+                self._watch.wait(min(remaining, 1.0))  # re-stat at least once a second
+            else:
+                time.sleep(min(remaining, self._poll_s))
+
+    def close(self) -> None:
+        self._maybe_persist(force=True)
+        self._close_fd()
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def __enter__(self) -> FileTailLogPort:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----- offset persistence -----
+
+    def _load_offset(self) -> dict | None:
+        if self.offset_path is None:
+            return None
+        try:
+            data = json.loads(self.offset_path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("path") != str(self.path) or "ident" not in data:
+            return None
+        return dict(data)
+
+    def _maybe_persist(self, force: bool = False) -> None:
+        # Only at batch boundaries with nothing held back, so a resume never skips lines.
+        if self.offset_path is None or self._ident is None or self._pending:
+            return
+        now = time.monotonic()
+        offset = self.offset
+        if offset == self._saved_offset or (not force and now - self._saved_at < self._persist_s):
+            return
+        tmp = self.offset_path.with_name(self.offset_path.name + ".tmp")
+        data = {"path": str(self.path), "ident": list(self._ident), "offset": offset}
+        try:
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.offset_path)
+        except OSError as ex:
+            # Never fail the read: the batch is already dequeued and the caller
+            # would lose it. Keep tailing (a resume may replay a little) and
+            # retry after the next persist interval.
+            self.persist_errors += 1
+            self._saved_at = now
+            if ex.errno == errno.ENOSPC:
+                log.warning("log offset not saved to %s: disk full", self.offset_path)
+            else:
+                log.warning("log offset not saved to %s: %s", self.offset_path, ex)
+            return
+        self._saved_at, self._saved_offset = now, offset
@@ -1,3 +1,10 @@
 from .fakes import FakeClockPort, FakeSleeperPort
+from .virtual import VirtualClockPort, VirtualSleeperPort, VirtualTimer
 
-__all__ = ["FakeClockPort", "FakeSleeperPort"]
+__all__ = [
+    "FakeClockPort",
+    "FakeSleeperPort",
+    "VirtualClockPort",
+    "VirtualSleeperPort",
+    "VirtualTimer",
+]
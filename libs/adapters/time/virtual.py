@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Callable
+
+from ports.time import ClockPort, SleeperPort
+
+
+class VirtualTimer:
+    """Handle for a callback scheduled on a VirtualClockPort."""
+
+    __slots__ = ("when", "callback", "cancelled")
+
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class VirtualClockPort(ClockPort):
+    """
+    Discrete-event clock: time only moves when someone advances it.
+
+    `advance()` (or a VirtualSleeperPort's `sleep()`) jumps straight to the
+    target, firing due timers on the way in (deadline, scheduling) order with
+    `now()` set to each timer's own deadline. Timers scheduled by a callback
+    fire in the same advance if they fall inside it. Code driven by this clock
+    sees exactly the timeline it would see live, minus the waiting.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+        self._timers: list[tuple[float, int, VirtualTimer]] = []
+        self._seq = itertools.count()
+
+    def now(self) -> float:
+        return self._now
+
+    # ----- timers -----
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> VirtualTimer:
+        timer = VirtualTimer(max(float(when), self._now), callback)
+        heapq.heappush(self._timers, (timer.when, next(self._seq), timer))
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> VirtualTimer:
+        return self.call_at(self._now + max(0.0, delay), callback)
+
+    def next_deadline(self) -> float | None:
+        while self._timers and self._timers[0][2].cancelled:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    # ----- moving time -----
+
+    def advance_to(self, when: float) -> int:
+        """Run every timer due at or before `when`, then set now = `when`. Returns fired count."""
+        fired = 0
+        while True:
+            nxt = self.next_deadline()
+            if nxt is None or nxt > when:
+                break
+            _, _, timer = heapq.heappop(self._timers)
+            self._now = max(self._now, timer.when)
+            timer.callback()
+            fired += 1
+        self._now = max(self._now, float(when))
+        return fired
+
+    def advance(self, seconds: float) -> int:
+        return self.advance_to(self._now + max(0.0, seconds))
+
+    def run_until_idle(self, limit: float | None = None) -> int:
+        """Fire timers (jumping to each deadline) until none remain or `limit` is reached."""
+        fired = 0
+        while (nxt := self.next_deadline()) is not None and (limit is None or nxt <= limit):
+            fired += self.advance_to(nxt)
+        return fired
+
+
+class VirtualSleeperPort(SleeperPort):
+    """`sleep()` advances the paired VirtualClockPort instead of blocking."""
+
+    def __init__(self, clock: VirtualClockPort) -> None:
+        self.clock = clock
+        self.slept = 0.0  # total simulated seconds slept
+
+    def sleep(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.slept += seconds
+        self.clock.advance(seconds)
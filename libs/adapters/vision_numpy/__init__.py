@@ -0,0 +1,14 @@
+from .bars import BarSpec, NumpyBarReader
+from .library import TemplateLibrary, compile_library
+from .template import MatchResult, NumpyTemplateMatcher, PreparedImage, PreparedTemplate
+
+__all__ = [
+    "BarSpec",
+    "NumpyBarReader",
+    "MatchResult",
+    "NumpyTemplateMatcher",
+    "PreparedImage",
+    "PreparedTemplate",
+    "TemplateLibrary",
+    "compile_library",
+]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+from ports.vision import ROI, BarGaugePort
+
+BarDirection = Literal["ltr", "rtl", "ttb", "btt"]
+
+
+@dataclass(frozen=True)
+class BarSpec:
+    """Calibration for one bar: where it is and what a 'filled' pixel looks like."""
+
+    name: str
+    roi: ROI
+    color: tuple[int, int, int]  # RGB of the filled part
+    tolerance: int = 40  # max per-channel distance from `color`
+    min_coverage: float = 0.5  # fraction of a column (or row) that must match
+    direction: BarDirection = "ltr"  # fill direction; ltr/rtl project columns, ttb/btt rows
+
+    @classmethod
+    def from_table(cls, name: str, table: Mapping[str, Any]) -> BarSpec:
+        x, y, w, h = (int(v) for v in table["roi"])
+        r, g, b = (int(v) for v in table["color"])
+        return cls(
+            name=name,
+            roi=ROI(x, y, w, h),
+            color=(r, g, b),
+            tolerance=int(table.get("tolerance", 40)),
+            min_coverage=float(table.get("min_coverage", 0.5)),
+            direction=table.get("direction", "ltr"),
+        )
+
+
+class _CompiledBar:
+    """Per-bar constants hoisted out of the hot path."""
+
+    __slots__ = ("name", "rows", "cols", "lo", "span", "min_count", "axis", "length")
+
+    def __init__(self, spec: BarSpec) -> None:
+        x, y, w, h = spec.roi
+        if w <= 0 or h <= 0:
+            raise ValueError(f"bar {spec.name!r}: ROI must have a positive size, got {spec.roi}")
+        if spec.direction not in ("ltr", "rtl", "ttb", "btt"):
+            raise ValueError(f"bar {spec.name!r}: unknown direction {spec.direction!r}")
+        color = np.asarray(spec.color, dtype=np.int16)
+        self.name = spec.name
+        self.rows = slice(y, y + h)
+        self.cols = slice(x, x + w)
+        lo = np.clip(color - spec.tolerance, 0, 255)
+        hi = np.clip(color + spec.tolerance, 0, 255)
+        # uint8 scalars: `(channel - lo) <= span` wraps below `lo`, so one compare per channel.
+        self.lo = tuple(np.uint8(v) for v in lo)
+        self.span = tuple(np.uint8(v) for v in hi - lo)
+        # Horizontal bars are projected onto columns (sum over rows), vertical ones onto rows.
+        self.axis = 0 if spec.direction in ("ltr", "rtl") else 1
+        self.length = w if self.axis == 0 else h
+        thickness = h if self.axis == 0 else w
+        self.min_count = max(1, int(np.ceil(spec.min_coverage * thickness)))
+
+
+class NumpyBarReader(BarGaugePort):
+    """
+    Reads bar fill ratios with a colour mask + 1-D projection instead of OCR.
+
+    For each bar the ROI is masked against the calibrated colour box, the mask is
+    summed across the bar's thickness, and the fill ratio is the fraction of
+    positions along its length whose coverage reaches `min_coverage`. Counting
+    (rather than locating the fill edge) keeps the estimate stable when a few
+    columns are occluded by text or icons.
+    """
+
+    def __init__(self, specs: Iterable[BarSpec]) -> None:
+        self._bars = [_CompiledBar(s) for s in specs]
+        self._by_name = {b.name: b for b in self._bars}
+
+    @classmethod
+    def from_profile(cls, profile: Mapping[str, Any]) -> NumpyBarReader:
+        """Build from a ROI profile table (the `[bars.*]` sections of configs/rois/*.toml)."""
+        bars = profile.get("bars", {}) or {}
+        return cls(BarSpec.from_table(name, table) for name, table in bars.items())
+
+    @property
+    def names(self) -> list[str]:
+        return [b.name for b in self._bars]
+
+    def read(self, image: Any) -> dict[str, float | None]:
+        if image is None:
+            return {b.name: None for b in self._bars}
+        img = np.asarray(image, dtype=np.uint8)
+        return {bar.name: self._fill(img, bar) for bar in self._bars}
+
+    def read_one(self, image: Any, name: str) -> float | None:
+        """Fill ratio of a single bar (lets a scheduler sample bars at different rates)."""
+        bar = self._by_name[name]
+        return None if image is None else self._fill(np.asarray(image, dtype=np.uint8), bar)
+
+    @staticmethod
+    def _fill(img: np.ndarray, bar: _CompiledBar) -> float | None:
+        crop = img[bar.rows, bar.cols]
+        if crop.size == 0:
+            return None  # ROI outside this frame
+        mask = (crop[..., 0] - bar.lo[0]) <= bar.span[0]
+        mask &= (crop[..., 1] - bar.lo[1]) <= bar.span[1]
+        mask &= (crop[..., 2] - bar.lo[2]) <= bar.span[2]
+        coverage = mask.sum(axis=bar.axis)
+        return float(np.count_nonzero(coverage >= bar.min_count)) / bar.length
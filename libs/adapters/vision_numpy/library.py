@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .template import MatchResult, NumpyTemplateMatcher, PreparedImage, PreparedTemplate, to_gray
+
+MANIFEST_NAME = "manifest.json"
+BUNDLE_NAME = "templates.npy"
+LIBRARY_VERSION = 1
+
+_SOURCE_SUFFIXES = (".npy", ".png", ".bmp")
+
+
+def load_template_file(path: Path) -> np.ndarray:
+    """Read one template image. `.npy` is native; PNG/BMP need Pillow."""
+    if path.suffix.lower() == ".npy":
+        return np.asarray(np.load(path))
+    try:
+        from PIL import Image  # optional: only needed to compile image folders
+    except ImportError as e:
+        raise RuntimeError(f"Pillow is required to read {path.name}; save it as .npy") from e
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"))
+
+
+def compile_library(src_dir: str | Path, out_dir: str | Path) -> Path:
+    """
+    Pack every template in `src_dir` into one float32 `templates.npy` plus a
+    `manifest.json` of {name: offset/shape}. Names are file stems. Returns the
+    manifest path.
+    """
+    src, out = Path(src_dir), Path(out_dir)
+    files = sorted(p for p in src.iterdir() if p.suffix.lower() in _SOURCE_SUFFIXES)
+    if not files:
+        raise ValueError(f"no templates ({', '.join(_SOURCE_SUFFIXES)}) in {src}")
+
+    entries: dict[str, dict[str, Any]] = {}
+    chunks: list[np.ndarray] = []
+    offset = 0
+    for f in files:
+        if f.stem in entries:
+            raise ValueError(f"duplicate template name {f.stem!r} in {src}")
+        g = np.ascontiguousarray(to_gray(load_template_file(f)), dtype=np.float32)
+        entries[f.stem] = {"offset": offset, "shape": list(g.shape), "source": f.name}
+        chunks.append(g.ravel())
+        offset += g.size
+
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / BUNDLE_NAME, np.concatenate(chunks))
+    manifest = {
+        "version": LIBRARY_VERSION,
+        "bundle": BUNDLE_NAME,
+        "dtype": "float32",
+        "templates": entries,
+    }
+    path = out / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return path
+
+
+class TemplateLibrary:
+    """
+    A compiled template folder, opened lazily: nothing is read until the first
+    lookup, and then the bundle is memory-mapped so only touched templates are
+    paged in. Prepared statistics are cached per template for the process.
+    """
+
+    def __init__(self, path: str | Path, matcher: NumpyTemplateMatcher | None = None) -> None:
+        self.path = Path(path)
+        self.matcher = matcher or NumpyTemplateMatcher(track=False)
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._bundle: np.ndarray | None = None
+        self._prepared: dict[str, PreparedTemplate] = {}
+
+    def _open(self) -> tuple[dict[str, dict[str, Any]], np.ndarray]:
+        if self._entries is None or self._bundle is None:
+            manifest = json.loads((self.path / MANIFEST_NAME).read_text("utf-8"))
+            if int(manifest.get("version", 0)) != LIBRARY_VERSION:
+                raise RuntimeError(f"unsupported template library version in {self.path}")
+            self._bundle = np.load(self.path / manifest["bundle"], mmap_mode="r")
+            self._entries = dict(manifest["templates"])
+        return self._entries, self._bundle
+
+    @property
+    def loaded(self) -> bool:
+        return self._bundle is not None
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._open()[0])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._open()[0]
+
+    def get(self, name: str) -> np.ndarray:
+        """Zero-copy view of one template (float32 gray) into the mapped bundle."""
+        entries, bundle = self._open()
+        try:
+            e = entries[name]
+        except KeyError:
+            raise KeyError(f"unknown template {name!r} in {self.path}") from None
+        h, w = e["shape"]
+        start = int(e["offset"])
+        return bundle[start : start + h * w].reshape(h, w)
+
+    def prepared(self, name: str) -> PreparedTemplate:
+        tpl = self._prepared.get(name)
+        if tpl is None:
+            tpl = PreparedTemplate(self.get(name))
+            self._prepared[name] = tpl
+        return tpl
+
+    def match_all(
+        self, image: Any, names: Iterable[str] | None = None
+    ) -> dict[str, MatchResult | None]:
+        """
+        Best window per template, with scores; callers apply their own thresholds.
+        The frame is prepared once (gray, pyramid, FFTs, window stats per template
+        size) and shared by every template. None = template flat or larger than frame.
+        """
+        img = image if isinstance(image, PreparedImage) else PreparedImage(image)
+        wanted = self.names if names is None else list(names)
+        return {n: self.matcher.best(img, self.prepared(n)) for n in wanted}
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import numpy as np
+from ports.vision import TemplateMatchPort
+
+_EPS = 1e-9
+_R, _G, _B = np.float32(0.299), np.float32(0.587), np.float32(0.114)
+
+
+class MatchResult(NamedTuple):
+    x: int  # top-left of the matched window, full-resolution pixels
+    y: int
+    score: float  # normalized cross-correlation in [-1, 1]
+
+
+def to_gray(image: Any) -> np.ndarray:
+    """HxW luminance: float32 from RGB/RGBA (plenty for 8-bit pixels), float64 from gray."""
+    a = np.asarray(image)
+    if a.ndim == 2:
+        return a.astype(np.float64, copy=False)
+    if a.ndim == 3 and a.shape[2] >= 3:
+        return a[..., 0] * _R + a[..., 1] * _G + a[..., 2] * _B
+    raise ValueError(f"expected a HxW or HxWxC image, got shape {a.shape}")
+
+
+def _fast_len(n: int) -> int:
+    """Smallest 2^a * 3^b * 5^c >= n (cheap FFT sizes)."""
+    best = 1 << max(0, (n - 1).bit_length())
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _block_mean(g: np.ndarray, f: int) -> np.ndarray:
+    """f x f box average (drops trailing rows/columns); one pass instead of log2(f) halvings."""
+    if f == 1:
+        return g
+    h, w = g.shape[0] // f * f, g.shape[1] // f * f
+    rows = g[:h, :w].reshape(h // f, f, w).sum(axis=1)
+    return rows.reshape(h // f, w // f, f).sum(axis=2) * (1.0 / (f * f))
+
+
+class PreparedTemplate:
+    """Per-template statistics reused across frames: mean, norm, padded spectra."""
+
+    __slots__ = ("shape", "mean", "norm", "zero_mean", "last", "_spectra", "_levels")
+
+    def __init__(self, template: Any) -> None:
+        g = to_gray(template)
+        self.shape: tuple[int, int] = (int(g.shape[0]), int(g.shape[1]))
+        self.mean = float(g.mean())
+        self.zero_mean = g - self.mean
+        self.norm = float(np.sqrt(np.square(self.zero_mean).sum()))
+        self.last: tuple[int, int] | None = None  # last match (x, y), for tracking
+        self._spectra: dict[tuple[int, int], np.ndarray] = {}
+        self._levels: dict[int, PreparedTemplate] = {0: self}
+
+    def spectrum(self, fft_shape: tuple[int, int]) -> np.ndarray:
+        """conj(FFT) of the zero-mean template zero-padded to `fft_shape`."""
+        spec = self._spectra.get(fft_shape)
+        if spec is None:
+            spec = np.conj(np.fft.rfft2(self.zero_mean, s=fft_shape))
+            self._spectra[fft_shape] = spec
+        return spec
+
+    def level(self, n: int) -> PreparedTemplate:
+        """This template downsampled `n` times (cached)."""
+        lvl = self._levels.get(n)
+        if lvl is None:
+            lvl = PreparedTemplate(_block_mean(self.zero_mean + self.mean, 1 << n))
+            self._levels[n] = lvl
+        return lvl
+
+
+class PreparedImage:
+    """
+    Image-side precomputation shared by every template matched against it:
+    gray conversion, pyramid levels, integral images (sum / sum of squares) and
+    the padded FFT. Everything is computed lazily, so a hinted search that only
+    looks at a small window never converts the full frame.
+    """
+
+    __slots__ = ("_raw", "_gray", "_integrals", "_ffts", "_windows", "_levels")
+
+    def __init__(self, image: Any) -> None:
+        self._raw = np.asarray(image)
+        self._gray: np.ndarray | None = None
+        self._integrals: tuple[np.ndarray, np.ndarray] | None = None
+        self._ffts: dict[tuple[int, int], np.ndarray] = {}
+        self._windows: dict[tuple[int, int], np.ndarray] = {}
+        self._levels: dict[int, PreparedImage] = {0: self}
+
+    @staticmethod
+    def _integral(a: np.ndarray) -> np.ndarray:
+        out = np.zeros((a.shape[0] + 1, a.shape[1] + 1), dtype=np.float64)
+        np.cumsum(np.cumsum(a, axis=0, dtype=np.float64), axis=1, out=out[1:, 1:])
+        return out
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            self._gray = to_gray(self._raw)
+        return self._gray
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (int(self._raw.shape[0]), int(self._raw.shape[1]))
+
+    def crop(self, y0: int, y1: int, x0: int, x1: int) -> PreparedImage:
+        src = self._raw if self._gray is None else self._gray
+        return PreparedImage(src[y0:y1, x0:x1])
+
+    @property
+    def fft_shape(self) -> tuple[int, int]:
+        # Circular correlation does not wrap for valid offsets as long as we pad to >= H, W.
+        h, w = self.shape
+        return (_fast_len(h), _fast_len(w))
+
+    def spectrum(self) -> np.ndarray:
+        fs = self.fft_shape
+        spec = self._ffts.get(fs)
+        if spec is None:
+            spec = np.fft.rfft2(self.gray, s=fs)
+            self._ffts[fs] = spec
+        return spec
+
+    def level(self, n: int) -> PreparedImage:
+        """This image downsampled `n` times (cached, so templates share the pyramid)."""
+        lvl = self._levels.get(n)
+        if lvl is None:
+            lvl = PreparedImage(_block_mean(self.gray, 1 << n))
+            self._levels[n] = lvl
+        return lvl
+
+    def window_std(self, h: int, w: int) -> np.ndarray:
+        """sqrt(sum (I - mean_window)^2) for every valid h x w window."""
+        key = (h, w)
+        out = self._windows.get(key)
+        if out is None:
+            if self._integrals is None:
+                g = self.gray
+                self._integrals = (
+                    self._integral(g),
+                    self._integral(np.square(g, dtype=np.float64)),
+                )
+            (s, q), n = self._integrals, float(h * w)
+            ws = s[h:, w:] - s[:-h, w:] - s[h:, :-w] + s[:-h, :-w]
+            wq = q[h:, w:] - q[:-h, w:] - q[h:, :-w] + q[:-h, :-w]
+            out = np.sqrt(np.maximum(wq - ws * ws / n, 0.0))
+            self._windows[key] = out
+        return out
+
+    def ncc(self, tpl: PreparedTemplate) -> np.ndarray:
+        """Normalized cross-correlation map, shape (H-h+1, W-w+1); empty if tpl is larger."""
+        (ih, iw), (th, tw) = self.shape, tpl.shape
+        if th > ih or tw > iw:
+            return np.empty((0, 0))
+        fs = self.fft_shape
+        corr = np.fft.irfft2(self.spectrum() * tpl.spectrum(fs), s=fs)
+        num = corr[: ih - th + 1, : iw - tw + 1]
+        den = self.window_std(th, tw) * tpl.norm
+        return np.divide(num, den, out=np.zeros_like(num), where=den > _EPS)
+
+
+def _peaks(scores: np.ndarray, k: int, sep: tuple[int, int]) -> list[tuple[int, int]]:
+    """Top-k local maxima (y, x) at least `sep` apart."""
+    s = scores.copy()
+    out: list[tuple[int, int]] = []
+    sy, sx = sep
+    for _ in range(k):
+        i = int(np.argmax(s))
+        y, x = divmod(i, s.shape[1])
+        if s[y, x] == -np.inf:
+            break
+        out.append((y, x))
+        s[max(0, y - sy) : y + sy + 1, max(0, x - sx) : x + sx + 1] = -np.inf
+    return out
+
+
+class NumpyTemplateMatcher(TemplateMatchPort):
+    """
+    FFT normalized cross-correlation with a coarse-to-fine pyramid.
+
+    - The frame and template are box-downsampled by powers of two until the template's short side
+      would drop below `min_template_side` (at most `max_levels` times); the whole
+      coarse frame is scored via FFT and integral images.
+    - The best `candidates` coarse peaks are re-scored at full resolution in a
+      small window, so full-res work is proportional to the candidate count.
+      Coarse scores are only used for ranking: box-downsampling out of phase with
+      the UI's pixel grid can halve them, while the peak position stays right.
+    - Template statistics (mean, norm, padded spectra, pyramid levels) are cached
+      by content digest; pass a PreparedTemplate to skip hashing entirely.
+    - `hint` (or, with `track=True`, the last match of the same template) seeds a
+      windowed full-res search that short-circuits the global one when it reaches
+      `threshold`.
+
+    `match` returns the top-left (x, y) of the best window.
+    """
+
+    def __init__(
+        self,
+        max_levels: int = 3,
+        min_template_side: int = 8,
+        candidates: int = 4,
+        hint_radius: int = 16,
+        track: bool = True,
+        cache_size: int = 64,
+    ) -> None:
+        self.max_levels = max(0, int(max_levels))
+        self.min_template_side = max(2, int(min_template_side))
+        self.candidates = max(1, int(candidates))
+        self.hint_radius = max(0, int(hint_radius))
+        self.track = track
+        self._cache_size = max(1, int(cache_size))
+        self._cache: OrderedDict[bytes, PreparedTemplate] = OrderedDict()
+
+    # ----- template cache -----
+
+    def prepare(self, template: Any) -> PreparedTemplate:
+        if isinstance(template, PreparedTemplate):
+            return template
+        a = np.ascontiguousarray(template)
+        h = hashlib.blake2b(a.tobytes(), digest_size=16)
+        h.update(f"{a.shape}{a.dtype.str}".encode())
+        key = h.digest()
+        tpl = self._cache.get(key)
+        if tpl is None:
+            tpl = PreparedTemplate(a)
+            self._cache[key] = tpl
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return tpl
+
+    # ----- TemplateMatchPort -----
+
+    def match(
+        self,
+        image: Any,
+        template: Any,
+        threshold: float = 0.95,
+        *,
+        hint: tuple[int, int] | None = None,
+    ) -> tuple[int, int] | None:
+        res = self.best(image, template, threshold=threshold, hint=hint)
+        if res is None or res.score < threshold:
+            return None
+        return (res.x, res.y)
+
+    def best(
+        self,
+        image: Any,
+        template: Any,
+        threshold: float | None = None,
+        *,
+        hint: tuple[int, int] | None = None,
+    ) -> MatchResult | None:
+        """Best window for `template`; `threshold` only gates the hint shortcut."""
+        tpl = self.prepare(template)
+        if tpl.norm <= _EPS:
+            return None  # flat template: NCC undefined
+        img = image if isinstance(image, PreparedImage) else PreparedImage(image)
+        th, tw = tpl.shape
+        ih, iw = img.shape
+        if th > ih or tw > iw:
+            return None
+
+        if hint is None and self.track:
+            hint = tpl.last
+        if hint is not None and threshold is not None:
+            res = self._refine(img, tpl, [hint], self.hint_radius)
+            if res is not None and res.score >= threshold:
+                return self._remember(tpl, res)
+
+        levels = 0
+        while levels < self.max_levels and min(th, tw) >> (levels + 1) >= self.min_template_side:
+            levels += 1
+        if levels == 0:
+            scores = img.ncc(tpl)
+            y, x = divmod(int(np.argmax(scores)), scores.shape[1])
+            return self._remember(tpl, MatchResult(x, y, float(scores[y, x])))
+
+        ctpl = tpl.level(levels)
+        scores = img.level(levels).ncc(ctpl)
+        if scores.size == 0:
+            return None
+        ch, cw = ctpl.shape
+        peaks = _peaks(scores, self.candidates, (max(1, ch // 2), max(1, cw // 2)))
+        scale = 1 << levels
+        res = self._refine(img, tpl, [(x * scale, y * scale) for y, x in peaks], scale)
+        return None if res is None else self._remember(tpl, res)
+
+    # ----- helpers -----
+
+    def _refine(
+        self,
+        img: PreparedImage,
+        tpl: PreparedTemplate,
+        starts: list[tuple[int, int]],
+        radius: int,
+    ) -> MatchResult | None:
+        """Full-res NCC in a (2*radius+1)^2 window around each (x, y) start."""
+        th, tw = tpl.shape
+        ih, iw = img.shape
+        best: MatchResult | None = None
+        for sx, sy in starts:
+            x0, y0 = max(0, sx - radius), max(0, sy - radius)
+            x1, y1 = min(iw - tw, sx + radius), min(ih - th, sy + radius)
+            if x1 < x0 or y1 < y0:
+                continue
+            sub = img.crop(y0, y1 + th, x0, x1 + tw)
+            scores = sub.ncc(tpl)
+            y, x = divmod(int(np.argmax(scores)), scores.shape[1])
+            score = float(scores[y, x])
+            if best is None or score > best.score:
+                best = MatchResult(x0 + x, y0 + y, score)
+        return best
+
+    def _remember(self, tpl: PreparedTemplate, res: MatchResult) -> MatchResult:
+        if self.track:
+            tpl.last = (res.x, res.y)
+        return res
@@ -1,4 +1,14 @@
 from .model import AgentContext, AgentState
+from .scheduler import FixedRateScheduler, OverrunPolicy
 from .service import AgentService
+from .vision import VisionScheduler, VisionTask
 
-__all__ = ["AgentContext", "AgentState", "AgentService"]
+__all__ = [
+    "AgentContext",
+    "AgentState",
+    "AgentService",
+    "FixedRateScheduler",
+    "OverrunPolicy",
+    "VisionScheduler",
+    "VisionTask",
+]
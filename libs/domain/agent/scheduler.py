@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any, Literal
+
+from ports.time import ClockPort, SleeperPort
+from shared.utils.histogram import Histogram
+
+OverrunPolicy = Literal["catch_up", "skip"]
+
+
+class FixedRateScheduler:
+    """
+    Fixed-rate ticks on an absolute grid: slot n is due at `start + n * period`.
+
+    Lateness never shifts later deadlines. When a tick runs so long that
+    whole slots went by, the `overrun` policy decides what happens to them:
+    "catch_up" runs them back to back (at most `max_catch_up`, the rest are
+    skipped), "skip" drops them. Either way the most recent due slot runs
+    right away.
+
+    Per tick it records wakeup jitter (start - deadline) and work time in
+    histograms, plus overrun/skip counts; `stats()` summarises them for
+    telemetry.
+
+    Use `run()`/`wait()` to drive a loop, or `due()` + `done()` to fold the
+    schedule into a loop that polls other things between ticks.
+    """
+
+    def __init__(
+        self,
+        clock: ClockPort,
+        sleeper: SleeperPort,
+        rate_hz: float,
+        overrun: OverrunPolicy = "skip",
+        max_catch_up: int = 5,
+    ) -> None:
+        if overrun not in ("catch_up", "skip"):
+            raise ValueError(f"unknown overrun policy {overrun!r}")
+        self.clock = clock
+        self.sleeper = sleeper
+        self.period = 1.0 / max(rate_hz, 1e-6)
+        self.overrun_policy = overrun
+        self.max_catch_up = max(0, int(max_catch_up))
+        self.start: float | None = None
+        self.slot = 0  # next slot to run
+        self.ticks = 0
+        self.overruns = 0  # ticks that ran past the following deadline
+        self.skipped = 0  # slots dropped instead of run
+        self.jitter = Histogram()
+        self.work = Histogram()
+        self._tick_start: float | None = None
+
+    def reset(self, start: float | None = None) -> None:
+        """Put slot 0 at `start` (default: now)."""
+        self.start = self.clock.now() if start is None else float(start)
+        self.slot = 0
+
+    @property
+    def next_deadline(self) -> float:
+        if self.start is None:
+            self.reset()
+        assert self.start is not None
+        return self.start + self.slot * self.period
+
+    # ----- tick bookkeeping -----
+
+    def _begin(self, now: float) -> None:
+        self.jitter.record(max(0.0, now - self.next_deadline))
+        self._tick_start = now
+
+    def done(self) -> None:
+        """Close the open tick (records its work time) and pick the next slot."""
+        if self._tick_start is None:
+            return
+        assert self.start is not None
+        now, started = self.clock.now(), self._tick_start
+        self.work.record(now - started)
+        self._tick_start = None
+        self.ticks += 1
+        self.slot += 1
+        if started <= self.next_deadline < now:  # this tick made the next one late
+            self.overruns += 1
+        # slots that are already due, not counting the newest one (it runs next regardless)
+        behind = math.floor((now - self.start) / self.period) - self.slot
+        if behind <= 0:
+            return
+        allowed = self.max_catch_up if self.overrun_policy == "catch_up" else 0
+        if behind > allowed:
+            drop = behind - allowed
+            self.slot += drop
+            self.skipped += drop
+
+    # ----- driving -----
+
+    def wait(self) -> float:
+        """Sleep until the next slot is due and open it; returns its deadline."""
+        self.done()
+        deadline = self.next_deadline
+        delay = deadline - self.clock.now()
+        if delay > 0:
+            self.sleeper.sleep(delay)
+        self._begin(self.clock.now())
+        return deadline
+
+    def due(self) -> bool:
+        """
+        Non-blocking: True (and the slot is opened) when the next slot is due.
+        Call `done()` after the tick's work; otherwise the next `due()` does.
+        """
+        self.done()
+        now = self.clock.now()
+        if now < self.next_deadline:
+            return False
+        self._begin(now)
+        return True
+
+    def run(
+        self, fn: Callable[[], Any], seconds: float | None = None, ticks: int | None = None
+    ) -> int:
+        """Call `fn` once per slot for `seconds` of clock time and/or `ticks` calls."""
+        if self.start is None:
+            self.reset()
+        assert self.start is not None
+        end = math.inf if seconds is None else self.next_deadline + seconds
+        ran = 0
+        while (ticks is None or ran < ticks) and self.next_deadline < end:
+            self.wait()
+            try:
+                fn()
+            finally:
+                self.done()
+            ran += 1
+        return ran
+
+    def stats(self) -> dict[str, Any]:
+        jitter = self.jitter.summary()
+        work = self.work.summary()
+        return {
+            "rate_hz": 1.0 / self.period,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_p50_ms": jitter.get("p50", 0.0),
+            "jitter_p95_ms": jitter.get("p95", 0.0),
+            "jitter_max_ms": jitter.get("max", 0.0),
+            "work_p50_ms": work.get("p50", 0.0),
+            "work_p95_ms": work.get("p95", 0.0),
+            "work_max_ms": work.get("max", 0.0),
+        }
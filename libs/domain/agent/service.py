@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from typing import Final
 
+from domain.policies import Decision, Policy
+from domain.state import StateSnapshot, StateStore
 from ports.telemetry import TelemetryPort
 from ports.time import ClockPort, SleeperPort
+from ports.vision import BarGaugePort, ScreenCapturePort
 from shared.contracts.v1.telemetry import Telemetry
 
 from .model import AgentContext
+from .scheduler import FixedRateScheduler, OverrunPolicy
 
 
 class AgentService:
@@ -19,26 +23,84 @@ class AgentService:
         telem: TelemetryPort,
         agent_id: str,
         heartbeat_hz: float = 5.0,
+        capture: ScreenCapturePort | None = None,
+        bars: BarGaugePort | None = None,
+        policy: Policy | None = None,
+        overrun: OverrunPolicy = "skip",
     ) -> None:
         self.clock: Final = clock
         self.sleep: Final = sleep
         self.telem: Final = telem
+        self.capture = capture
+        self.bars = bars
         self.ctx = AgentContext(agent_id=agent_id, state="ASSIST")
         self._period = 1.0 / max(0.1, heartbeat_hz)
+        self.scheduler = FixedRateScheduler(clock, sleep, max(0.1, heartbeat_hz), overrun=overrun)
         self._hold = False
+        self.policy = policy
+        # observed state; anyone may add keys (log events, input state, ...)
+        self.state = StateStore()
+        self.decision: Decision | None = None
+        self._policy_version = self.state.version
 
     def set_hold(self, value: bool) -> None:
         self._hold = bool(value)
 
     def tick(self) -> None:
-        """One iteration: compute state + publish telemetry."""
+        """One iteration: read vitals, run the policy (unless on hold), publish telemetry."""
         now = self.clock.now()
         state = "HOLD" if self._hold else self.ctx.state
+        hp, mana = self.read_vitals()
+        self.state.update(state=self.ctx.state, hp=hp, mana=mana)
+        if self.policy is not None and not self._hold:
+            # the tree only re-evaluates what reads keys changed since its last tick
+            snapshot = self.state.snapshot()
+            changed = self.state.diff(self._policy_version).keys
+            self.decision = self.policy.tick(snapshot, changed)
+            self._policy_version = snapshot.version
+        sched = self.scheduler
         self.telem.publish(
-            Telemetry(agent_id=self.ctx.agent_id, state=state, hp=None, mana=None, ts=now)
+            Telemetry(
+                agent_id=self.ctx.agent_id,
+                state=state,
+                hp=hp,
+                mana=mana,
+                ts=now,
+                tick=sched.stats() if sched.ticks else None,
+            )
         )
         self.ctx.last_ts = now
 
+    @property
+    def blackboard(self) -> StateSnapshot:
+        """What the policy sees: the current state snapshot."""
+        return self.state.snapshot()
+
+    def read_vitals(self) -> tuple[int | None, int | None]:
+        """HP/mana in percent from the bar gauges; (None, None) without vision."""
+        if self.capture is None or self.bars is None:
+            return None, None
+        fills = self.bars.read(self.capture.grab().rgba)
+        return fill_percent(fills.get("hp")), fill_percent(fills.get("mana"))
+
+    def run_for(self, seconds: float) -> int:
+        """
+        Tick at the heartbeat rate for `seconds` of clock time; returns ticks.
+
+        Deadlines are absolute (`start + n * period`, see FixedRateScheduler) and
+        waiting goes through the SleeperPort, so with a virtual clock the same
+        timeline runs at CPU speed.
+        """
+        self.scheduler.reset()
+        return self.scheduler.run(self.tick, seconds=seconds)
+
     @property
     def period(self) -> float:
         return self._period
+
+
+def fill_percent(fill: float | None) -> int | None:
+    """Bar fill ratio (0.0-1.0) -> telemetry percent (0-100)."""
+    if fill is None:
+        return None
+    return round(min(max(fill, 0.0), 1.0) * 100)
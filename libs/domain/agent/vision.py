@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from ports.time import ClockPort
+from ports.vision import ROI, Frame, ScreenCapturePort
+
+
+@dataclass(frozen=True)
+class VisionTask:
+    """One capture→analyze stage sampled at its own rate."""
+
+    name: str
+    rate_hz: float
+    analyze: Callable[[Frame], Any]
+    roi: ROI | None = None  # None = full frame
+    priority: int = 0  # lower runs first; <= critical_priority is never shed
+    on_result: Callable[[str, Any], None] | None = None
+
+
+class _TaskState:
+    __slots__ = ("task", "period", "start", "slot", "runs", "missed", "shed", "last_run", "ewma_dt")
+
+    def __init__(self, task: VisionTask, start: float) -> None:
+        self.task = task
+        self.period = 1.0 / max(task.rate_hz, 1e-6)
+        self.start = start
+        self.slot = 0  # deadline = start + slot * period (no float accumulation)
+        self.runs = 0
+        self.missed = 0  # whole periods that elapsed without a run
+        self.shed = 0  # due but dropped because the tick ran over budget
+        self.last_run: float | None = None
+        self.ewma_dt: float | None = None
+
+    @property
+    def deadline(self) -> float:
+        return self.start + self.slot * self.period
+
+
+class VisionScheduler:
+    """
+    Runs vision tasks at per-task rates off absolute deadlines.
+
+    Deadlines sit on a fixed grid (`start + n * period`), so a late tick does
+    not shift later samples. A priority queue keyed by (deadline, priority) yields
+    the due tasks; they run in priority order and, once `budget_s` is spent, the
+    remaining non-critical ones are shed until their next slot. Frames are grabbed
+    once per distinct ROI per call.
+    """
+
+    def __init__(
+        self,
+        clock: ClockPort,
+        capture: ScreenCapturePort,
+        tasks: Iterable[VisionTask] = (),
+        critical_priority: int = 0,
+        ewma_alpha: float = 0.2,
+        on_frame: Callable[[ROI | None, Frame], None] | None = None,
+    ) -> None:
+        self.clock = clock
+        self.capture = capture
+        self.on_frame = on_frame  # e.g. a recorder; sees each grab once
+        self.critical_priority = critical_priority
+        self._alpha = float(ewma_alpha)
+        self._states: dict[str, _TaskState] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self.latest: dict[str, Any] = {}
+        for t in tasks:
+            self.add(t)
+
+    def add(self, task: VisionTask) -> None:
+        if task.name in self._states:
+            raise ValueError(f"duplicate vision task {task.name!r}")
+        st = _TaskState(task, self.clock.now())
+        self._states[task.name] = st
+        heapq.heappush(self._heap, (st.deadline, task.priority, task.name))
+
+    def next_deadline(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, budget_s: float | None = None) -> int:
+        """Run every due task (most important first) within `budget_s`; returns runs."""
+        now = self.clock.now()
+        due: list[_TaskState] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name = heapq.heappop(self._heap)
+            due.append(self._states[name])
+        if not due:
+            return 0
+        due.sort(key=lambda s: s.task.priority)
+
+        end = None if budget_s is None else now + budget_s
+        frames: dict[ROI | None, Frame] = {}
+        ran = 0
+        for st in due:
+            task = st.task
+            if (
+                end is not None
+                and task.priority > self.critical_priority
+                and self.clock.now() >= end
+            ):
+                st.shed += 1
+            else:
+                frame = frames.get(task.roi)
+                if frame is None:
+                    frame = frames[task.roi] = self.capture.grab(task.roi)
+                    if self.on_frame is not None:
+                        self.on_frame(task.roi, frame)
+                result = task.analyze(frame)
+                self.latest[task.name] = result
+                if task.on_result is not None:
+                    task.on_result(task.name, result)
+                self._mark_run(st, now)
+                ran += 1
+            self._advance(st, now)
+            heapq.heappush(self._heap, (st.deadline, task.priority, task.name))
+        return ran
+
+    def _mark_run(self, st: _TaskState, now: float) -> None:
+        if st.last_run is not None:
+            dt = now - st.last_run
+            st.ewma_dt = dt if st.ewma_dt is None else st.ewma_dt + self._alpha * (dt - st.ewma_dt)
+        st.last_run = now
+        st.runs += 1
+
+    @staticmethod
+    def _advance(st: _TaskState, now: float) -> None:
+        # Next slot on the original grid strictly after `now`; skipped slots are counted.
+        behind = max(0, math.floor((now - st.deadline) / st.period))
+        st.missed += behind
+        st.slot += behind + 1
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """Per task: target/actual Hz, runs, and skipped (= missed slots + shed)."""
+        out: dict[str, dict[str, float | int]] = {}
+        for name, st in self._states.items():
+            actual = 1.0 / st.ewma_dt if st.ewma_dt else 0.0
+            out[name] = {
+                "target_hz": round(st.task.rate_hz, 3),
+                "actual_hz": round(actual, 3),
+                "runs": st.runs,
+                "skipped": st.missed + st.shed,
+                "shed": st.shed,
+            }
+        return out
@@ -0,0 +1,17 @@
+from .executor import InputExecutor, Key
+from .paths import MousePath, MousePathGenerator, PathKind, PathPoint
+from .preempt import HumanPreemption
+from .timeline import InputTimeline, PrecisionSleeper, TimedAction
+
+__all__ = [
+    "HumanPreemption",
+    "InputExecutor",
+    "InputTimeline",
+    "Key",
+    "MousePath",
+    "MousePathGenerator",
+    "PathKind",
+    "PathPoint",
+    "PrecisionSleeper",
+    "TimedAction",
+]
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from ports.input import KeyboardMousePort, KeyEvent, MousePathPoint
+from ports.time import ClockPort
+
+_EPS = 1e-9  # clock arithmetic slack when testing for a whole token
+
+
+@dataclass(slots=True)
+class Key:
+    """A `KeyEvent` produced by the executor."""
+
+    scan: int
+    down: bool
+
+
+@dataclass(slots=True)
+class _KeyOp:
+    scan: int
+    down: bool
+    hold_s: float | None = None  # down + automatic release after hold_s (a tap)
+
+
+@dataclass(slots=True)
+class _PathOp:
+    path: Sequence[MousePathPoint]
+
+
+class InputExecutor:
+    """
+    Queues input actions and plays them through a `KeyboardMousePort`
+    without blocking the caller.
+
+    `pump()` (called from the agent loop) sends everything that is due:
+    adjacent key actions go out as one `send_keys` batch, and a tap's key-up
+    is scheduled `down_ms` later and released by a later pump instead of
+    sleeping inline the way `tap_scancode` does. Actions are admitted by a
+    token bucket of `max_rate_hz` (bursts up to `burst`); scheduled
+    releases are never rate limited. Re-pressing a key whose release is
+    still pending releases it first.
+
+    `hold()` drops the queue and pending releases, then calls
+    `key_up_all()`; a lock makes it wait for a batch already being sent,
+    so nothing queued before the hold reaches the port after it. While
+    held, new actions are refused until `resume()`.
+    """
+
+    def __init__(
+        self,
+        port: KeyboardMousePort,
+        clock: ClockPort,
+        max_rate_hz: float = 30.0,
+        burst: int = 4,
+        tap_ms: float = 45.0,
+        max_batch: int = 32,
+        max_queue: int = 256,
+    ) -> None:
+        self.port = port
+        self.clock = clock
+        self.max_rate_hz = max(float(max_rate_hz), 1e-6)
+        self.burst = max(1, int(burst))
+        self.tap_s = max(0.0, float(tap_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.max_queue = max(1, int(max_queue))
+        self._lock = threading.RLock()
+        self._queue: deque[_KeyOp | _PathOp] = deque()
+        self._releases: list[tuple[float, int]] = []  # heap of (due, scan)
+        self._release_at: dict[int, float] = {}  # live entries; stale heap items are skipped
+        self._down: set[int] = set()
+        self._tokens = float(self.burst)
+        self._refilled: float | None = None
+        self.held = False
+        self.actions = 0  # queued actions sent
+        self.batches = 0  # send_keys calls
+        self.events = 0  # key events sent
+        self.paths = 0
+        self.dropped = 0  # refused (held / full) or flushed
+        self.throttled = 0  # pumps that left work queued for lack of tokens
+
+    # ----- queueing -----
+
+    def _push(self, ops: Iterable[_KeyOp | _PathOp]) -> bool:
+        ops = list(ops)
+        with self._lock:
+            if self.held or len(self._queue) + len(ops) > self.max_queue:
+                self.dropped += len(ops)
+                return False
+            self._queue.extend(ops)
+            return True
+
+    def tap(self, scan: int, down_ms: float | None = None) -> bool:
+        hold_s = self.tap_s if down_ms is None else max(0.0, down_ms) / 1000.0
+        return self._push([_KeyOp(scan, True, hold_s)])
+
+    def press(self, scan: int) -> bool:
+        return self._push([_KeyOp(scan, True)])
+
+    def release(self, scan: int) -> bool:
+        return self._push([_KeyOp(scan, False)])
+
+    def keys(self, events: Iterable[KeyEvent]) -> bool:
+        """Queue raw key events; each counts as one action."""
+        return self._push(_KeyOp(e.scan, e.down) for e in events)
+
+    def move(self, path: Sequence[MousePathPoint]) -> bool:
+        return self._push([_PathOp(path)])
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def pressed(self) -> frozenset[int]:
+        return frozenset(self._down)
+
+    # ----- playing -----
+
+    def _refill(self, now: float) -> None:
+        if self._refilled is not None:
+            gained = (now - self._refilled) * self.max_rate_hz
+            self._tokens = min(float(self.burst), self._tokens + gained)
+        self._refilled = now
+
+    def _due_releases(self, now: float, batch: list[Key]) -> None:
+        while self._releases and self._releases[0][0] <= now:
+            due, scan = heapq.heappop(self._releases)
+            if self._release_at.get(scan) == due:
+                del self._release_at[scan]
+                self._down.discard(scan)
+                batch.append(Key(scan, False))
+
+    def _key(self, op: _KeyOp, now: float, batch: list[Key]) -> None:
+        scan = op.scan
+        self._release_at.pop(scan, None)  # an explicit action overrides a scheduled release
+        if op.down:
+            if scan in self._down:
+                batch.append(Key(scan, False))  # re-press: let go first
+            batch.append(Key(scan, True))
+            self._down.add(scan)
+            if op.hold_s is not None:
+                due = now + op.hold_s
+                self._release_at[scan] = due
+                heapq.heappush(self._releases, (due, scan))
+        else:
+            batch.append(Key(scan, False))
+            self._down.discard(scan)
+
+    def _send(self, batch: list[Key]) -> None:
+        if batch:
+            self.port.send_keys(batch)
+            self.batches += 1
+            self.events += len(batch)
+            batch.clear()
+
+    def pump(self, now: float | None = None) -> int:
+        """Send what is due at `now` (default: clock); returns actions sent."""
+        with self._lock:
+            now = self.clock.now() if now is None else now
+            self._refill(now)
+            batch: list[Key] = []
+            self._due_releases(now, batch)
+            sent = 0
+            while self._queue and self._tokens >= 1.0 - _EPS:
+                op = self._queue[0]
+                if isinstance(op, _PathOp):
+                    self._send(batch)
+                    self.port.mouse_path(op.path)
+                    self.paths += 1
+                elif len(batch) >= self.max_batch:
+                    self._send(batch)
+                    continue
+                else:
+                    self._key(op, now, batch)
+                self._queue.popleft()
+                self._tokens = max(0.0, self._tokens - 1.0)
+                sent += 1
+            self._send(batch)
+            if self._queue:
+                self.throttled += 1
+            self.actions += sent
+            return sent
+
+    def next_due(self, now: float | None = None) -> float | None:
+        """Earliest time `pump()` has something to do, or None when idle."""
+        with self._lock:
+            heap, live = self._releases, self._release_at
+            while heap and live.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)  # cancelled or superseded: nothing will happen then
+            due = heap[0][0] if heap else None
+            if self._queue and not self.held:
+                now = self.clock.now() if now is None else now
+                self._refill(now)
+                ready = now + max(0.0, 1.0 - self._tokens) / self.max_rate_hz
+                due = ready if due is None else min(due, ready)
+            return due
+
+    # ----- hold -----
+
+    def flush(self) -> int:
+        """Drop queued actions and pending releases; returns actions dropped."""
+        with self._lock:
+            n = len(self._queue)
+            self._queue.clear()
+            self._releases.clear()
+            self._release_at.clear()
+            self.dropped += n
+            return n
+
+    def hold(self) -> int:
+        """Stop all input: flush, then `key_up_all()`. Returns actions dropped."""
+        with self._lock:
+            self.held = True
+            n = self.flush()
+            self._down.clear()
+            self.port.key_up_all()
+            return n
+
+    def resume(self) -> None:
+        with self._lock:
+            self.held = False
+            self._refilled = None
+            self._tokens = float(self.burst)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "held": self.held,
+            "pending": len(self._queue),
+            "actions": self.actions,
+            "batches": self.batches,
+            "events": self.events,
+            "paths": self.paths,
+            "dropped": self.dropped,
+            "throttled": self.throttled,
+        }
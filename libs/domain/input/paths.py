@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, overload
+
+import numpy as np
+
+PathKind = Literal["bezier", "min_jerk"]
+
+
+@dataclass(slots=True)
+class PathPoint:
+    """One `MousePathPoint`, materialised on demand from a `MousePath`."""
+
+    x: int
+    y: int
+    t_ms: int
+
+
+class MousePath(Sequence[PathPoint]):
+    """
+    Array-backed sequence of `MousePathPoint`s: `xy` is (n, 2) int32 screen
+    coordinates, `t_ms` (n,) int32 offsets from the start. Points are only
+    turned into objects when indexed or iterated, so a path costs two small
+    arrays however it is consumed.
+    """
+
+    __slots__ = ("xy", "t_ms")
+
+    def __init__(self, xy: np.ndarray, t_ms: np.ndarray) -> None:
+        xy = np.ascontiguousarray(xy, dtype=np.int32)
+        t_ms = np.ascontiguousarray(t_ms, dtype=np.int32)
+        if xy.ndim != 2 or xy.shape[1] != 2 or t_ms.shape != (xy.shape[0],):
+            raise ValueError(f"need xy (n, 2) and t_ms (n,), got {xy.shape} and {t_ms.shape}")
+        self.xy = xy
+        self.t_ms = t_ms
+
+    def __len__(self) -> int:
+        return int(self.t_ms.shape[0])
+
+    @overload
+    def __getitem__(self, i: int) -> PathPoint: ...
+    @overload
+    def __getitem__(self, i: slice) -> MousePath: ...
+    def __getitem__(self, i: int | slice) -> PathPoint | MousePath:
+        if isinstance(i, slice):
+            return MousePath(self.xy[i], self.t_ms[i])
+        x, y = self.xy[i]
+        return PathPoint(int(x), int(y), int(self.t_ms[i]))
+
+    def __iter__(self) -> Iterator[PathPoint]:
+        for (x, y), t in zip(self.xy.tolist(), self.t_ms.tolist(), strict=True):
+            yield PathPoint(x, y, t)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "MousePath([])"
+        return (
+            f"MousePath({len(self)} points, {tuple(self.xy[0].tolist())} -> "
+            f"{tuple(self.xy[-1].tolist())} in {self.duration_ms} ms)"
+        )
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.t_ms[-1]) if len(self) else 0
+
+    @property
+    def start(self) -> tuple[int, int]:
+        return int(self.xy[0, 0]), int(self.xy[0, 1])
+
+    @property
+    def end(self) -> tuple[int, int]:
+        return int(self.xy[-1, 0]), int(self.xy[-1, 1])
+
+
+def min_jerk(n: int) -> np.ndarray:
+    """Minimum-jerk progress 10t^3 - 15t^4 + 6t^5 at `n` evenly spaced times in [0, 1]."""
+    t = np.linspace(0.0, 1.0, n)
+    return np.asarray(t**3 * (10.0 - 15.0 * t + 6.0 * t * t))
+
+
+def bezier_shapes(count: int, n: int, rng: np.random.Generator, bend: float = 0.2) -> np.ndarray:
+    """
+    `count` cubic Bezier curves from (0, 0) to (1, 0), each sampled at `n`
+    minimum-jerk-timed points: (count, n, 2). The inner control points are
+    spread along the chord and pushed sideways by N(0, `bend`), so the curves
+    arc to either side by differing amounts.
+    """
+    s = min_jerk(n)[:, None]
+    basis = np.hstack([(1 - s) ** 3, 3 * s * (1 - s) ** 2, 3 * s * s * (1 - s), s**3])  # (n, 4)
+    ctrl = np.zeros((count, 4, 2))
+    ctrl[:, 1, 0] = rng.uniform(0.15, 0.45, count)
+    ctrl[:, 2, 0] = rng.uniform(0.55, 0.85, count)
+    ctrl[:, 1:3, 1] = rng.normal(0.0, bend, (count, 2))
+    ctrl[:, 3, 0] = 1.0
+    return np.asarray(np.einsum("nk,ckd->cnd", basis, ctrl))
+
+
+def min_jerk_shapes(count: int, n: int, rng: np.random.Generator, bend: float = 0.2) -> np.ndarray:
+    """
+    `count` minimum-jerk reaches from (0, 0) to (1, 0): a straight chord plus
+    one half-sine sideways drift of N(0, `bend` / 2) amplitude. (count, n, 2).
+    """
+    s = min_jerk(n)
+    out = np.zeros((count, n, 2))
+    out[:, :, 0] = s
+    out[:, :, 1] = rng.normal(0.0, bend / 2, (count, 1)) * np.sin(np.pi * s)
+    return out
+
+
+_SHAPES = {"bezier": bezier_shapes, "min_jerk": min_jerk_shapes}
+
+
+class MousePathGenerator:
+    """
+    Human-like mouse paths for `KeyboardMousePort.mouse_path`, generated as
+    arrays in one shot.
+
+    Path shapes are normalised (unit chord from (0, 0) to (1, 0), sampled with
+    a minimum-jerk velocity profile) and cached: the first request for a
+    (kind, point count) builds `variants` shapes in a single vectorised call,
+    later requests pick one at random. A shape is then scaled and rotated onto
+    the real endpoints, fresh tremor noise is added (tapered to zero at both
+    ends so the path starts and ends exactly on target) and the result is
+    rounded to pixels.
+
+    Movement time defaults to Fitts' law, `fitts_a_ms + fitts_b_ms *
+    log2(1 + distance / target_px)`; points are spaced `step_ms` apart.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        kind: PathKind = "bezier",
+        variants: int = 32,
+        max_shapes: int = 64,
+        step_ms: float = 8.0,
+        bend: float = 0.2,
+        noise_px: float = 1.0,
+        fitts_a_ms: float = 80.0,
+        fitts_b_ms: float = 110.0,
+        target_px: float = 16.0,
+    ) -> None:
+        if kind not in _SHAPES:
+            raise ValueError(f"unknown path kind {kind!r}")
+        self.rng = np.random.default_rng(seed)
+        self.kind: PathKind = kind
+        self.variants = max(1, int(variants))
+        self.max_shapes = max(1, int(max_shapes))
+        self.step_ms = float(step_ms)
+        self.bend = float(bend)
+        self.noise_px = float(noise_px)
+        self.fitts_a_ms = float(fitts_a_ms)
+        self.fitts_b_ms = float(fitts_b_ms)
+        self.target_px = float(target_px)
+        self._shapes: OrderedDict[tuple[str, int], np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def movement_ms(self, distance: float) -> float:
+        return self.fitts_a_ms + self.fitts_b_ms * math.log2(1.0 + distance / self.target_px)
+
+    def shapes(self, n: int, kind: PathKind | None = None) -> np.ndarray:
+        """The cached (variants, n, 2) normalised shapes for `n` points."""
+        key = (kind or self.kind, n)
+        cached = self._shapes.get(key)
+        if cached is not None:
+            self._shapes.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        shapes = _SHAPES[key[0]](self.variants, n, self.rng, self.bend)
+        shapes.flags.writeable = False
+        self._shapes[key] = shapes
+        if len(self._shapes) > self.max_shapes:
+            self._shapes.popitem(last=False)
+        return shapes
+
+    def path(
+        self,
+        start: tuple[float, float],
+        end: tuple[float, float],
+        duration_ms: float | None = None,
+        kind: PathKind | None = None,
+    ) -> MousePath:
+        x0, y0 = float(start[0]), float(start[1])
+        dx, dy = float(end[0]) - x0, float(end[1]) - y0
+        dist = math.hypot(dx, dy)
+        if duration_ms is None:
+            duration_ms = self.movement_ms(dist)
+        n = max(2, round(duration_ms / self.step_ms) + 1)
+        shape = self.shapes(n, kind)[self.rng.integers(self.variants)]
+        # unit chord -> real chord: scale by the distance and rotate by its angle
+        rot = np.array([[dx, -dy], [dy, dx]])
+        pts = shape @ rot.T
+        if self.noise_px > 0 and n > 2:
+            taper = np.sin(np.linspace(0.0, np.pi, n))[:, None]
+            pts += self.rng.normal(0.0, self.noise_px, (n, 2)) * taper
+        pts += (x0, y0)
+        t_ms = np.rint(np.linspace(0.0, duration_ms, n))
+        return MousePath(np.rint(pts), t_ms)
+
+    def clear(self) -> None:
+        self._shapes.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"shapes": len(self._shapes), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from ports.input import HumanInputPort
+from ports.telemetry import MetricsPort
+from ports.time import ClockPort
+from shared.utils.histogram import Histogram
+
+from .executor import InputExecutor
+
+
+class HumanPreemption:
+    """
+    Hands control back the moment the human touches keyboard or mouse.
+
+    Subscribes to `HumanInputPort`; the callback itself (not the next agent
+    tick) puts the executor on hold, which flushes its queue and calls
+    `key_up_all()`, then runs `on_hold` and publishes a `state` event with
+    `reason="human_input"`. Further signals while already held release keys
+    again but don't re-announce. `resume()` lets the agent type again.
+
+    Callback-to-release latency is recorded per signal in the `latency`
+    histogram (seconds) and, given `metrics`, observed as
+    `preempt_latency_seconds`; `stats()` reports its percentiles in ms.
+    """
+
+    def __init__(
+        self,
+        human: HumanInputPort,
+        executor: InputExecutor,
+        clock: ClockPort,
+        publish: Callable[[str, Mapping[str, Any]], None] | None = None,
+        on_hold: Callable[[], None] | None = None,
+        metrics: MetricsPort | None = None,
+        labels: Mapping[str, str] | None = None,
+    ) -> None:
+        self.executor = executor
+        self.clock = clock
+        self.publish = publish
+        self.on_hold = on_hold
+        self.metrics = metrics
+        self.labels = dict(labels or {})
+        self.latency = Histogram()
+        self.signals = 0
+        self.preemptions = 0  # signals that took the agent off input
+        self._lock = threading.Lock()
+        human.subscribe(self._on_human_input)
+
+    def _on_human_input(self) -> None:
+        t0 = self.clock.now()
+        with self._lock:
+            self.signals += 1
+            was_held = self.executor.held
+            dropped = self.executor.hold()
+            latency = max(0.0, self.clock.now() - t0)
+            self.latency.record(latency)
+            if not was_held:
+                self.preemptions += 1
+        if self.metrics is not None:
+            self.metrics.observe("preempt_latency_seconds", latency, **self.labels)
+        if was_held:
+            return
+        if self.on_hold is not None:
+            self.on_hold()
+        if self.publish is not None:
+            self.publish(
+                "state",
+                {"state": "HOLD", "hold": True, "reason": "human_input", "dropped": dropped},
+            )
+
+    def resume(self) -> None:
+        self.executor.resume()
+
+    def stats(self) -> dict[str, Any]:
+        lat = self.latency.summary()
+        return {
+            "signals": self.signals,
+            "preemptions": self.preemptions,
+            "latency_p50_ms": lat.get("p50", 0.0),
+            "latency_p95_ms": lat.get("p95", 0.0),
+            "latency_max_ms": lat.get("max", 0.0),
+        }
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import functools
+import itertools
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from ports.input import KeyboardMousePort, MousePathPoint
+from ports.time import ClockPort, SleeperPort
+from shared.utils.histogram import Histogram
+
+from .executor import Key
+
+
+class PrecisionSleeper(SleeperPort):
+    """
+    `SleeperPort` that wakes close to the deadline instead of whenever the
+    OS gets round to it.
+
+    Waits in two phases: a coarse `sleeper.sleep()` up to `spin_s` before
+    the deadline (OS sleeps overshoot by up to a scheduler quantum), then a
+    spin of zero-length sleeps (a yield) re-reading the clock until the
+    deadline. `spin_s` is the spin budget per wait; a coarse sleep that
+    overshoots the whole budget shows up as lateness. If the clock doesn't
+    move during a spin step (a virtual clock with a plain fake sleeper) the
+    rest is slept in one go, so fakes drive it deterministically.
+    """
+
+    def __init__(self, clock: ClockPort, sleeper: SleeperPort, spin_s: float = 0.002) -> None:
+        self.clock = clock
+        self.sleeper = sleeper
+        self.spin_s = max(0.0, float(spin_s))
+        self.coarse = 0  # coarse sleeps taken
+        self.spins = 0  # spin steps taken
+        self.spin_time = 0.0  # seconds spent spinning
+
+    def sleep(self, seconds: float) -> None:
+        self.sleep_until(self.clock.now() + max(0.0, seconds))
+
+    def sleep_until(self, deadline: float) -> float:
+        """Return once the clock reads `deadline` or later; returns the lateness."""
+        now = self.clock.now()
+        if deadline - now > self.spin_s:
+            self.coarse += 1
+            self.sleeper.sleep(deadline - now - self.spin_s)
+            now = self.clock.now()
+        spin_start = now
+        while now < deadline:
+            self.sleeper.sleep(0.0)
+            self.spins += 1
+            prev, now = now, self.clock.now()
+            if now == prev:  # clock only moves when slept on: finish in one step
+                self.sleeper.sleep(deadline - now)
+                now = self.clock.now()
+        self.spin_time += now - spin_start
+        return now - deadline
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "spin_ms": self.spin_s * 1e3,
+            "coarse": self.coarse,
+            "spins": self.spins,
+            "spin_time_ms": self.spin_time * 1e3,
+        }
+
+
+@dataclass(order=True, slots=True)
+class TimedAction:
+    at: float  # seconds from the timeline's origin
+    seq: int
+    fn: Callable[[], Any] = field(compare=False)
+
+
+class InputTimeline:
+    """
+    Plays input actions at absolute times: each action runs at `origin +
+    at`, where the origin is fixed when `play()` starts. Offsets never
+    accumulate lateness from earlier actions, so `MousePathPoint.t_ms` and
+    `down_ms` hold as well as the `PrecisionSleeper` can make them.
+
+    Per-action lateness (start - deadline) is recorded in `lateness`
+    (seconds); `stats()` reports it in ms alongside the sleeper's counts.
+    """
+
+    def __init__(self, clock: ClockPort, sleeper: SleeperPort, spin_s: float = 0.002) -> None:
+        self.clock = clock
+        self.waiter = PrecisionSleeper(clock, sleeper, spin_s)
+        self.lateness = Histogram()
+        self._actions: list[TimedAction] = []
+        self._seq = itertools.count()
+        self.played = 0
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    @property
+    def duration(self) -> float:
+        return max((a.at for a in self._actions), default=0.0)
+
+    def at(self, offset_s: float, fn: Callable[[], Any]) -> None:
+        self._actions.append(TimedAction(max(0.0, float(offset_s)), next(self._seq), fn))
+
+    def add_tap(
+        self, port: KeyboardMousePort, scan: int, at_s: float = 0.0, down_ms: float = 45.0
+    ) -> None:
+        self.at(at_s, lambda: port.send_keys([Key(scan, True)]))
+        self.at(at_s + down_ms / 1000.0, lambda: port.send_keys([Key(scan, False)]))
+
+    def add_path(
+        self,
+        path: Sequence[MousePathPoint],
+        move_to: Callable[[int, int], Any],
+        at_s: float = 0.0,
+    ) -> None:
+        """One `move_to(x, y)` per point, at `at_s + t_ms`."""
+        for p in path:
+            self.at(at_s + p.t_ms / 1000.0, functools.partial(move_to, p.x, p.y))
+
+    def play(self, origin: float | None = None) -> int:
+        """Run every action at its absolute time (blocking); returns actions run."""
+        actions = sorted(self._actions)
+        self._actions.clear()
+        start = self.clock.now() if origin is None else origin
+        for action in actions:
+            late = self.waiter.sleep_until(start + action.at)
+            self.lateness.record(max(0.0, late))
+            action.fn()
+        self.played += len(actions)
+        return len(actions)
+
+    def stats(self) -> dict[str, Any]:
+        late = self.lateness.summary()
+        return {
+            "played": self.played,
+            "late_p50_ms": late.get("p50", 0.0),
+            "late_p95_ms": late.get("p95", 0.0),
+            "late_max_ms": late.get("max", 0.0),
+            **self.waiter.stats(),
+        }
@@ -0,0 +1,31 @@
+from .memo import MemoizedPolicy, Policy, Quantizer, bucket, thresholds
+from .tree import (
+    Action,
+    BehaviorTree,
+    Condition,
+    Decision,
+    Node,
+    NodeStats,
+    Selector,
+    Sequence,
+    Status,
+    Switch,
+)
+
+__all__ = [
+    "Action",
+    "BehaviorTree",
+    "Condition",
+    "Decision",
+    "MemoizedPolicy",
+    "Node",
+    "NodeStats",
+    "Policy",
+    "Quantizer",
+    "Selector",
+    "Sequence",
+    "Status",
+    "Switch",
+    "bucket",
+    "thresholds",
+]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any, Protocol
+
+from ports.telemetry import MetricsPort
+from ports.time import ClockPort
+
+from .tree import Decision, Status
+
+Quantizer = Callable[[Any], Hashable]
+
+
+class Policy(Protocol):
+    def tick(
+        self, blackboard: Mapping[str, Any], changed: Iterable[str] | None = None
+    ) -> Decision: ...
+
+
+def bucket(step: float, offset: float = 0.0) -> Quantizer:
+    """Numbers -> index of their `step`-wide bin (e.g. HP in 10% buckets); None stays None."""
+
+    def q(v: Any) -> Hashable:
+        if v is None:
+            return None
+        return math.floor((float(v) - offset) / step)
+
+    return q
+
+
+def thresholds(*edges: float) -> Quantizer:
+    """Numbers -> how many of the sorted `edges` they reach (e.g. low/mid/high HP)."""
+    ordered = sorted(edges)
+
+    def q(v: Any) -> Hashable:
+        if v is None:
+            return None
+        return sum(1 for e in ordered if v >= e)
+
+    return q
+
+
+def _identity(v: Any) -> Hashable:
+    if isinstance(v, list | set | dict):
+        return repr(v)  # unhashable but comparable: key on its text
+    key: Hashable = v
+    return key
+
+
+class MemoizedPolicy:
+    """
+    Caches a policy's decisions keyed by a quantized view of the observation.
+
+    Only the keys in `quantize` form the cache key; each is mapped through its
+    quantizer (None = the value itself), so observations that differ only
+    within a bucket share one decision. The cache is an LRU of `max_entries`
+    whose entries expire `ttl_s` after they were computed. RUNNING decisions
+    are never cached. `quantize` must cover every key the policy reads;
+    finer-grained inputs would be invisible to the cache.
+
+    The wrapped policy still sees every change: keys changed during cache
+    hits are handed to it on the next miss.
+    """
+
+    def __init__(
+        self,
+        policy: Policy,
+        quantize: Mapping[str, Quantizer | None],
+        clock: ClockPort,
+        max_entries: int = 1024,
+        ttl_s: float = 5.0,
+    ) -> None:
+        self.policy = policy
+        self._keys = tuple(quantize)
+        self._quantizers = tuple(q or _identity for q in quantize.values())
+        self.clock = clock
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._cache: OrderedDict[tuple[Hashable, ...], tuple[float, Decision]] = OrderedDict()
+        self._pending: set[str] | None = set()  # changes the policy hasn't seen yet
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, blackboard: Mapping[str, Any]) -> tuple[Hashable, ...]:
+        return tuple(
+            q(blackboard.get(k)) for k, q in zip(self._keys, self._quantizers, strict=True)
+        )
+
+    def tick(self, blackboard: Mapping[str, Any], changed: Iterable[str] | None = None) -> Decision:
+        if changed is None:
+            self._pending = None  # the policy will have to compare for itself
+        elif self._pending is not None:
+            self._pending.update(changed)
+        key = self.key(blackboard)
+        now = self.clock.now()
+        hit = self._cache.get(key)
+        if hit is not None:
+            if now - hit[0] <= self.ttl_s:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+            del self._cache[key]
+            self.expirations += 1
+        self.misses += 1
+        decision = self.policy.tick(blackboard, self._pending)
+        self._pending = set()
+        if decision.status != Status.RUNNING:
+            self._cache[key] = (now, decision)
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return decision
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self._cache),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def export(self, metrics: MetricsPort, **labels: str) -> None:
+        """Publish the counters as `policy_memo_<name>` samples."""
+        for name, value in self.stats().items():
+            metrics.observe(f"policy_memo_{name}", float(value), **labels)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from domain.state.hamt import same_value
+
+
+class Status(IntEnum):
+    SUCCESS = 0
+    FAILURE = 1
+    RUNNING = 2
+
+
+# ----- tree definition -----
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Leaf: `check(blackboard)` -> SUCCESS/FAILURE. Must only look at `reads`."""
+
+    name: str
+    reads: tuple[str, ...]
+    check: Callable[[Mapping[str, Any]], bool]
+
+
+@dataclass(frozen=True)
+class Action:
+    """
+    Leaf that proposes action `name` when `decide(blackboard)` says so.
+
+    `decide` returns a Status (or a bool for SUCCESS/FAILURE); by default the
+    action always applies. It decides, it doesn't act: the tree's output is
+    the list of proposed actions, executed elsewhere.
+    """
+
+    name: str
+    reads: tuple[str, ...] = ()
+    decide: Callable[[Mapping[str, Any]], Status | bool] | None = None
+
+
+@dataclass(frozen=True)
+class Sequence:
+    """Runs children in order until one does not succeed."""
+
+    name: str
+    children: tuple[Node, ...]
+
+
+@dataclass(frozen=True)
+class Selector:
+    """Runs children in order until one does not fail (fallback)."""
+
+    name: str
+    children: tuple[Node, ...]
+
+
+@dataclass(frozen=True)
+class Switch:
+    """
+    HFSM layer: picks the subtree for the current value of blackboard `key`
+    (a mode/state variable), else `default`; fails when there is neither.
+    """
+
+    name: str
+    key: str
+    cases: Mapping[Any, Node]
+    default: Node | None = None
+
+
+Node = Condition | Action | Sequence | Selector | Switch
+
+_LEAF_COND, _LEAF_ACTION, _SEQ, _SEL, _SWITCH = range(5)
+_KIND_NAMES = ("condition", "action", "sequence", "selector", "switch")
+_DEFAULT = object()  # Switch case key of the default subtree
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Decision:
+    status: Status
+    actions: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class NodeStats:
+    name: str
+    kind: str
+    evals: int  # times actually evaluated
+    reused: int  # times a cached result was used instead
+    cost_ns: int  # inclusive of children
+
+    @property
+    def mean_ns(self) -> float:
+        return self.cost_ns / self.evals if self.evals else 0.0
+
+
+@dataclass
+class _Flat:
+    kind: list[int] = field(default_factory=list)
+    name: list[str] = field(default_factory=list)
+    end: list[int] = field(default_factory=list)  # one past the last node of the subtree
+    fn: list[Any] = field(default_factory=list)
+    key: list[str] = field(default_factory=list)  # Switch key, else ""
+    cases: list[dict[Any, int] | None] = field(default_factory=list)
+    reads: list[set[str]] = field(default_factory=list)  # keys the whole subtree reads
+
+
+def _flatten(node: Node, out: _Flat, parents: list[int]) -> None:
+    if not isinstance(node, Condition | Action | Sequence | Selector | Switch):
+        raise TypeError(f"not a tree node: {node!r}")
+    i = len(out.kind)
+    out.name.append(node.name)
+    out.end.append(-1)
+    out.key.append("")
+    out.cases.append(None)
+    out.reads.append(set())
+    reads: Iterable[str] = ()
+    children: list[Node] = []
+    fn: Any = None
+    if isinstance(node, Condition):
+        kind, reads, fn = _LEAF_COND, node.reads, node.check
+    elif isinstance(node, Action):
+        kind, reads, fn = _LEAF_ACTION, node.reads, node.decide
+    elif isinstance(node, Sequence):
+        kind, children = _SEQ, list(node.children)
+    elif isinstance(node, Selector):
+        kind, children = _SEL, list(node.children)
+    else:
+        kind, reads = _SWITCH, (node.key,)
+        out.key[i] = node.key
+        children = list(node.cases.values())
+        if node.default is not None:
+            children.append(node.default)
+    out.kind.append(kind)
+    out.fn.append(fn)
+    for p in (*parents, i):
+        out.reads[p].update(reads)
+    starts = []
+    for child in children:
+        starts.append(len(out.kind))
+        _flatten(child, out, [*parents, i])
+    if isinstance(node, Switch):
+        cases: dict[Any, int] = dict(zip(node.cases, starts, strict=False))
+        if node.default is not None:
+            cases[_DEFAULT] = starts[-1]
+        out.cases[i] = cases
+    out.end[i] = len(out.kind)
+
+
+class BehaviorTree:
+    """
+    A behavior tree compiled into flat, pre-order node arrays.
+
+    Each node's subtree is `[i, end[i])`, so composites walk children by
+    jumping `c = end[c]` instead of chasing objects. At compile time every
+    blackboard key gets the list of nodes whose subtree reads it; a tick
+    invalidates only those nodes for the keys that changed, and any other
+    subtree answers from its cached status/actions without running. RUNNING
+    results are never reused. Leaves must be pure functions of the keys they
+    declare in `reads`.
+
+    Per-node eval/reuse counts and inclusive time are kept for `profile()`.
+    """
+
+    def __init__(self, root: Node) -> None:
+        flat = _Flat()
+        _flatten(root, flat, [])
+        n = len(flat.kind)
+        self._kind = flat.kind
+        self._name = flat.name
+        self._end = flat.end
+        self._fn = flat.fn
+        self._key = flat.key
+        self._cases = flat.cases
+        self.keys = sorted(set().union(*flat.reads))
+        self._deps: dict[str, list[int]] = {k: [] for k in self.keys}
+        for i, reads in enumerate(flat.reads):
+            for k in reads:
+                self._deps[k].append(i)
+        self._valid = [False] * n
+        self._status = [Status.FAILURE] * n
+        self._actions: list[tuple[str, ...]] = [()] * n
+        self._evals = [0] * n
+        self._reused = [0] * n
+        self._cost = [0] * n
+        self._seen: dict[str, Any] = {}
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return len(self._kind)
+
+    def invalidate(self, keys: Iterable[str] | None = None) -> None:
+        """Forget cached results depending on `keys` (all of them when None)."""
+        if keys is None:
+            self._valid = [False] * len(self._kind)
+            return
+        valid = self._valid
+        for k in keys:
+            for i in self._deps.get(k, ()):
+                valid[i] = False
+
+    def _changed(self, blackboard: Mapping[str, Any]) -> list[str]:
+        seen = self._seen
+        changed = []
+        for k in self.keys:
+            v = blackboard.get(k, _MISSING)
+            old = seen.get(k, _MISSING)
+            if not same_value(old, v):
+                seen[k] = v
+                changed.append(k)
+        return changed
+
+    def tick(self, blackboard: Mapping[str, Any], changed: Iterable[str] | None = None) -> Decision:
+        """
+        Evaluate against `blackboard`. `changed` names the keys updated since the
+        previous tick; without it the tree compares the keys it reads itself.
+        """
+        if changed is None:
+            changed = self._changed(blackboard)
+        else:
+            changed = list(changed)
+            for k in changed:
+                self._seen[k] = blackboard.get(k, _MISSING)
+        self.invalidate(changed)
+        self.ticks += 1
+        status = self._eval(0, blackboard)
+        return Decision(status, self._actions[0])
+
+    def _eval(self, i: int, bb: Mapping[str, Any]) -> Status:
+        if self._valid[i] and self._status[i] != Status.RUNNING:
+            self._reused[i] += 1
+            return self._status[i]
+        t0 = time.perf_counter_ns()
+        kind = self._kind[i]
+        actions: tuple[str, ...] = ()
+        if kind == _LEAF_COND:
+            status = Status.SUCCESS if self._fn[i](bb) else Status.FAILURE
+        elif kind == _LEAF_ACTION:
+            fn = self._fn[i]
+            res = Status.SUCCESS if fn is None else fn(bb)
+            status = res if isinstance(res, Status) else Status(not res)
+            if status != Status.FAILURE:
+                actions = (self._name[i],)
+        elif kind == _SWITCH:
+            cases = self._cases[i]
+            assert cases is not None
+            c = cases.get(bb.get(self._key[i]), cases.get(_DEFAULT))
+            if c is None:
+                status = Status.FAILURE
+            else:
+                status = self._eval(c, bb)
+                actions = self._actions[c]
+        else:
+            stop = Status.SUCCESS if kind == _SEL else Status.FAILURE
+            status = Status.FAILURE if kind == _SEL else Status.SUCCESS
+            end = self._end[i]
+            c = i + 1
+            while c < end:
+                status = self._eval(c, bb)
+                if status != Status.FAILURE:
+                    actions = (*actions, *self._actions[c]) if kind == _SEQ else self._actions[c]
+                if status == stop or status == Status.RUNNING:
+                    break
+                c = self._end[c]
+            if status == Status.FAILURE:
+                actions = ()
+        self._status[i] = status
+        self._actions[i] = actions
+        self._valid[i] = True
+        self._evals[i] += 1
+        self._cost[i] += time.perf_counter_ns() - t0
+        return status
+
+    def profile(self) -> list[NodeStats]:
+        """Per-node counters in tree (pre-order) order."""
+        return [
+            NodeStats(
+                self._name[i],
+                _KIND_NAMES[self._kind[i]],
+                self._evals[i],
+                self._reused[i],
+                self._cost[i],
+            )
+            for i in range(len(self._kind))
+        ]
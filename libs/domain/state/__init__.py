@@ -0,0 +1,4 @@
+from .hamt import HamtMap
+from .store import StateDiff, StateSnapshot, StateStore
+
+__all__ = ["HamtMap", "StateDiff", "StateSnapshot", "StateStore"]
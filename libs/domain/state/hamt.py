@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import builtins
+from collections.abc import Hashable, Iterator, Mapping
+from typing import Any
+
+# Hash array mapped trie: 32-way nodes indexed by 5 hash bits per level, each
+# holding a bitmap of occupied slots and a dense tuple of entries. An entry is
+# a leaf (hash, key, value), a child _Node, or a _Collision bucket once the
+# hash bits run out. Updates copy only the path from the root to the changed
+# entry; everything else is shared with the previous map.
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def same_value(a: Any, b: Any) -> bool:
+    """Identity or equality; values that can't answer `==` plainly (arrays) differ."""
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class _Node:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple[Any, ...]) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, h: int, pairs: tuple[tuple[Any, Any], ...]) -> None:
+        self.hash = h
+        self.pairs = pairs
+
+
+_EMPTY = _Node(0, ())
+_MISSING = object()
+
+
+def _pos(bitmap: int, bit: int) -> int:
+    return (bitmap & (bit - 1)).bit_count()
+
+
+def _get(node: _Node, h: int, key: Any) -> Any:
+    shift = 0
+    while True:
+        bit = 1 << ((h >> shift) & (_WIDTH - 1))
+        if not node.bitmap & bit:
+            return _MISSING
+        entry = node.entries[_pos(node.bitmap, bit)]
+        if type(entry) is tuple:
+            return entry[2] if entry[0] == h and entry[1] == key else _MISSING
+        if type(entry) is _Collision:
+            for k, v in entry.pairs:
+                if k == key:
+                    return v
+            return _MISSING
+        node, shift = entry, shift + _BITS
+
+
+def _merge_leaves(a: tuple[int, Any, Any], b: tuple[int, Any, Any], shift: int) -> Any:
+    if shift >= _HASH_BITS:
+        return _Collision(a[0], ((a[1], a[2]), (b[1], b[2])))
+    ia, ib = (a[0] >> shift) & (_WIDTH - 1), (b[0] >> shift) & (_WIDTH - 1)
+    if ia == ib:
+        return _Node(1 << ia, (_merge_leaves(a, b, shift + _BITS),))
+    entries = (a, b) if ia < ib else (b, a)
+    return _Node((1 << ia) | (1 << ib), entries)
+
+
+def _set(node: _Node, h: int, key: Any, value: Any, shift: int) -> tuple[_Node, bool]:
+    """(new node, key was added); returns `node` itself when nothing changed."""
+    bit = 1 << ((h >> shift) & (_WIDTH - 1))
+    i = _pos(node.bitmap, bit)
+    if not node.bitmap & bit:
+        entries = (*node.entries[:i], (h, key, value), *node.entries[i:])
+        return _Node(node.bitmap | bit, entries), True
+    entry = node.entries[i]
+    added = False
+    if type(entry) is tuple:
+        if entry[0] == h and entry[1] == key:
+            if same_value(entry[2], value):
+                return node, False
+            new: Any = (h, key, value)
+        else:
+            new, added = _merge_leaves(entry, (h, key, value), shift + _BITS), True
+    elif type(entry) is _Collision:
+        pairs = [(k, v) for k, v in entry.pairs if k != key]
+        old = next((v for k, v in entry.pairs if k == key), _MISSING)
+        if old is not _MISSING and same_value(old, value):
+            return node, False
+        added = old is _MISSING
+        new = _Collision(h, (*pairs, (key, value)))
+    else:
+        new, added = _set(entry, h, key, value, shift + _BITS)
+        if new is entry:
+            return node, False
+    return _Node(node.bitmap, (*node.entries[:i], new, *node.entries[i + 1 :])), added
+
+
+def _delete(node: _Node, h: int, key: Any, shift: int) -> tuple[Any, bool]:
+    """(replacement entry or None when emptied, key was removed)."""
+    bit = 1 << ((h >> shift) & (_WIDTH - 1))
+    if not node.bitmap & bit:
+        return node, False
+    i = _pos(node.bitmap, bit)
+    entry = node.entries[i]
+    if type(entry) is tuple:
+        if not (entry[0] == h and entry[1] == key):
+            return node, False
+        new: Any = None
+    elif type(entry) is _Collision:
+        pairs = tuple((k, v) for k, v in entry.pairs if k != key)
+        if len(pairs) == len(entry.pairs):
+            return node, False
+        new = (entry.hash, *pairs[0]) if len(pairs) == 1 else _Collision(entry.hash, pairs)
+    else:
+        new, removed = _delete(entry, h, key, shift + _BITS)
+        if not removed:
+            return node, False
+        if type(new) is _Node and len(new.entries) == 1 and type(new.entries[0]) is tuple:
+            new = new.entries[0]  # collapse a single-leaf child into its parent slot
+    if new is None:
+        entries = (*node.entries[:i], *node.entries[i + 1 :])
+        if not entries:
+            return None, True
+        return _Node(node.bitmap & ~bit, entries), True
+    return _Node(node.bitmap, (*node.entries[:i], new, *node.entries[i + 1 :])), True
+
+
+def _items(entry: Any) -> Iterator[tuple[Any, Any]]:
+    if entry is None:
+        return
+    if type(entry) is tuple:
+        yield entry[1], entry[2]
+    elif type(entry) is _Collision:
+        yield from entry.pairs
+    else:
+        for e in entry.entries:
+            yield from _items(e)
+
+
+def _diff(a: Any, b: Any, changed: dict[Any, Any], removed: set[Any]) -> None:
+    if a is b:
+        return  # shared subtree: nothing below can differ
+    if type(a) is _Node and type(b) is _Node:
+        bits = a.bitmap | b.bitmap
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            ea = a.entries[_pos(a.bitmap, bit)] if a.bitmap & bit else None
+            eb = b.entries[_pos(b.bitmap, bit)] if b.bitmap & bit else None
+            if ea is not eb:
+                _diff(ea, eb, changed, removed)
+        return
+    old = dict(_items(a))
+    for k, v in _items(b):
+        if k not in old or not same_value(old.pop(k), v):
+            changed[k] = v
+    removed.update(old)
+
+
+class HamtMap(Mapping[Any, Any]):
+    """
+    Immutable hash map with structural sharing.
+
+    `set`/`delete`/`update` return a new map that shares every untouched
+    subtree with this one (O(log32 n) new nodes per changed key), and
+    `diff()` between two related maps skips shared subtrees, so it costs in
+    proportion to what changed rather than to the map's size.
+    """
+
+    __slots__ = ("_root", "_len")
+
+    def __init__(self, items: Mapping[Any, Any] | None = None) -> None:
+        self._root = _EMPTY
+        self._len = 0
+        if items:
+            other = HamtMap().update(items)
+            self._root, self._len = other._root, other._len
+
+    @classmethod
+    def _make(cls, root: _Node, n: int) -> HamtMap:
+        m = cls.__new__(cls)
+        m._root, m._len = root, n
+        return m
+
+    def __getitem__(self, key: Any) -> Any:
+        v = _get(self._root, _hash(key), key)
+        if v is _MISSING:
+            raise KeyError(key)
+        return v
+
+    def __contains__(self, key: object) -> bool:
+        return _get(self._root, _hash(key), key) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        return (k for k, _ in _items(self._root))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"HamtMap({dict(_items(self._root))!r})"
+
+    def set(self, key: Any, value: Any) -> HamtMap:
+        root, added = _set(self._root, _hash(key), key, value, 0)
+        return self if root is self._root else HamtMap._make(root, self._len + added)
+
+    def update(self, items: Mapping[Any, Any]) -> HamtMap:
+        root, n = self._root, self._len
+        for k, v in items.items():
+            root, added = _set(root, _hash(k), k, v, 0)
+            n += added
+        return self if root is self._root else HamtMap._make(root, n)
+
+    def delete(self, key: Any) -> HamtMap:
+        root, removed = _delete(self._root, _hash(key), key, 0)
+        if not removed:
+            return self
+        return HamtMap._make(root if root is not None else _EMPTY, self._len - 1)
+
+    def diff(self, newer: HamtMap) -> tuple[dict[Any, Any], frozenset[Any]]:
+        """(keys added or changed in `newer` -> new value, keys `newer` no longer has)."""
+        changed: dict[Any, Any] = {}
+        removed: builtins.set[Any] = builtins.set()
+        _diff(self._root, newer._root, changed, removed)
+        return changed, frozenset(removed)
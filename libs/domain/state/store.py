@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .hamt import HamtMap
+
+
+class StateSnapshot(Mapping[str, Any]):
+    """Read-only view of the store at one version; taking one is O(1)."""
+
+    __slots__ = ("version", "_data")
+
+    def __init__(self, version: int, data: HamtMap) -> None:
+        self.version = version
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"StateSnapshot(v{self.version}, {dict(self)!r})"
+
+    def diff(self, newer: StateSnapshot) -> StateDiff:
+        changed, removed = self._data.diff(newer._data)
+        return StateDiff(self.version, newer.version, changed, removed)
+
+
+@dataclass(frozen=True)
+class StateDiff:
+    """What changed from version `since` to `version`; `full` when `since` was no longer kept."""
+
+    since: int
+    version: int
+    changed: dict[str, Any] = field(default_factory=dict)
+    removed: frozenset[str] = frozenset()
+    full: bool = False
+
+    @property
+    def keys(self) -> set[str]:
+        return set(self.changed) | self.removed
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+class StateStore:
+    """
+    Versioned key/value domain state.
+
+    Every write that actually changes something produces a new version
+    (monotonic, one per `set`/`update`/`delete` call) backed by an immutable
+    HAMT, so a snapshot shares all unchanged structure with its neighbours.
+    The last `history` versions are kept; `diff(n)` answers "what changed
+    since version n" by walking only the parts of the trie that differ.
+    Consumers (policy, telemetry, recorder) remember the version they last
+    saw instead of copying the state.
+    """
+
+    def __init__(self, initial: Mapping[str, Any] | None = None, history: int = 256) -> None:
+        self._history = max(1, int(history))
+        self._data = HamtMap(initial)
+        self._version = 1 if initial else 0
+        self._versions: OrderedDict[int, HamtMap] = OrderedDict({self._version: self._data})
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self) -> StateSnapshot:
+        return StateSnapshot(self._version, self._data)
+
+    def at(self, version: int) -> StateSnapshot:
+        """Snapshot of a retained version (KeyError once it aged out of `history`)."""
+        return StateSnapshot(version, self._versions[version])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ----- writes -----
+
+    def _commit(self, data: HamtMap) -> int:
+        if data is self._data:
+            return self._version  # nothing changed: no new version
+        self._data = data
+        self._version += 1
+        self._versions[self._version] = data
+        while len(self._versions) > self._history:
+            self._versions.popitem(last=False)
+        return self._version
+
+    def set(self, key: str, value: Any) -> int:
+        return self._commit(self._data.set(key, value))
+
+    def update(self, items: Mapping[str, Any] | None = None, **kw: Any) -> int:
+        """Apply several writes as one version; returns the (possibly unchanged) version."""
+        data = self._data
+        if items:
+            data = data.update(items)
+        if kw:
+            data = data.update(kw)
+        return self._commit(data)
+
+    def delete(self, *keys: str) -> int:
+        data = self._data
+        for k in keys:
+            data = data.delete(k)
+        return self._commit(data)
+
+    # ----- change tracking -----
+
+    def diff(self, since: int, version: int | None = None) -> StateDiff:
+        """
+        Changes from version `since` to `version` (default: current). When
+        `since` is older than the retained history the diff is against an
+        empty state, i.e. everything, with `full=True`.
+        """
+        to = self._version if version is None else version
+        newer = self._versions[to]
+        older = self._versions.get(since)
+        if older is None:
+            return StateDiff(since, to, dict(newer.items()), frozenset(), full=True)
+        changed, removed = older.diff(newer)
+        return StateDiff(since, to, changed, removed)
@@ -1,8 +1,9 @@
 from .input import FocusPort, HumanInputPort, KeyboardMousePort
 from .ipc import AgentCommandPort, TelemetryPubPort, TelemetrySubPort
+from .logs import LogEvent, LogTailPort
 from .telemetry import MetricsPort, TelemetryPort
 from .time import ClockPort, SleeperPort
-from .vision import OCRPort, ScreenCapturePort, TemplateMatchPort
+from .vision import BarGaugePort, OCRPort, ScreenCapturePort, TemplateMatchPort
 
 __all__ = [
     "KeyboardMousePort",
@@ -11,11 +12,14 @@ __all__ = [
     "ScreenCapturePort",
     "OCRPort",
     "TemplateMatchPort",
+    "BarGaugePort",
     "TelemetryPort",
     "MetricsPort",
     "AgentCommandPort",
     "TelemetryPubPort",
     "TelemetrySubPort",
+    "LogTailPort",
+    "LogEvent",
     "ClockPort",
     "SleeperPort",
 ]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple
+
+
+class LogTailPort(ABC):
+    """
+    Follows a growing text log (e.g. the game's chat/combat log).
+
+    Lines are delivered in batches as raw bytes without the line terminator;
+    decoding is left to whoever needs the text.
+    """
+
+    @abstractmethod
+    def read_batch(self, timeout_s: float = 0.0) -> list[bytes]:
+        """Complete lines available now; waits up to `timeout_s` when there are none."""
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+class LogEvent(NamedTuple):
+    """A log line recognised by a rule: `kind` names the rule, `fields` its typed captures."""
+
+    kind: str
+    ts: float
+    fields: dict[str, Any]
+    line: bytes
@@ -34,3 +34,10 @@ class TemplateMatchPort(ABC):
     def match(
         self, image: Any, template: Any, threshold: float = 0.95
     ) -> tuple[int, int] | None: ...
+
+
+class BarGaugePort(ABC):
+    """Estimates fill ratios (0.0-1.0) of on-screen bars such as HP/mana."""
+
+    @abstractmethod
+    def read(self, image: Any) -> dict[str, float | None]: ...
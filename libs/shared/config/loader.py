@@ -30,6 +30,14 @@ def _profiles_dir(env: Mapping[str, str]) -> Path:
     return _repo_root() / "configs" / "profiles"
 
 
+def _rois_dir(env: Mapping[str, str]) -> Path:
+    # Same idea as EVQ_CONFIG_DIR: EVQ_ROIS_DIR points *at* rois/
+    override = env.get("EVQ_ROIS_DIR")
+    if override:
+        return Path(override)
+    return _repo_root() / "configs" / "rois"
+
+
 def _load_profile_table(env: Mapping[str, str], profile: str) -> dict[str, Any]:
     f = _profiles_dir(env) / f"{profile}.toml"
     if not f.exists():
@@ -126,3 +134,18 @@ def load_coordinator_settings(
     base.update(env_over)
 
     return CoordinatorSettings.model_validate(base)
+
+
+def load_roi_profile(name: str, env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Load configs/rois/<name>.toml (e.g. "1600x900"). Missing profile -> {}.
+    Override the directory with EVQ_ROIS_DIR.
+    """
+    env = env or os.environ
+    f = _rois_dir(env) / f"{name}.toml"
+    if not f.exists():
+        return {}
+    try:
+        return tomllib.loads(f.read_text("utf-8"))
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse ROI profile TOML: {f}") from e
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
@@ -12,3 +12,5 @@ class Telemetry(BaseModel):
     hp: int | None = None
     mana: int | None = None
     ts: float
+    # tick scheduler stats (rate, overruns, jitter/work percentiles in ms)
+    tick: dict[str, Any] | None = None
@@ -0,0 +1,3 @@
+from .archive import QueryResult, TelemetryArchive
+
+__all__ = ["QueryResult", "TelemetryArchive"]
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# <archive>/
+#   index.jsonl                one line per sealed segment (appended last, fsync'ed):
+#                              {"segment", "t0", "t1",
+#                               "topics": {topic: {"rows", "agents", "fields"}}}
+#   seg-000001/<topic>/ts.npy  float64, sorted
+#                     agent_id.npy
+#                     <field>.npy        typed column (bool/int64/float64/str/json-str)
+#                     <field>.mask.npy   only when some rows lack the field (True = present)
+#
+# The active segment lives in memory and is sealed (columns written, then the
+# index line) when it reaches `segment_rows` or spans `segment_s`, and on close.
+# Queries read the index, skip segments by time span / topic / agent, and load
+# only the requested columns, memory-mapped.
+
+INDEX_NAME = "index.jsonl"
+ARCHIVE_VERSION = 1
+_BASE_COLUMNS = ("ts", "agent_id")
+
+
+def _kind(values: list[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return "json"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, int | float) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    return "json"
+
+
+def _column(values: list[Any], kind: str) -> np.ndarray:
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=np.bool_)
+    if kind == "int":
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if kind == "float":
+        return np.array([math.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == "str":
+        return np.array(["" if v is None else v for v in values], dtype=np.str_)
+    return np.array([json.dumps(v, separators=(",", ":")) for v in values], dtype=np.str_)
+
+
+def _save(path: Path, array: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        np.save(f, array, allow_pickle=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@dataclass
+class _TopicBuffer:
+    ts: list[float] = field(default_factory=list)
+    agents: list[str] = field(default_factory=list)
+    fields: dict[str, list[Any]] = field(default_factory=dict)
+
+    def append(self, ts: float, agent_id: str, payload: Mapping[str, Any]) -> None:
+        n = len(self.ts)
+        self.ts.append(ts)
+        self.agents.append(agent_id)
+        for k, v in payload.items():
+            if k in _BASE_COLUMNS:
+                continue
+            col = self.fields.get(k)
+            if col is None:
+                col = self.fields[k] = [None] * n
+            col.append(v)
+        for col in self.fields.values():
+            if len(col) == n:  # field absent from this row
+                col.append(None)
+
+
+@dataclass
+class QueryResult:
+    """Column arrays for one topic; `masks[name]` marks rows where a field was present."""
+
+    columns: dict[str, np.ndarray]
+    masks: dict[str, np.ndarray]
+    segments_read: int = 0
+
+    def __len__(self) -> int:
+        return len(self.columns.get("ts", ()))
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        names = list(self.columns)
+        for i in range(len(self)):
+            row: dict[str, Any] = {}
+            for n in names:
+                m = self.masks.get(n)
+                v = self.columns[n][i]
+                row[n] = (
+                    (v.item() if isinstance(v, np.generic) else v) if m is None or m[i] else None
+                )
+            yield row
+
+
+class TelemetryArchive:
+    """
+    Append-only columnar store of coordinator telemetry.
+
+    `append()` buffers rows per topic; segments are sealed by size or age, so
+    a crash loses at most the active segment. `query()` answers "agent X,
+    topic Y, between t0 and t1" touching only overlapping segments and the
+    requested columns.
+    """
+
+    def __init__(
+        self, path: str | Path, segment_rows: int = 50_000, segment_s: float = 300.0
+    ) -> None:
+        self.path = Path(path)
+        self.segment_rows = max(1, int(segment_rows))
+        self.segment_s = float(segment_s)
+        self._buffers: dict[str, _TopicBuffer] = {}
+        self._rows = 0
+        self._seg_t0: float | None = None
+        self._next_seg: int | None = None
+
+    # ----- write -----
+
+    def append(
+        self, topic: str, payload: Mapping[str, Any], ts: float | None = None, agent_id: str = ""
+    ) -> None:
+        """Buffer one message; `ts` defaults to payload["ts"], else wall time."""
+        if ts is None:
+            raw = payload.get("ts")
+            ts = float(raw) if isinstance(raw, int | float) and not isinstance(raw, bool) else None
+        ts = time.time() if ts is None else ts
+        agent = agent_id or str(payload.get("agent_id") or "")
+        buf = self._buffers.get(topic)
+        if buf is None:
+            buf = self._buffers[topic] = _TopicBuffer()
+        buf.append(ts, agent, payload)
+        self._rows += 1
+        if self._seg_t0 is None:
+            self._seg_t0 = ts
+        if self._rows >= self.segment_rows or ts - self._seg_t0 >= self.segment_s:
+            self.flush()
+
+    def record(self, msg: Mapping[str, Any], ts: float | None = None) -> None:
+        """
+        Append a TelemetrySubPort.recv() message ({"topic", "data", "envelope"}).
+        Rows are stamped with the envelope's publish `ts` when it carries one.
+        """
+        data = msg.get("data")
+        if ts is None:
+            envelope = msg.get("envelope")
+            if isinstance(envelope, Mapping):
+                ts = _epoch(envelope.get("ts"))
+        self.append(str(msg.get("topic") or ""), data if isinstance(data, Mapping) else {}, ts)
+
+    def flush(self) -> str | None:
+        """Seal the active segment (no-op when empty); returns its name."""
+        if not self._rows:
+            return None
+        if self._next_seg is None:
+            self._next_seg = max((e["seq"] for e in self._index()), default=0) + 1
+        name = f"seg-{self._next_seg:06d}"
+        seg_dir = self.path / name
+        t0, t1 = math.inf, -math.inf
+        topics: dict[str, Any] = {}
+        for topic, buf in self._buffers.items():
+            tdir = seg_dir / _topic_dir(topic)
+            tdir.mkdir(parents=True, exist_ok=True)
+            order = np.argsort(np.asarray(buf.ts, dtype=np.float64), kind="stable")
+            ts = np.asarray(buf.ts, dtype=np.float64)[order]
+            _save(tdir / "ts.npy", ts)
+            _save(tdir / "agent_id.npy", np.array(buf.agents, dtype=np.str_)[order])
+            kinds: dict[str, str] = {}
+            for fname, values in buf.fields.items():
+                kind = kinds[fname] = _kind(values)
+                _save(tdir / f"{_safe(fname)}.npy", _column(values, kind)[order])
+                if any(v is None for v in values):
+                    mask = np.array([v is not None for v in values], dtype=np.bool_)[order]
+                    _save(tdir / f"{_safe(fname)}.mask.npy", mask)
+            t0, t1 = min(t0, float(ts[0])), max(t1, float(ts[-1]))
+            topics[topic] = {
+                "dir": _topic_dir(topic),
+                "rows": len(ts),
+                "agents": sorted(set(buf.agents)),
+                "fields": kinds,
+            }
+        entry = {"v": ARCHIVE_VERSION, "segment": name, "seq": self._next_seg, "t0": t0, "t1": t1}
+        entry["topics"] = topics
+        with open(self.path / INDEX_NAME, "ab") as f:
+            f.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._next_seg += 1
+        self._buffers.clear()
+        self._rows = 0
+        self._seg_t0 = None
+        return name
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> TelemetryArchive:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----- read -----
+
+    def _index(self) -> list[dict[str, Any]]:
+        p = self.path / INDEX_NAME
+        if not p.is_file():
+            return []
+        out = []
+        for line in p.read_bytes().splitlines():
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue  # torn tail: that segment was never sealed
+        return out
+
+    def segments(self) -> list[dict[str, Any]]:
+        return self._index()
+
+    def topics(self) -> list[str]:
+        return sorted({t for e in self._index() for t in e["topics"]})
+
+    def query(
+        self,
+        topic: str,
+        agent_id: str | None = None,
+        t0: float = -math.inf,
+        t1: float = math.inf,
+        fields: Iterable[str] | None = None,
+    ) -> QueryResult:
+        """Rows of `topic` with `t0 <= ts < t1` (optionally one agent), sorted by ts."""
+        wanted = None if fields is None else [f for f in fields if f not in _BASE_COLUMNS]
+        parts: list[dict[str, np.ndarray]] = []
+        part_masks: list[dict[str, np.ndarray]] = []
+        kinds: dict[str, set[str]] = {}
+        read = 0
+        for e in self._index():
+            meta = e["topics"].get(topic)
+            if meta is None or e["t1"] < t0 or e["t0"] >= t1:
+                continue
+            if agent_id is not None and agent_id not in meta["agents"]:
+                continue
+            read += 1
+            tdir = self.path / e["segment"] / meta["dir"]
+            ts = np.load(tdir / "ts.npy", mmap_mode="r")
+            lo, hi = np.searchsorted(ts, t0, "left"), np.searchsorted(ts, t1, "left")
+            sel: Any = slice(int(lo), int(hi))
+            agents = np.load(tdir / "agent_id.npy", mmap_mode="r")[sel]
+            if agent_id is not None:
+                sel = np.arange(int(lo), int(hi))[agents == agent_id]
+                agents = agents[agents == agent_id]
+            cols = {"ts": np.asarray(ts[sel]), "agent_id": np.asarray(agents)}
+            masks: dict[str, np.ndarray] = {}
+            n = len(cols["ts"])
+            for fname in wanted if wanted is not None else meta["fields"]:
+                kind = meta["fields"].get(fname)
+                if kind is None:
+                    masks[fname] = np.zeros(n, dtype=np.bool_)
+                    continue
+                kinds.setdefault(fname, set()).add(kind)
+                col = np.asarray(np.load(tdir / f"{_safe(fname)}.npy", mmap_mode="r")[sel])
+                if kind == "json":
+                    decoded = np.empty(len(col), dtype=object)
+                    decoded[:] = [json.loads(v) for v in col.tolist()]
+                    col = decoded
+                cols[fname] = col
+                mpath = tdir / f"{_safe(fname)}.mask.npy"
+                if mpath.is_file():
+                    masks[fname] = np.asarray(np.load(mpath, mmap_mode="r")[sel])
+            parts.append(cols)
+            part_masks.append(masks)
+        return _merge(parts, part_masks, wanted, kinds, read)
+
+
+def _merge(
+    parts: list[dict[str, np.ndarray]],
+    part_masks: list[dict[str, np.ndarray]],
+    wanted: list[str] | None,
+    kinds: dict[str, set[str]],
+    read: int,
+) -> QueryResult:
+    names = list(_BASE_COLUMNS) + (wanted if wanted is not None else sorted(kinds))
+    columns: dict[str, np.ndarray] = {}
+    masks: dict[str, np.ndarray] = {}
+    sizes = [len(p["ts"]) for p in parts]
+    for name in names:
+        chunks, mchunks, any_missing = [], [], False
+        for p, m, n in zip(parts, part_masks, sizes, strict=True):
+            if name in p:
+                chunks.append(p[name])
+                mask = m.get(name)
+                mchunks.append(np.ones(n, dtype=np.bool_) if mask is None else mask)
+                any_missing |= mask is not None
+            else:
+                chunks.append(np.full(n, None, dtype=object))
+                mchunks.append(np.zeros(n, dtype=np.bool_))
+                any_missing = True
+        if not chunks:
+            columns[name] = np.empty(0, dtype=np.float64 if name == "ts" else np.str_)
+            continue
+        if len(kinds.get(name, ())) > 1:  # the field changed type between segments
+            chunks = [c.astype(object) for c in chunks]
+        columns[name] = np.concatenate(chunks)
+        if any_missing and name not in _BASE_COLUMNS:
+            masks[name] = np.concatenate(mchunks)
+    if len(parts) > 1:  # segments are time-ordered but may overlap at the edges
+        order = np.argsort(columns["ts"], kind="stable")
+        columns = {k: v[order] for k, v in columns.items()}
+        masks = {k: v[order] for k, v in masks.items()}
+    return QueryResult(columns, masks, read)
+
+
+def _epoch(value: Any) -> float | None:
+    """Seconds since the epoch from a number or an ISO-8601 string (None if neither)."""
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        return (dt if dt.tzinfo else dt.replace(tzinfo=UTC)).timestamp()
+    return None
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else f"%{ord(c):02x}" for c in name)
+
+
+def _topic_dir(topic: str) -> str:
+    return _safe(topic) or "%"
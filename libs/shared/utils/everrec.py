@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Any, Literal
+
+import numpy as np
+
+from .framestore import FRAME_STORE_DIR, FrameStore, frame_digest
+
+# --- format -------------------------------------------------------------------
+#
+# <name>.everrec/
+#   meta.json              schema, frame mode, time span, per-stream counts/drops;
+#                          a provisional one ("complete": false) is written by start()
+#                          and atomically replaced on close
+#   frames/index.jsonl     one line per frame: ts, shape, dtype, hash[, chunk, offset, nbytes]
+#   frames/chunk-000000.bin raw pixel bytes, appended; rotated at `chunk_bytes`
+#                          (frames="store": pixels go to a shared FrameStore instead)
+#   logs/lines.jsonl       {"ts", "line"}
+#   inputs.jsonl           {"ts", ...event}
+#   telemetry.jsonl        {"ts", "topic", ...payload}
+#
+# Every file is append-only. Lines are written in chunks of `chunk_records` and
+# each chunk (and each frame-chunk rotation) is fsync'ed, so a crash loses at most
+# the chunk in flight. The frame index is only fsync'ed after the pixel bytes it
+# references (open chunk or frame store), so it never points past durable data.
+
+EVERREC_SCHEMA = 1
+META_NAME = "meta.json"
+FRAMES_DIR = "frames"
+FRAME_INDEX = "frames/index.jsonl"
+LOGS_FILE = "logs/lines.jsonl"
+INPUTS_FILE = "inputs.jsonl"
+TELEMETRY_FILE = "telemetry.jsonl"
+
+STREAM_FILES: dict[str, str] = {
+    "frames": FRAME_INDEX,
+    "logs": LOGS_FILE,
+    "inputs": INPUTS_FILE,
+    "telemetry": TELEMETRY_FILE,
+}
+
+FrameMode = Literal["raw", "hash", "store"]
+
+
+def frame_chunk_name(n: int) -> str:
+    return f"{FRAMES_DIR}/chunk-{n:06d}.bin"
+
+
+def _plain(record: Any) -> dict[str, Any]:
+    """Mapping or pydantic-like model -> plain dict (same rule as FakeTelemetryPort)."""
+    if isinstance(record, Mapping):
+        return dict(record)
+    dump = getattr(record, "model_dump", None)
+    if callable(dump):
+        return dict(dump(mode="json"))
+    raise TypeError(f"expected a Mapping or an object with model_dump(), got {type(record)!r}")
+
+
+_STOP = object()
+
+
+class _JsonlSink:
+    """Append-only JSONL file fsync'ed every `chunk_records` lines."""
+
+    def __init__(
+        self, path: Path, chunk_records: int, before_sync: Callable[[], None] | None = None
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: IO[bytes] = open(path, "ab")  # closed in close()
+        self._chunk = chunk_records
+        self._before_sync = before_sync
+        self._pending = 0
+        self.count = 0
+
+    def write(self, obj: Mapping[str, Any]) -> None:
+        self._f.write(json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n")
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self._chunk:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._pending:
+            if self._before_sync is not None:
+                self._before_sync()
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._pending = 0
+
+    def close(self) -> None:
+        self.sync()
+        self._f.close()
+
+
+class EverrecWriter:
+    """
+    Streams frames, telemetry, input events and log lines into a `.everrec` bundle.
+
+    Producers (the agent loop) only pay for a non-blocking enqueue; encoding,
+    hashing and disk I/O happen on a background writer thread. Buffering is
+    bounded twice: by item count (`queue_size`) and by in-flight frame bytes
+    (`max_buffered_bytes`). When either is exhausted the record is dropped and
+    counted rather than stalling the caller, so memory stays flat however long
+    the session runs. `frames="hash"` keeps only per-frame digests;
+    `frames="store"` puts pixels in a deduplicating FrameStore shared by every
+    bundle in the library directory (default: `<parent>/framestore`).
+
+    Frames must not be mutated after they are handed over (capture adapters
+    return a fresh buffer per grab).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        frames: FrameMode = "raw",
+        queue_size: int = 1024,
+        max_buffered_bytes: int = 64 * 1024 * 1024,
+        chunk_records: int = 256,
+        chunk_bytes: int = 256 * 1024 * 1024,
+        meta: Mapping[str, Any] | None = None,
+        store: str | Path | None = None,
+    ) -> None:
+        if frames not in ("raw", "hash", "store"):
+            raise ValueError(f"frames must be 'raw', 'hash' or 'store', got {frames!r}")
+        self.path = Path(path)
+        self.frames_mode: FrameMode = frames
+        self._q: queue.Queue[Any] = queue.Queue(maxsize=max(1, queue_size))
+        self._max_bytes = int(max_buffered_bytes)
+        self._chunk_records = max(1, int(chunk_records))
+        self._chunk_bytes = max(1, int(chunk_bytes))
+        self._extra_meta = dict(meta or {})
+        self._store: FrameStore | None = None
+        if frames == "store":
+            self._store = FrameStore(store or self.path.parent / FRAME_STORE_DIR)
+
+        self._lock = threading.Lock()
+        self._buffered_bytes = 0
+        self.dropped: dict[str, int] = dict.fromkeys(STREAM_FILES, 0)
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._closed = False
+
+        # writer-thread state
+        self._sinks: dict[str, _JsonlSink] = {}
+        self._chunk_no = 0
+        self._chunk_f: IO[bytes] | None = None
+        self._chunk_used = 0
+        self._t0: float | None = None
+        self._t1: float | None = None
+        self._resolution: list[int] | None = None
+        self._created = ""
+
+    # ----- lifecycle -----
+
+    def start(self) -> EverrecWriter:
+        if self._thread is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._created = datetime.now(UTC).isoformat(timespec="seconds")
+            # a bundle cut off before close() stays readable (as incomplete)
+            self._write_meta({"complete": False, **self._store_meta()})
+            self._thread = threading.Thread(target=self._run, name="everrec-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: float | None = None) -> None:
+        """Drain the queue, fsync everything and write meta.json."""
+        if self._closed:
+            return
+        self._closed = True
+        self.start()
+        self._q.put(_STOP)
+        assert self._thread is not None
+        self._thread.join(timeout)
+        if self._error is not None:
+            raise RuntimeError(f"everrec writer failed: {self._error!r}") from self._error
+
+    def __enter__(self) -> EverrecWriter:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----- producers (non-blocking) -----
+
+    def frame(self, ts: float, image: Any, roi: Any = None) -> bool:
+        """Record a full frame, or an ROI crop when `roi` (x, y, w, h) is given."""
+        if image is None:
+            return False
+        a = np.asarray(image)
+        nbytes = a.nbytes  # held until the writer has hashed/written it, in every mode
+        with self._lock:
+            if self._buffered_bytes + nbytes > self._max_bytes:
+                self.dropped["frames"] += 1
+                return False
+            self._buffered_bytes += nbytes
+        if not self._offer("frames", (float(ts), a, None if roi is None else list(roi))):
+            with self._lock:
+                self._buffered_bytes -= nbytes
+            return False
+        return True
+
+    def telemetry(self, ts: float, topic: str, payload: Any) -> bool:
+        return self._offer("telemetry", {"ts": float(ts), "topic": topic, **_plain(payload)})
+
+    def input(self, ts: float, event: Any) -> bool:
+        return self._offer("inputs", {"ts": float(ts), **_plain(event)})
+
+    def log(self, ts: float, line: str | bytes) -> bool:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        return self._offer("logs", {"ts": float(ts), "line": line.rstrip("\r\n")})
+
+    def _offer(self, stream: str, item: Any) -> bool:
+        if self._closed:
+            raise RuntimeError("EverrecWriter is closed")
+        try:
+            self._q.put_nowait((stream, item))
+        except queue.Full:
+            with self._lock:
+                self.dropped[stream] += 1
+            return False
+        return True
+
+    # ----- writer thread -----
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._q.get()
+                if item is _STOP:
+                    break
+                stream, payload = item
+                if stream == "frames":
+                    self._write_frame(*payload)
+                else:
+                    self._track_ts(payload["ts"])
+                    self._sink(stream).write(payload)
+        except BaseException as ex:  # surfaced by close()
+            self._error = ex
+        finally:
+            self._finish()
+
+    def _sink(self, stream: str) -> _JsonlSink:
+        sink = self._sinks.get(stream)
+        if sink is None:
+            # the frame index must never reference store objects that aren't durable
+            hook = self._sync_frame_data if stream == "frames" else None
+            sink = _JsonlSink(self.path / STREAM_FILES[stream], self._chunk_records, hook)
+            self._sinks[stream] = sink
+        return sink
+
+    def _track_ts(self, ts: float) -> None:
+        self._t0 = ts if self._t0 is None else min(self._t0, ts)
+        self._t1 = ts if self._t1 is None else max(self._t1, ts)
+
+    def _write_frame(self, ts: float, a: np.ndarray, roi: list[int] | None) -> None:
+        a = np.ascontiguousarray(a)
+        buf = memoryview(a).cast("B")
+        rec: dict[str, Any] = {
+            "ts": ts,
+            "shape": list(a.shape),
+            "dtype": a.dtype.str,
+            "hash": frame_digest(buf),
+        }
+        if roi is not None:
+            rec["roi"] = roi
+        elif self._resolution is None and a.ndim >= 2:
+            self._resolution = [int(a.shape[1]), int(a.shape[0])]
+        if self._store is not None:
+            self._store.put(buf, rec["hash"])
+        elif self.frames_mode == "raw":
+            f = self._frame_chunk(a.nbytes)
+            rec.update(chunk=self._chunk_no, offset=self._chunk_used, nbytes=a.nbytes)
+            f.write(buf)
+            self._chunk_used += a.nbytes
+        with self._lock:
+            self._buffered_bytes -= a.nbytes
+        self._track_ts(ts)
+        self._sink("frames").write(rec)
+
+    def _frame_chunk(self, nbytes: int) -> IO[bytes]:
+        if self._chunk_f is not None and self._chunk_used + nbytes > self._chunk_bytes:
+            self._close_chunk()
+            self._chunk_no += 1
+        if self._chunk_f is None:
+            p = self.path / frame_chunk_name(self._chunk_no)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            self._chunk_f = open(p, "ab")  # closed in _close_chunk()
+            self._chunk_used = p.stat().st_size
+        return self._chunk_f
+
+    def _sync_frame_data(self) -> None:
+        """Before each frame-index fsync: make the bytes it points at durable first."""
+        if self._store is not None:
+            self._store.sync()
+        if self._chunk_f is not None:
+            self._chunk_f.flush()
+            os.fsync(self._chunk_f.fileno())
+
+    def _close_chunk(self) -> None:
+        if self._chunk_f is not None:
+            self._chunk_f.flush()
+            os.fsync(self._chunk_f.fileno())
+            self._chunk_f.close()
+            self._chunk_f = None
+            if "frames" in self._sinks:
+                self._sinks["frames"].sync()
+
+    def _store_meta(self) -> dict[str, Any]:
+        if self._store is None:
+            return {}
+        return {"frame_store": os.path.relpath(self._store.root, self.path)}
+
+    def _write_meta(self, fields: Mapping[str, Any]) -> None:
+        meta = {
+            "format": "everrec",
+            "schema": EVERREC_SCHEMA,
+            "created": self._created,
+            "frames_mode": self.frames_mode,
+            **fields,
+            **self._extra_meta,
+        }
+        tmp = self.path / (META_NAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(meta, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path / META_NAME)
+
+    def _finish(self) -> None:
+        self._close_chunk()
+        store = self._store_meta()
+        if self._store is not None:
+            self._store.close()
+            store["frame_store_stats"] = self._store.stats()
+        for sink in self._sinks.values():
+            sink.close()
+        self._write_meta(
+            {
+                "complete": True,
+                "resolution": self._resolution,
+                "t0": self._t0,
+                "t1": self._t1,
+                "counts": {
+                    s: (self._sinks[s].count if s in self._sinks else 0) for s in STREAM_FILES
+                },
+                "dropped": dict(self.dropped),
+                **store,
+            }
+        )
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+# <library>/framestore/
+#   pack-<id>.bin   object bytes, concatenated
+#   pack-<id>.idx   one JSON line per object: {"hash", "offset", "nbytes"}
+#
+# Objects are keyed by the blake2b digest of their bytes (the same `hash` the
+# frame index records), so identical frames and ROI crops are stored once per
+# library no matter how many bundles reference them. Each writer appends to a
+# pack of its own; index lines are only written after the pack bytes they
+# point at are fsync'ed, so readers never see a dangling entry.
+
+FRAME_STORE_DIR = "framestore"
+
+
+def frame_digest(buf: Any) -> str:
+    return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+
+class FrameStore:
+    """Content-addressed, deduplicating object store shared by the bundles in a library."""
+
+    def __init__(self, root: str | Path, pack_bytes: int = 256 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self._pack_bytes = max(1, int(pack_bytes))
+        self._index: dict[str, tuple[str, int, int]] | None = None
+        self._maps: dict[str, np.memmap] = {}
+        # writer state
+        self._pack_id: str | None = None
+        self._pack_f: IO[bytes] | None = None
+        self._pack_used = 0
+        self._pending: list[dict[str, Any]] = []
+        self.stored = 0  # objects written by this instance
+        self.deduped = 0  # puts satisfied by an existing object
+
+    # ----- index -----
+
+    def _entries(self) -> dict[str, tuple[str, int, int]]:
+        if self._index is None:
+            self.refresh()
+        assert self._index is not None
+        return self._index
+
+    def refresh(self) -> None:
+        """(Re)load every pack index, picking up objects written by other processes."""
+        index: dict[str, tuple[str, int, int]] = {}
+        if self.root.is_dir():
+            for idx in sorted(self.root.glob("pack-*.idx")):
+                pack = idx.stem
+                for line in idx.read_bytes().splitlines():
+                    try:
+                        e = json.loads(line)
+                        index.setdefault(e["hash"], (pack, int(e["offset"]), int(e["nbytes"])))
+                    except (ValueError, KeyError):
+                        continue  # torn tail from an interrupted writer
+        if self._index:
+            index.update(self._index)  # keep this writer's not-yet-indexed objects
+        self._index = index
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._entries()
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    # ----- write -----
+
+    def put(self, data: Any, digest: str | None = None) -> str:
+        """Store `data` (bytes-like or contiguous array) unless present; returns its digest."""
+        buf = (
+            memoryview(np.ascontiguousarray(data)).cast("B")
+            if isinstance(data, np.ndarray)
+            else memoryview(data)
+        )
+        digest = digest or frame_digest(buf)
+        entries = self._entries()
+        if digest in entries:
+            self.deduped += 1
+            return digest
+        f = self._pack(buf.nbytes)
+        assert self._pack_id is not None
+        offset = self._pack_used
+        f.write(buf)
+        self._pack_used += buf.nbytes
+        entries[digest] = (self._pack_id, offset, buf.nbytes)
+        self._pending.append({"hash": digest, "offset": offset, "nbytes": buf.nbytes})
+        self.stored += 1
+        return digest
+
+    def _pack(self, nbytes: int) -> IO[bytes]:
+        if self._pack_f is not None and self._pack_used + nbytes > self._pack_bytes:
+            self._close_pack()
+        if self._pack_f is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._pack_id = f"pack-{uuid.uuid4().hex}"
+            self._pack_f = open(self.root / f"{self._pack_id}.bin", "ab")  # closed in _close_pack()
+            self._pack_used = 0
+        return self._pack_f
+
+    def sync(self) -> None:
+        """Make every put() so far durable: pack bytes first, then their index lines."""
+        if self._pack_f is None or not self._pending:
+            return
+        self._pack_f.flush()
+        os.fsync(self._pack_f.fileno())
+        with open(self.root / f"{self._pack_id}.idx", "ab") as idx:
+            idx.writelines(
+                json.dumps(e, separators=(",", ":")).encode() + b"\n" for e in self._pending
+            )
+            idx.flush()
+            os.fsync(idx.fileno())
+        self._pending.clear()
+
+    def _close_pack(self) -> None:
+        if self._pack_f is not None:
+            self.sync()
+            self._pack_f.close()
+            self._pack_f = None
+
+    def close(self) -> None:
+        self._close_pack()
+        self._maps.clear()
+
+    # ----- read -----
+
+    def get(self, digest: str) -> np.ndarray:
+        """Read-only uint8 view of an object, memory-mapped from its pack."""
+        try:
+            pack, offset, nbytes = self._entries()[digest]
+        except KeyError:
+            raise KeyError(f"object {digest} not in frame store {self.root}") from None
+        if pack == self._pack_id and self._pack_f is not None:
+            self._pack_f.flush()
+        mm = self._maps.get(pack)
+        if mm is None or offset + nbytes > len(mm):  # (re)map packs that have grown
+            mm = np.memmap(self.root / f"{pack}.bin", dtype=np.uint8, mode="r")
+            self._maps[pack] = mm
+        view: np.ndarray = mm[offset : offset + nbytes]
+        return view
+
+    def stats(self) -> dict[str, int]:
+        return {"objects": len(self), "stored": self.stored, "deduped": self.deduped}
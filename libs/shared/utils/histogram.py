@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Histogram:
+    """
+    Log-bucketed histogram for latencies and durations (seconds).
+
+    `record()` is O(1) and memory is fixed: values are counted in
+    `buckets_per_decade` log-spaced buckets between `lo` and `hi` (anything
+    outside is clamped into the first/last bucket), so percentiles are exact
+    to within one bucket (~12% with the default 20 per decade). Count, sum,
+    min and max are exact.
+    """
+
+    lo: float = 1e-6
+    hi: float = 100.0
+    buckets_per_decade: int = 20
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    _counts: list[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self._log_lo = math.log10(self.lo)
+        self._n = max(1, math.ceil((math.log10(self.hi) - self._log_lo) * self.buckets_per_decade))
+        if not self._counts:
+            self._counts = [0] * (self._n + 1)
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.lo:
+            return 0
+        i = int((math.log10(value) - self._log_lo) * self.buckets_per_decade) + 1
+        return min(i, self._n)
+
+    def _upper(self, i: int) -> float:
+        """Upper edge of bucket i."""
+        return 10 ** (self._log_lo + i / self.buckets_per_decade)
+
+    def record(self, value: float) -> None:
+        self._counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile `q` (0-1): the upper edge of its bucket, clamped to [min, max]."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(max(self._upper(i), self.min), self.max)
+        return self.max
+
+    def merge(self, other: Histogram) -> None:
+        if (other.lo, other.hi, other.buckets_per_decade) != (
+            self.lo,
+            self.hi,
+            self.buckets_per_decade,
+        ):
+            raise ValueError("histograms have different buckets")
+        for i, n in enumerate(other._counts):
+            self._counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        self._counts = [0] * (self._n + 1)
+        self.count, self.total = 0, 0.0
+        self.min, self.max = math.inf, -math.inf
+
+    def summary(self, scale: float = 1e3) -> dict[str, float]:
+        """count plus mean/p50/p95/p99/max multiplied by `scale` (default: seconds -> ms)."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.mean * scale,
+            "p50": self.percentile(0.50) * scale,
+            "p95": self.percentile(0.95) * scale,
+            "p99": self.percentile(0.99) * scale,
+            "max": self.max * scale,
+        }
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+_END = object()
+
+
+@dataclass
+class _Stream:
+    name: str
+    order: int
+    source: Iterator[Any]
+    watermark: float = -math.inf  # highest ts pulled so far
+    buffered: int = 0
+    done: bool = False
+
+
+class StreamMerge[T]:
+    """
+    k-way merge of timestamped streams, pulled one item at a time.
+
+    Each stream is an iterator; its items are ordered by `key` (a timestamp),
+    give or take `lookahead` seconds: an item may trail the newest one already
+    pulled from the same stream by at most that much. Items wait in one heap
+    until no stream can still produce something earlier, then come out in
+    (ts, stream order, arrival) order, so ties are stable like `heapq.merge`.
+
+    Sources are only advanced when the merge needs their next item to decide,
+    so nothing is read ahead beyond the lookahead window: a slow consumer
+    slows the producers down instead of growing a buffer. A live source may
+    yield None for "nothing yet"; if the merge needs that stream to decide,
+    `pull()` returns None until the caller comes back, unless `now` says the
+    caught-up stream is complete past that point. Items arriving later than their
+    window are passed on immediately and counted in `late`.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[T], float] = attrgetter("ts"),
+        lookahead: float = 0.0,
+        max_buffered: int = 100_000,
+    ) -> None:
+        self._key = key
+        self.lookahead = max(0.0, float(lookahead))
+        self._max_buffered = max(1, int(max_buffered))
+        self._streams: list[_Stream] = []
+        self._heap: list[tuple[float, int, int, _Stream, T]] = []
+        self._seq = itertools.count()
+        self._emitted = -math.inf
+        self.late = 0
+
+    def add(self, name: str, source: Iterable[T | None]) -> None:
+        self._streams.append(_Stream(name, len(self._streams), iter(source)))
+
+    @property
+    def done(self) -> bool:
+        """True once every source is exhausted and every item has been emitted."""
+        return not self._heap and all(s.done for s in self._streams)
+
+    @property
+    def buffered(self) -> int:
+        return len(self._heap)
+
+    def _blocker(self, now: float, pending: set[int]) -> tuple[_Stream | None, bool]:
+        """
+        The stream to advance before the heap head can go out (None if it can),
+        and whether a pending source is holding it back as well.
+        """
+        if self._heap:
+            ts, order, _, own, _ = self._heap[0]
+        else:
+            ts, order, own = math.inf, len(self._streams), None
+        blocker: _Stream | None = None
+        waiting = False
+        for s in self._streams:
+            if s.done:
+                continue
+            # earliest ts s may still yield; a caught-up live source is complete up to `now`
+            low = (max(s.watermark, now) if s.order in pending else s.watermark) - self.lookahead
+            if s is own:
+                safe = low >= ts or s.buffered >= self._max_buffered
+            else:
+                safe = (low, s.order) > (ts, order)
+            if safe:
+                continue
+            if s.order in pending:
+                waiting = True
+            elif blocker is None or s.watermark < blocker.watermark:
+                blocker = s
+        return blocker, waiting
+
+    def pull(self, now: float = -math.inf) -> tuple[str, T] | None:
+        """
+        Next (stream name, item) in timestamp order, or None when nothing can be
+        released yet (a source is pending) or everything is done.
+
+        `now` is a watermark for live use: a source that has nothing more
+        right now is taken to be complete up to `now`, so idle streams
+        don't hold the others back.
+        """
+        pending: set[int] = set()
+        while True:
+            blocker, waiting = self._blocker(now, pending)
+            if blocker is None:
+                if waiting or not self._heap:
+                    return None
+                ts, _, _, stream, item = heapq.heappop(self._heap)
+                stream.buffered -= 1
+                if ts < self._emitted:
+                    self.late += 1
+                else:
+                    self._emitted = ts
+                return stream.name, item
+            nxt: Any = next(blocker.source, _END)
+            if nxt is _END:
+                blocker.done = True
+            elif nxt is None:
+                pending.add(blocker.order)  # nothing yet; try the others
+            else:
+                ts = float(self._key(nxt))
+                blocker.watermark = max(blocker.watermark, ts)
+                blocker.buffered += 1
+                heapq.heappush(self._heap, (ts, blocker.order, next(self._seq), blocker, nxt))
+
+    def drain(self, now: float = -math.inf) -> Iterator[tuple[str, T]]:
+        """Everything that can be released now; for a live merge, call once per tick."""
+        while (nxt := self.pull(now)) is not None:
+            yield nxt
+
+    def __iter__(self) -> Iterator[tuple[str, T]]:
+        return self.drain()
+
+
+def merge_by_ts[T](
+    streams: Iterable[Iterable[T]],
+    key: Callable[[T], float] = attrgetter("ts"),
+    lookahead: float = 0.0,
+) -> Iterator[T]:
+    """
+    Items of finite, (nearly) ts-ordered iterables as one ordered stream.
+    Strictly ordered inputs (no `lookahead`) go straight to `heapq.merge`.
+    """
+    if not lookahead:
+        return heapq.merge(*streams, key=key)
+    merge: StreamMerge[T] = StreamMerge(key, lookahead)
+    for i, s in enumerate(streams):
+        merge.add(str(i), s)
+    return (item for _, item in merge)
+
+
+def queue_source[T](queue: deque[T]) -> Iterator[T | None]:
+    """Live source over a deque filled by a producer: its items, or None when empty."""
+    while True:
+        yield queue.popleft() if queue else None
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .everrec import EVERREC_SCHEMA, FRAMES_DIR, META_NAME, STREAM_FILES, frame_chunk_name
+from .framestore import FrameStore
+from .merge import merge_by_ts
+
+# Cached per bundle; rebuilt whenever a stream file's size or mtime changes.
+INDEX_NAME = "index.npz"
+_INDEX_VERSION = 2
+_TS_PREFIX = b'{"ts":'
+_ROI_KEY = b'"roi":'
+
+
+class ReplayRecord(NamedTuple):
+    ts: float
+    stream: str
+    data: dict[str, Any]
+
+
+def _line_ts(buf: Any, start: int, end: int) -> float:
+    # The recorder always writes "ts" first; anything else takes the slow path.
+    if buf[start : start + len(_TS_PREFIX)] == _TS_PREFIX:
+        i = start + len(_TS_PREFIX)
+        j = i
+        while j < end and buf[j] not in b",}":
+            j += 1
+        return float(buf[i:j])
+    return float(json.loads(buf[start:end])["ts"])
+
+
+def _roi_key(roi: Any) -> str:
+    return "" if roi is None else ",".join(str(int(v)) for v in roi)
+
+
+def _line_roi(buf: Any, start: int, end: int) -> str:
+    """`_roi_key` of a frame line's "roi" ("" for a full frame), without decoding the line."""
+    i = buf.find(_ROI_KEY, start, end)
+    if i < 0:
+        return ""
+    j = buf.find(b"]", i, end)
+    return bytes(buf[buf.find(b"[", i, j) + 1 : j]).replace(b" ", b"").decode("ascii")
+
+
+def _scan_rois(buf: Any, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, list[str]]:
+    """Per-line ROI ids into a table of ROI keys; id 0 is the full frame."""
+    table: dict[str, int] = {"": 0}
+    ids = np.fromiter(
+        (
+            table.setdefault(_line_roi(buf, int(s), int(e)), len(table))
+            for s, e in zip(starts, ends, strict=True)
+        ),
+        dtype=np.int32,
+        count=len(starts),
+    )
+    return ids, list(table)
+
+
+def _scan_lines(buf: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(ts, start, end) per complete line, sorted by ts; a torn last line is ignored."""
+    ends = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 0x0A)
+    starts = np.empty_like(ends)
+    if len(ends):
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+    ts = np.fromiter(
+        (_line_ts(buf, int(s), int(e)) for s, e in zip(starts, ends, strict=True)),
+        dtype=np.float64,
+        count=len(ends),
+    )
+    order = np.argsort(ts, kind="stable")
+    return ts[order], starts[order], ends[order]
+
+
+class _Stream:
+    __slots__ = ("name", "path", "ts", "starts", "ends", "rois", "_roi_ids", "_by_roi", "_mm")
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        ts: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        roi_ids: np.ndarray | None = None,
+        rois: list[str] | None = None,
+    ):
+        self.name = name
+        self.path = path
+        self.ts = ts
+        self.starts = starts
+        self.ends = ends
+        self.rois = {k: i for i, k in enumerate(rois or [])}
+        self._roi_ids = roi_ids
+        self._by_roi: dict[int, tuple[np.ndarray, np.ndarray]] | None = None
+        self._mm: mmap.mmap | None = None
+
+    def roi_lines(self, roi: Any) -> tuple[np.ndarray, np.ndarray] | None:
+        """(ts, line) arrays of one ROI's frames in ts order, or None if it never occurs."""
+        rid = self.rois.get(_roi_key(roi))
+        if rid is None or self._roi_ids is None:
+            return None
+        if self._by_roi is None:
+            # One stable grouping pass, done on first use: lines stay in ts order per ROI.
+            order = np.argsort(self._roi_ids, kind="stable")
+            bounds = np.searchsorted(self._roi_ids[order], np.arange(len(self.rois) + 1))
+            self._by_roi = {
+                i: (self.ts[order[lo:hi]], order[lo:hi])
+                for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:], strict=True))
+            }
+        return self._by_roi[rid]
+
+    def line(self, i: int) -> dict[str, Any]:
+        if self._mm is None:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        rec: dict[str, Any] = json.loads(self._mm[int(self.starts[i]) : int(self.ends[i])])
+        return rec
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class ReplayReader:
+    """
+    Random access over a `.everrec` bundle (directory layout from EverrecWriter).
+
+    Opening builds, or loads from `index.npz`, a sorted timestamp→line-offset
+    index per stream. Nothing else is parsed up front: JSONL files are
+    memory-mapped and a record is decoded when it is yielded, and frame pixels are
+    zero-copy views into memory-mapped chunks, so only frames that are actually
+    touched are paged in. Windows are half-open, `[t0, t1)`.
+    """
+
+    def __init__(self, path: str | Path, cache_index: bool = True) -> None:
+        self.path = Path(path)
+        self.meta: dict[str, Any] = self._read_meta()
+        if int(self.meta.get("schema", 0)) > EVERREC_SCHEMA:
+            raise RuntimeError(f"unsupported .everrec schema {self.meta.get('schema')}")
+        self._streams = self._load_index(cache_index)
+        self._chunks: dict[int, np.memmap] = {}
+        store = self.meta.get("frame_store")
+        self._store = FrameStore(self.path / store) if store else None
+        self._cursor = -math.inf
+
+    def _read_meta(self) -> dict[str, Any]:
+        try:
+            meta: dict[str, Any] = json.loads((self.path / META_NAME).read_text("utf-8"))
+            return meta
+        except (OSError, ValueError):
+            pass
+        if not self._files():
+            raise FileNotFoundError(f"not an .everrec bundle (no {META_NAME}): {self.path}")
+        # Cut off before the writer got to meta.json: recover from the stream files.
+        chunks = (self.path / FRAMES_DIR).glob("chunk-*.bin")
+        return {
+            "format": "everrec",
+            "schema": EVERREC_SCHEMA,
+            "frames_mode": "raw" if any(chunks) else "hash",
+            "complete": False,
+            "recovered": True,
+        }
+
+    @property
+    def complete(self) -> bool:
+        """False for a recording whose writer never closed (crash, kill, still live)."""
+        return bool(self.meta.get("complete", True))
+
+    # ----- index -----
+
+    def _files(self) -> dict[str, Path]:
+        return {
+            s: self.path / rel for s, rel in STREAM_FILES.items() if (self.path / rel).is_file()
+        }
+
+    def _load_index(self, cache: bool) -> dict[str, _Stream]:
+        files = self._files()
+        key = json.dumps(
+            {
+                "v": _INDEX_VERSION,
+                **{s: [p.stat().st_size, p.stat().st_mtime_ns] for s, p in files.items()},
+            },
+            sort_keys=True,
+        )
+        cache_path = self.path / INDEX_NAME
+        if cache and cache_path.is_file():
+            try:
+                with np.load(cache_path) as z:
+                    if str(z["key"]) == key:
+                        return {
+                            s: _Stream(
+                                s,
+                                p,
+                                z[f"{s}.ts"],
+                                z[f"{s}.start"],
+                                z[f"{s}.end"],
+                                z[f"{s}.roi"] if f"{s}.roi" in z else None,
+                                json.loads(str(z[f"{s}.rois"])) if f"{s}.rois" in z else None,
+                            )
+                            for s, p in files.items()
+                        }
+            except (OSError, KeyError, ValueError):
+                pass  # stale or damaged cache: rebuild
+
+        streams: dict[str, _Stream] = {}
+        arrays: dict[str, np.ndarray] = {"key": np.array(key)}
+        for s, p in files.items():
+            data = p.read_bytes()
+            ts, starts, ends = _scan_lines(data)
+            arrays.update({f"{s}.ts": ts, f"{s}.start": starts, f"{s}.end": ends})
+            if s == "frames":
+                roi_ids, rois = _scan_rois(data, starts, ends)
+                streams[s] = _Stream(s, p, ts, starts, ends, roi_ids, rois)
+                arrays.update({f"{s}.roi": roi_ids, f"{s}.rois": np.array(json.dumps(rois))})
+            else:
+                streams[s] = _Stream(s, p, ts, starts, ends)
+        if cache:
+            tmp = self.path / (INDEX_NAME + ".tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    np.savez(f, **arrays)  # type: ignore[arg-type]
+                os.replace(tmp, cache_path)
+            except OSError:
+                pass  # read-only bundle: just don't cache
+        return streams
+
+    # ----- introspection -----
+
+    @property
+    def streams(self) -> list[str]:
+        return [s for s in STREAM_FILES if s in self._streams]
+
+    def count(self, stream: str) -> int:
+        st = self._streams.get(stream)
+        return 0 if st is None else len(st.ts)
+
+    def __len__(self) -> int:
+        return sum(len(st.ts) for st in self._streams.values())
+
+    @property
+    def t0(self) -> float | None:
+        firsts = [float(st.ts[0]) for st in self._streams.values() if len(st.ts)]
+        return min(firsts) if firsts else None
+
+    @property
+    def t1(self) -> float | None:
+        lasts = [float(st.ts[-1]) for st in self._streams.values() if len(st.ts)]
+        return max(lasts) if lasts else None
+
+    def timestamps(self, stream: str) -> np.ndarray:
+        """Sorted timestamps of one stream (read-only view of the index)."""
+        st = self._streams.get(stream)
+        return np.empty(0) if st is None else st.ts
+
+    # ----- access -----
+
+    def get(self, stream: str, i: int) -> ReplayRecord:
+        st = self._streams[stream]
+        data = st.line(i)
+        if stream == "frames":
+            data["image"] = self._frame_pixels(data)
+        return ReplayRecord(float(st.ts[i]), stream, data)
+
+    def _frame_pixels(self, rec: dict[str, Any]) -> np.ndarray | None:
+        if "chunk" not in rec:
+            if self._store is None:
+                return None  # hash-only recording
+            obj: np.ndarray = self._store.get(rec["hash"]).view(np.dtype(rec["dtype"]))
+            return obj.reshape(rec["shape"])
+        n = int(rec["chunk"])
+        off, nbytes = int(rec["offset"]), int(rec["nbytes"])
+        mm = self._chunks.get(n)
+        if mm is None or off + nbytes > mm.shape[0]:  # new, or grown since it was mapped
+            path = self.path / frame_chunk_name(n)
+            if not path.is_file() or path.stat().st_size < off + nbytes:
+                return None  # lost with the torn tail of an incomplete recording
+            mm = self._chunks[n] = np.memmap(path, dtype=np.uint8, mode="r")
+        pixels: np.ndarray = mm[off : off + nbytes].view(np.dtype(rec["dtype"]))
+        return pixels.reshape(rec["shape"])
+
+    def frame_at(self, ts: float, roi: Any = None) -> ReplayRecord | None:
+        """The last full frame (or crop of `roi`) recorded at or before `ts`."""
+        st = self._streams.get("frames")
+        found = None if st is None else st.roi_lines(roi)
+        if found is None:
+            return None
+        roi_ts, lines = found
+        j = int(np.searchsorted(roi_ts, ts, side="right")) - 1
+        return self.get("frames", int(lines[j])) if j >= 0 else None
+
+    def _iter_stream(self, stream: str, t0: float, t1: float) -> Iterator[ReplayRecord]:
+        st = self._streams[stream]
+        lo = int(np.searchsorted(st.ts, t0, side="left"))
+        hi = int(np.searchsorted(st.ts, t1, side="left"))
+        for i in range(lo, hi):
+            yield self.get(stream, i)
+
+    def window(
+        self, t0: float, t1: float = math.inf, streams: Iterable[str] | None = None
+    ) -> Iterator[ReplayRecord]:
+        """Records with `t0 <= ts < t1`, merged across streams in timestamp order."""
+        wanted = self.streams if streams is None else [s for s in streams if s in self._streams]
+        # Streams are added in STREAM_FILES order, which breaks timestamp ties.
+        return merge_by_ts(self._iter_stream(s, t0, t1) for s in wanted)
+
+    def seek(self, ts: float) -> ReplayReader:
+        """Position iteration at `ts`: `for rec in reader.seek(12.5): ...`."""
+        self._cursor = float(ts)
+        return self
+
+    def tell(self) -> float:
+        return self._cursor
+
+    def __iter__(self) -> Iterator[ReplayRecord]:
+        return self.window(self._cursor)
+
+    # ----- lifecycle -----
+
+    def close(self) -> None:
+        for st in self._streams.values():
+            st.close()
+        self._chunks.clear()
+        if self._store is not None:
+            self._store.close()
+
+    def __enter__(self) -> ReplayReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+_EXPECTED, _PRODUCED = 0, 1
+
+
+@dataclass(frozen=True)
+class Divergence:
+    ts: float
+    key: tuple[Any, ...]
+    kind: str  # "mismatch" | "missing" (expected, not produced) | "extra"
+    field: str | None = None
+    expected: Any = None
+    produced: Any = None
+
+    def __str__(self) -> str:
+        where = f"t={self.ts:.6f} {'/'.join(map(str, self.key))}"
+        if self.kind == "mismatch":
+            return f"{where} {self.field}: expected {self.expected!r}, got {self.produced!r}"
+        return f"{where}: {self.kind} record"
+
+
+@dataclass
+class DiffReport:
+    matched: int = 0
+    missing: int = 0
+    extra: int = 0
+    mismatched_rows: int = 0
+    field_mismatches: dict[str, int] = field(default_factory=dict)
+    max_abs_error: dict[str, float] = field(default_factory=dict)
+    first: Divergence | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.first is None
+
+    def _diverged(self, d: Divergence) -> None:
+        if self.first is None or d.ts < self.first.ts:
+            self.first = d
+
+    def summary(self) -> str:
+        head = (
+            f"telemetry diff: {self.matched} matched, {self.mismatched_rows} mismatched, "
+            f"{self.missing} missing, {self.extra} extra"
+        )
+        lines = [head]
+        if self.first is not None:
+            lines.append(f"  first divergence: {self.first}")
+        for name, n in sorted(self.field_mismatches.items(), key=lambda kv: -kv[1]):
+            err = self.max_abs_error.get(name)
+            lines.append(f"  {name}: {n} rows" + ("" if err is None else f", max |err| {err:.6g}"))
+        return "\n".join(lines)
+
+
+def _numeric(values: Sequence[Any]) -> np.ndarray | None:
+    """float64 column (None -> NaN), or None when any value isn't a plain number."""
+    for v in values:
+        if v is not None and (isinstance(v, bool) or not isinstance(v, int | float)):
+            return None
+    return np.array([math.nan if v is None else v for v in values], dtype=np.float64)
+
+
+class _Pending:
+    __slots__ = ("ts", "side", "key", "rec", "paired")
+
+    def __init__(self, ts: float, side: int, key: tuple[Any, ...], rec: Mapping[str, Any]) -> None:
+        self.ts = ts
+        self.side = side
+        self.key = key
+        self.rec = rec
+        self.paired = False
+
+
+class TelemetryDiff:
+    """
+    Streaming comparison of expected vs produced telemetry.
+
+    Both inputs must be ordered by `ts` (as recorded/published). Records are
+    grouped by `key` fields (topic and agent by default) and paired with the
+    oldest unmatched record on the other side within `ts_tol`; anything left
+    unpaired once the stream has moved past it is reported missing/extra.
+    Paired records are compared per field in vectorized batches of `batch`
+    pairs, so memory stays bounded by the batch plus the tolerance window
+    however long the clip is.
+    """
+
+    def __init__(
+        self,
+        ts_tol: float = 1e-3,
+        atol: float = 1e-6,
+        rtol: float = 0.0,
+        fields: Iterable[str] | None = None,
+        ignore: Iterable[str] = ("ts",),
+        key: Sequence[str] = ("topic", "agent_id"),
+        batch: int = 4096,
+    ) -> None:
+        self.ts_tol = float(ts_tol)
+        self.atol = float(atol)
+        self.rtol = float(rtol)
+        self.fields = None if fields is None else list(fields)
+        self.ignore = set(ignore) | set(key)
+        self.key = tuple(key)
+        self.batch = max(1, int(batch))
+
+    def _key(self, rec: Mapping[str, Any]) -> tuple[Any, ...]:
+        return tuple(rec.get(k) for k in self.key)
+
+    def run(
+        self, expected: Iterable[Mapping[str, Any]], produced: Iterable[Mapping[str, Any]]
+    ) -> DiffReport:
+        report = DiffReport()
+        # unpaired records per key and side, plus all of them in ts order: the
+        # global deque is what expires them, so keys seen on one side only
+        # (a missing topic/agent) age out like everything else
+        pending: dict[tuple[Any, ...], tuple[deque[_Pending], deque[_Pending]]] = {}
+        waiting: deque[_Pending] = deque()
+        pairs: list[tuple[float, tuple[Any, ...], Mapping[str, Any], Mapping[str, Any]]] = []
+
+        def expire(horizon: float) -> None:
+            while waiting:
+                head = waiting[0]
+                if head.paired:
+                    waiting.popleft()
+                    continue
+                if head.ts >= horizon:
+                    break
+                waiting.popleft()
+                queues = pending[head.key]
+                queues[head.side].popleft()  # the oldest record of its key and side
+                if not queues[0] and not queues[1]:
+                    del pending[head.key]
+                missing = head.side == _EXPECTED
+                report.missing += missing
+                report.extra += not missing
+                report._diverged(Divergence(head.ts, head.key, "missing" if missing else "extra"))
+
+        for side, rec in _merge(expected, produced):
+            t = float(rec["ts"])
+            expire(t - self.ts_tol)
+            key = self._key(rec)
+            queues = pending.get(key)
+            if queues is None:
+                queues = pending[key] = (deque(), deque())
+            other = queues[1 - side]
+            if other:
+                mate = other.popleft()
+                mate.paired = True
+                exp, prod = (rec, mate.rec) if side == _EXPECTED else (mate.rec, rec)
+                pairs.append((min(t, mate.ts), key, exp, prod))
+                if len(pairs) >= self.batch:
+                    self._compare(pairs, report)
+                    pairs.clear()
+            else:
+                entry = _Pending(t, side, key, rec)
+                queues[side].append(entry)
+                waiting.append(entry)
+
+        self._compare(pairs, report)
+        expire(math.inf)
+        return report
+
+    def _compare(
+        self,
+        pairs: list[tuple[float, tuple[Any, ...], Mapping[str, Any], Mapping[str, Any]]],
+        report: DiffReport,
+    ) -> None:
+        if not pairs:
+            return
+        report.matched += len(pairs)
+        names = self.fields
+        if names is None:
+            seen: dict[str, None] = {}
+            for _, _, e, p in pairs:
+                seen.update(dict.fromkeys(e))
+                seen.update(dict.fromkeys(p))
+            names = [n for n in seen if n not in self.ignore]
+        ts = np.fromiter((p[0] for p in pairs), dtype=np.float64, count=len(pairs))
+        bad_rows = np.zeros(len(pairs), dtype=np.bool_)
+        for name in names:
+            ev = [e.get(name) for _, _, e, _ in pairs]
+            pv = [p.get(name) for _, _, _, p in pairs]
+            ea, pa = _numeric(ev), _numeric(pv)
+            if ea is not None and pa is not None:
+                both_nan = np.isnan(ea) & np.isnan(pa)
+                bad = ~(np.isclose(ea, pa, rtol=self.rtol, atol=self.atol) | both_nan)
+                if bad.any():
+                    err = float(np.nanmax(np.abs(ea[bad] - pa[bad]), initial=0.0))
+                    report.max_abs_error[name] = max(report.max_abs_error.get(name, 0.0), err)
+            else:
+                bad = np.fromiter((a != b for a, b in zip(ev, pv, strict=True)), np.bool_, len(ev))
+            n_bad = int(bad.sum())
+            if not n_bad:
+                continue
+            report.field_mismatches[name] = report.field_mismatches.get(name, 0) + n_bad
+            bad_rows |= bad
+            i = int(np.flatnonzero(bad)[np.argmin(ts[bad])])
+            report._diverged(Divergence(float(ts[i]), pairs[i][1], "mismatch", name, ev[i], pv[i]))
+        report.mismatched_rows += int(bad_rows.sum())
+
+
+def _merge(
+    expected: Iterable[Mapping[str, Any]], produced: Iterable[Mapping[str, Any]]
+) -> Iterator[tuple[int, Mapping[str, Any]]]:
+    # (ts, side, seq) is unique, so the records themselves are never compared
+    tagged_e = ((float(r["ts"]), _EXPECTED, i, r) for i, r in enumerate(expected))
+    tagged_p = ((float(r["ts"]), _PRODUCED, i, r) for i, r in enumerate(produced))
+    for _, side, _, rec in heapq.merge(tagged_e, tagged_p):
+        yield side, rec
+
+
+def iter_jsonl(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Records of a telemetry.jsonl-style file, one at a time."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def diff_telemetry(
+    expected: Iterable[Mapping[str, Any]], produced: Iterable[Mapping[str, Any]], **kw: Any
+) -> DiffReport:
+    return TelemetryDiff(**kw).run(expected, produced)
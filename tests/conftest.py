@@ -10,3 +10,5 @@ LIBS = ROOT / "libs"
 p = str(LIBS)
 if p not in sys.path:
     sys.path.insert(0, p)
+
+pytest_plugins = ["apps.tools.replay_runner.plugin"]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+from adapters.logs_tail import FakeLogTailPort, FileTailLogPort
+from ports.logs import LogTailPort
+
+
+@pytest.fixture(params=["fake", "file"])
+def port_and_writer(request, tmp_path):
+    if request.param == "fake":
+        fake = FakeLogTailPort(max_batch_lines=2)
+        yield fake, lambda *lines: fake.push(*lines)
+        return
+    log = tmp_path / "game.log"
+    log.write_bytes(b"")
+    port = FileTailLogPort(log, watcher="poll", max_batch_lines=2)
+
+    def write(*lines: str) -> None:
+        with open(log, "ab") as f:
+            f.write("".join(f"{x}\n" for x in lines).encode("utf-8"))
+
+    yield port, write
+    port.close()
+
+
+def test_log_tail_contract(port_and_writer):
+    port, write = port_and_writer
+    assert isinstance(port, LogTailPort)
+    assert port.read_batch() == []
+    write("a", "b", "c")
+    assert port.read_batch() == [b"a", b"b"]  # bounded batches, bytes without terminators
+    assert port.read_batch() == [b"c"]
+    assert port.read_batch(timeout_s=0.0) == []
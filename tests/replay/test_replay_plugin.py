@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from shared.utils.everrec import EverrecWriter
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    root = tmp_path_factory.mktemp("clips")
+    for n in range(3):
+        with EverrecWriter(root / f"c{n}.everrec") as rec:
+            for i in range(20):
+                rec.frame(float(i), np.full((4, 4, 4), i, dtype=np.uint8))
+    return root
+
+
+def check_frames_advance(reader, clock) -> None:
+    last = -1
+    for rec in reader.window(clock.now(), streams=["frames"]):
+        clock.advance_to(rec.ts)
+        value = int(rec.data["image"][0, 0, 0])
+        assert value > last
+        last = value
+
+
+@pytest.mark.replay(workers=2)
+def test_clips_replay_in_parallel(replay_run, clips):
+    report = replay_run(check_frames_advance, clips=clips)
+    assert report.ok, report.summary()
+    assert len(report.results) == 3 and report.shards == 2
+
+
+def test_replay_run_is_auto_marked(request, replay_run, tmp_path):
+    assert request.node.get_closest_marker("replay") is not None
+    replay_run(check_frames_advance, clips=tmp_path)  # no clips -> skipped
+    pytest.fail("replay_run should have skipped")
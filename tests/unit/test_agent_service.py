@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from adapters.dx_capture import FakeScreenCapturePort
+from adapters.telemetry import FakeTelemetryPort
+from adapters.time import FakeClockPort, FakeSleeperPort
+from domain.agent import AgentService
+from ports.vision import BarGaugePort
+
+
+class _Bars(BarGaugePort):
+    def __init__(self, fills: dict[str, float | None]) -> None:
+        self.fills = fills
+        self.images: list[object] = []
+
+    def read(self, image):
+        self.images.append(image)
+        return dict(self.fills)
+
+
+def _service(**kw) -> tuple[AgentService, FakeTelemetryPort]:
+    telem = FakeTelemetryPort()
+    svc = AgentService(FakeClockPort(), FakeSleeperPort(), telem, agent_id="vm1", **kw)
+    return svc, telem
+
+
+def test_tick_publishes_state_without_vision():
+    svc, telem = _service()
+    svc.tick()
+    rec = telem.records[-1]
+    assert rec["agent_id"] == "vm1"
+    assert rec["state"] == "ASSIST"
+    assert rec["hp"] is None and rec["mana"] is None
+
+
+def test_hold_overrides_state():
+    svc, telem = _service()
+    svc.set_hold(True)
+    svc.tick()
+    assert telem.records[-1]["state"] == "HOLD"
+
+
+def test_tick_feeds_hp_mana_from_bar_gauges():
+    bars = _Bars({"hp": 0.426, "mana": 1.0})
+    capture = FakeScreenCapturePort(image="frame")
+    svc, telem = _service(capture=capture, bars=bars)
+    svc.tick()
+    rec = telem.records[-1]
+    assert rec["hp"] == 43
+    assert rec["mana"] == 100
+    assert bars.images == ["frame"]
+
+
+def test_unreadable_bar_stays_none():
+    svc, telem = _service(capture=FakeScreenCapturePort(), bars=_Bars({"hp": None}))
+    svc.tick()
+    assert telem.records[-1]["hp"] is None
+    assert telem.records[-1]["mana"] is None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from ports.ipc import AgentCommandPort, CommandServerPort, TelemetryPubPort, TelemetrySubPort
+from ports.vision import BarGaugePort, ScreenCapturePort
 
 from apps.agent.compose import build_ipc as build_agent_ipc
 from apps.agent.settings import AgentSettings
@@ -25,3 +26,13 @@ def test_coordinator_compose_inproc():
     assert settings.refresh_hz == 2.0
     assert isinstance(cmd_port, AgentCommandPort)
     assert isinstance(telem_sub, TelemetrySubPort)
+
+
+def test_agent_compose_vision_from_roi_profile():
+    from apps.agent.compose import build_vision
+
+    capture, bars = build_vision(AgentSettings(roi_profile="1600x900"))
+    assert isinstance(capture, ScreenCapturePort)
+    assert isinstance(bars, BarGaugePort)
+    # Fake capture yields no pixels; every calibrated bar reads as unknown.
+    assert bars.read(capture.grab().rgba) == {"hp": None, "mana": None}
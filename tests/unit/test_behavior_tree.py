@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from adapters.telemetry import FakeTelemetryPort
+from adapters.time import FakeClockPort, FakeSleeperPort
+from domain.agent import AgentService
+from domain.policies import (
+    Action,
+    BehaviorTree,
+    Condition,
+    Selector,
+    Sequence,
+    Status,
+    Switch,
+)
+
+
+def _combat_tree(calls: list[str]) -> BehaviorTree:
+    def cond(name, key, pred):
+        def check(bb):
+            calls.append(name)
+            return pred(bb.get(key))
+
+        return Condition(name, (key,), check)
+
+    return BehaviorTree(
+        Selector(
+            "root",
+            (
+                Sequence(
+                    "heal",
+                    (cond("hp_low", "hp", lambda v: v is not None and v < 30), Action("potion")),
+                ),
+                Sequence(
+                    "fight",
+                    (cond("has_target", "target", bool), Action("attack", ("target",))),
+                ),
+                Action("idle"),
+            ),
+        )
+    )
+
+
+def test_selector_and_sequence_semantics():
+    tree = _combat_tree([])
+    assert tree.tick({"hp": 20, "target": "rat"}).actions == ("potion",)
+    assert tree.tick({"hp": 90, "target": "rat"}).actions == ("attack",)
+    d = tree.tick({"hp": 90, "target": None})
+    assert d.status == Status.SUCCESS and d.actions == ("idle",)
+
+
+def test_only_subtrees_whose_keys_changed_are_re_evaluated():
+    calls: list[str] = []
+    tree = _combat_tree(calls)
+    tree.tick({"hp": 90, "target": "rat", "mana": 5})
+    assert calls == ["hp_low", "has_target"]
+    calls.clear()
+
+    assert tree.tick({"hp": 90, "target": "rat", "mana": 7}).actions == ("attack",)
+    assert calls == []  # mana isn't read by anything
+
+    assert tree.tick({"hp": 91, "target": "rat", "mana": 7}).actions == ("attack",)
+    assert calls == ["hp_low"]  # the fight branch answered from cache
+    stats = {s.name: s for s in tree.profile()}
+    assert stats["fight"].reused == 1 and stats["fight"].evals == 1
+    assert stats["root"].evals == 2 and stats["root"].reused == 1
+
+
+def test_explicit_changed_keys_skip_the_comparison():
+    calls: list[str] = []
+    tree = _combat_tree(calls)
+    bb = {"hp": 90, "target": "rat"}
+    tree.tick(bb)
+    calls.clear()
+    bb["target"] = None
+    assert tree.tick(bb, changed=["target"]).actions == ("idle",)
+    assert calls == ["has_target"]
+
+
+def test_array_values_on_the_blackboard():
+    calls: list[str] = []
+
+    def seen_frame(bb):
+        calls.append("frame")
+        return bb["frame"].any()
+
+    tree = BehaviorTree(
+        Selector("root", (Condition("lit", ("frame",), seen_frame), Action("idle")))
+    )
+    frame = np.zeros(4)
+    assert tree.tick({"frame": frame}).actions == ("idle",)
+    assert tree.tick({"frame": frame}).actions == ("idle",)
+    assert calls == ["frame"]  # same array object: cached
+    assert tree.tick({"frame": np.ones(4)}).status == Status.SUCCESS
+    assert calls == ["frame", "frame"]  # a new array can't be compared plainly: re-evaluated
+
+
+def test_short_circuited_children_do_not_keep_stale_results():
+    calls: list[str] = []
+    tree = _combat_tree(calls)
+    tree.tick({"hp": 90, "target": "rat"})  # fight evaluated with a target
+    tree.tick({"hp": 10, "target": None})  # heal wins; fight not evaluated
+    calls.clear()
+    assert tree.tick({"hp": 90, "target": None}).actions == ("idle",)
+    assert "has_target" in calls
+
+
+def test_running_results_are_re_ticked():
+    progress = {"n": 0}
+
+    def channel(bb):
+        progress["n"] += 1
+        return Status.RUNNING if progress["n"] < 3 else Status.SUCCESS
+
+    tree = BehaviorTree(Sequence("cast", (Action("channel", (), channel), Action("done"))))
+    assert [tree.tick({}).status for _ in range(2)] == [Status.RUNNING] * 2
+    d = tree.tick({})  # nothing changed, but RUNNING is never served from cache
+    assert d.status == Status.SUCCESS and d.actions == ("channel", "done")
+    tree.tick({})
+    assert progress["n"] == 3  # a finished SUCCESS is reused
+
+
+def test_switch_dispatches_on_mode_key():
+    tree = BehaviorTree(
+        Switch(
+            "mode",
+            "mode",
+            {
+                "farm": Action("loot"),
+                "flee": Sequence("run", (Action("mount"), Action("run_home"))),
+            },
+            default=Action("wait"),
+        )
+    )
+    assert tree.tick({"mode": "farm"}).actions == ("loot",)
+    assert tree.tick({"mode": "flee"}).actions == ("mount", "run_home")
+    assert tree.tick({"mode": "???"}).actions == ("wait",)
+    assert BehaviorTree(Switch("m", "mode", {"a": Action("x")})).tick({}).status == Status.FAILURE
+
+
+def test_compiled_layout_and_profile():
+    tree = _combat_tree([])
+    assert len(tree) == 8
+    assert tree.keys == ["hp", "target"]
+    tree.tick({"hp": 1, "target": None})
+    prof = tree.profile()
+    assert [s.name for s in prof][:3] == ["root", "heal", "hp_low"]
+    assert prof[0].kind == "selector" and prof[0].cost_ns > 0
+
+
+def test_rejects_unknown_nodes():
+    with pytest.raises(TypeError):
+        BehaviorTree("not a node")  # type: ignore[arg-type]
+
+
+def test_agent_service_runs_the_policy_unless_on_hold():
+    tree = BehaviorTree(
+        Selector("root", (Sequence("heal", (Condition("low", ("hp",), lambda bb: False),)),))
+    )
+    svc = AgentService(
+        FakeClockPort(), FakeSleeperPort(), FakeTelemetryPort(), agent_id="vm1", policy=tree
+    )
+    svc.tick()
+    assert svc.decision is not None and svc.decision.status == Status.FAILURE
+    assert svc.blackboard["hp"] is None and svc.blackboard["state"] == "ASSIST"
+    svc.set_hold(True)
+    svc.tick()
+    assert tree.ticks == 1
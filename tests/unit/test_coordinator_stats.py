@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from apps.coordinator.stats import CoordinatorStats, RateMeter, Ring
+
+
+def test_ring_keeps_the_last_samples_and_caches_its_summary():
+    ring = Ring(4)
+    assert ring.summary() == {} and ring.last is None
+    for v in (100.0, 1.0, 2.0, 3.0, 4.0):
+        ring.push(v)
+    assert len(ring) == 4 and ring.values().tolist() == [1.0, 2.0, 3.0, 4.0]
+    s = ring.summary()
+    assert s["max"] == 4.0 and s["p50"] == 2.5 and s["last"] == 4.0
+    assert ring.summary() is s  # unchanged until the next push
+    ring.push(0.0)
+    assert ring.summary()["max"] == 4.0 and ring.summary() is not s
+
+
+def test_rate_meter_forgets_old_slices():
+    meter = RateMeter(window_s=10.0, buckets=10)
+    for i in range(100):  # 10 Hz for 10 s
+        meter.add(i * 0.1)
+    assert meter.rate(10.0) == pytest.approx(10.0, rel=0.15)
+    assert meter.rate(15.0) == pytest.approx(5.0, rel=0.25)
+    assert meter.rate(30.0) == 0.0
+
+
+def test_heartbeat_jitter_rtt_and_fps_per_agent():
+    stats = CoordinatorStats(window=64, heartbeat_hz=5.0)
+    t = 0.0
+    for i in range(20):
+        t += 0.2 + (0.05 if i % 5 == 4 else 0.0)  # every fifth heartbeat is 50 ms late
+        stats.observe("vm1", "heartbeat", {"fps": 30 + i % 2}, t)
+    stats.observe("vm2", "heartbeat", {}, t)
+    stats.command_rtt("vm1", 0.004)
+    stats.command_rtt("vm1", 0.012)
+
+    s = stats.summary("vm1", t)
+    assert s["hb_interval_p50_ms"] == pytest.approx(200.0)
+    assert s["hb_jitter_p50_ms"] == pytest.approx(0.0, abs=1e-6)
+    assert s["hb_jitter_max_ms"] == pytest.approx(50.0)
+    assert s["rtt_max_ms"] == pytest.approx(12.0) and s["rtt_p50_ms"] == pytest.approx(8.0)
+    assert s["fps_max"] == 31.0
+    assert s["msg_rate"] == pytest.approx(4.6, rel=0.2)
+    assert stats.summary("vm2", t)["hb_jitter_p50_ms"] is None
+    assert stats.agents == ["vm1", "vm2"]
+
+    line = stats.format_line("vm1", t)
+    assert line.startswith("vm1: ") and "rtt 8.0/11.6/12.0 ms" in line
+    assert "jitter -" in stats.format_line("vm2", t)
+
+
+def test_jitter_without_a_configured_rate_follows_the_observed_period():
+    stats = CoordinatorStats()
+    for i in range(50):
+        stats.observe("vm1", "heartbeat", {}, i * 0.5)
+    assert stats.summary("vm1", 25.0)["hb_jitter_max_ms"] == pytest.approx(0.0, abs=1e-6)
@@ -1,6 +1,8 @@
 # tests/unit/test_coordinator_tui.py
 from datetime import UTC, datetime, timedelta
 
+from shared.telemetry import TelemetryArchive
+
 from apps.coordinator.tui import AgentRow, CoordinatorTUI
 
 
@@ -75,3 +77,121 @@ def test_status_text_connected_vs_configured_counts():
     s = app._status_text()
     assert "Agents: 1/2" in s
     assert "Last msg:" in s
+
+
+def _run_headless(body, agents: int = 3):
+    """Run `body(app)` inside a mounted, headless app with `agents` configured rows."""
+    import asyncio
+
+    async def main():
+        app = CoordinatorTUI()
+        app.settings.agents_cmd = {f"vm{i}": f"cmd://vm{i}" for i in range(agents)}
+        async with app.run_test():
+            app._stop.set()  # no live telemetry: messages are fed by hand
+            await body(app)
+
+    asyncio.run(main())
+
+
+def _feed(app, agent_id: str, topic: str = "heartbeat", now: datetime | None = None, **data):
+    now = datetime.now(UTC) if now is None else now
+    with app._lock:
+        app._apply_message(
+            [app.rows[agent_id]],
+            topic,
+            {"agent_id": agent_id, **data},
+            now.replace(microsecond=0).isoformat(),
+            now,
+        )
+
+
+def test_redraw_updates_only_changed_cells_of_dirty_rows():
+    async def body(app):
+        app._sort_mode = "agent"
+        app._refresh_table()
+        table, before = app._table, app.redraws
+        assert table.row_count == 3
+        app._redraw()
+        assert app.cell_updates == 0 and app.redraws == before  # nothing dirty, nothing drawn
+        _feed(app, "vm1", hold=False)
+        _feed(app, "vm1", hold=False, fps=30)
+        app._redraw()
+        # last seen, state, heartbeats, fps, msg rate and jitter of one row; the rest untouched
+        assert app.cell_updates == 6 and app.resorts == 0
+        assert table.get_cell("vm1", "rtt") == "-"
+
+        assert table.get_cell("vm1", "heartbeats") == "2"
+        assert table.get_cell("vm1", "fps") == "30.0"
+        assert table.get_cell("vm0", "heartbeats") == "0"
+
+    _run_headless(body)
+
+
+def test_resort_only_when_the_sort_key_changes():
+    async def body(app):
+        app._sort_mode = "state"
+        app._refresh_table()
+        _feed(app, "vm2", "state", state="HOLD")
+        app._redraw()
+        assert app.resorts == 1
+        assert [str(app._table.get_row_at(i)[0]) for i in range(3)] == ["vm0", "vm1", "vm2"]
+        _feed(app, "vm2", "heartbeat", fps=10)  # no "hold": state (the sort key) unchanged
+        app._redraw()
+        assert app.resorts == 1
+        app._table.move_cursor(row=0)
+        assert app._selected_agent().name == "vm0"
+
+    _run_headless(body)
+
+
+def test_last_seen_order_only_changes_with_the_displayed_second():
+    async def body(app):
+        app._refresh_table()
+        base = datetime(2026, 1, 1, 12, 0, 0, tzinfo=UTC)
+        for i, name in enumerate(("vm0", "vm1", "vm2")):
+            _feed(app, name, now=base + timedelta(microseconds=100 * (3 - i)))
+        app._redraw()
+        resorts = app.resorts
+        order = [str(app._table.get_row_at(i)[0]) for i in range(3)]
+        assert order == ["vm0", "vm1", "vm2"]  # same second: ties broken by name
+        for ms in range(1, 20):  # 20 Hz heartbeats, all within the same second
+            for name in app.rows:
+                _feed(app, name, now=base + timedelta(milliseconds=ms * 50))
+            app._redraw()
+        assert app.resorts == resorts
+        _feed(app, "vm2", now=base + timedelta(seconds=1))
+        app._redraw()
+        assert app.resorts == resorts + 1
+        assert str(app._table.get_row_at(0)[0]) == "vm2"
+
+    _run_headless(body)
+
+
+def test_fifty_agents_at_twenty_hz_redraw_once_per_tick():
+    async def body(app):
+        app._refresh_table()
+        before = app.redraws
+        for _ in range(20):  # one second of 20 Hz heartbeats from every agent
+            for name in app.rows:
+                _feed(app, name, hold=False)
+        app._redraw()
+        assert app.redraws == before + 1
+        assert app._table.get_cell("vm49", "heartbeats") == "20"
+
+    _run_headless(body, agents=50)
+
+
+def test_unmount_closes_the_archive_once_under_the_lock(tmp_path):
+    app = make_app()
+    archive = TelemetryArchive(tmp_path)
+    archive.append("heartbeat", {"agent_id": "vm1"}, ts=1.0)
+    app.archive = archive
+    app.on_unmount()
+    assert app.archive is None and len(archive.segments()) == 1
+    assert not app._archive_lock.locked()
+
+
+def test_jitter_is_measured_against_the_configured_heartbeat_rate():
+    app = CoordinatorTUI()
+    assert app.settings.heartbeat_hz == 5.0
+    assert app.stats.expected_period == 0.2
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ports.ipc import TelemetryPubPort
+from ports.time import ClockPort
+from shared.utils.everrec import (
+    FRAME_INDEX,
+    INPUTS_FILE,
+    LOGS_FILE,
+    META_NAME,
+    TELEMETRY_FILE,
+    EverrecWriter,
+    frame_chunk_name,
+    frame_digest,
+)
+from shared.utils.replay import ReplayReader
+
+from apps.agent.compose import RecordingTelemetryPub
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+
+def _frame(i: int, h: int = 8, w: int = 12) -> np.ndarray:
+    return np.full((h, w, 4), i, dtype=np.uint8)
+
+
+def test_raw_frames_roundtrip(tmp_path):
+    out = tmp_path / "s.everrec"
+    with EverrecWriter(out, meta={"agent_id": "a1"}) as rec:
+        for i in range(3):
+            assert rec.frame(10.0 + i, _frame(i))
+
+    index = _lines(out / FRAME_INDEX)
+    assert [r["ts"] for r in index] == [10.0, 11.0, 12.0]
+    data = (out / frame_chunk_name(0)).read_bytes()
+    for i, r in enumerate(index):
+        buf = data[r["offset"] : r["offset"] + r["nbytes"]]
+        a = np.frombuffer(buf, dtype=r["dtype"]).reshape(r["shape"])
+        assert np.array_equal(a, _frame(i))
+        assert r["hash"] == frame_digest(buf)
+
+    meta = json.loads((out / META_NAME).read_text("utf-8"))
+    assert meta["format"] == "everrec" and meta["frames_mode"] == "raw"
+    assert meta["resolution"] == [12, 8]
+    assert (meta["t0"], meta["t1"]) == (10.0, 12.0)
+    assert meta["counts"]["frames"] == 3 and meta["dropped"]["frames"] == 0
+    assert meta["agent_id"] == "a1" and meta["complete"] is True
+
+
+def test_hash_mode_writes_no_pixels(tmp_path):
+    out = tmp_path / "h.everrec"
+    with EverrecWriter(out, frames="hash") as rec:
+        rec.frame(1.0, _frame(7))
+    (r,) = _lines(out / FRAME_INDEX)
+    assert r["hash"] == frame_digest(_frame(7).tobytes())
+    assert "chunk" not in r
+    assert not list((out / "frames").glob("chunk-*.bin"))
+
+
+def test_frame_chunks_rotate(tmp_path):
+    out = tmp_path / "r.everrec"
+    nbytes = _frame(0).nbytes
+    with EverrecWriter(out, chunk_bytes=2 * nbytes) as rec:
+        for i in range(5):
+            rec.frame(float(i), _frame(i))
+    index = _lines(out / FRAME_INDEX)
+    assert [r["chunk"] for r in index] == [0, 0, 1, 1, 2]
+    assert [r["offset"] for r in index] == [0, nbytes, 0, nbytes, 0]
+    assert (out / frame_chunk_name(2)).stat().st_size == nbytes
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    rec = EverrecWriter(tmp_path / "q.everrec", queue_size=2)
+    # not started: nothing drains, so the third record must be dropped
+    assert rec.log(0.0, "a") and rec.log(0.1, "b")
+    assert not rec.log(0.2, "c")
+    rec.close()
+    assert rec.dropped["logs"] == 1
+    meta = json.loads((rec.path / META_NAME).read_text("utf-8"))
+    assert meta["counts"]["logs"] == 2 and meta["dropped"]["logs"] == 1
+
+
+def test_buffered_bytes_bound(tmp_path):
+    nbytes = _frame(0).nbytes
+    rec = EverrecWriter(tmp_path / "b.everrec", max_buffered_bytes=nbytes * 2)
+    assert rec.frame(0.0, _frame(0)) and rec.frame(1.0, _frame(1))
+    assert not rec.frame(2.0, _frame(2))
+    rec.close()
+    assert rec.dropped["frames"] == 1
+    assert len(_lines(rec.path / FRAME_INDEX)) == 2
+
+
+def test_hash_mode_counts_frames_until_hashed(tmp_path):
+    nbytes = _frame(0).nbytes
+    rec = EverrecWriter(tmp_path / "h.everrec", frames="hash", max_buffered_bytes=nbytes * 2)
+    # not started: queued frames still hold their pixels until the writer hashes them
+    assert rec.frame(0.0, _frame(0)) and rec.frame(1.0, _frame(1))
+    assert not rec.frame(2.0, _frame(2))
+    rec.close()
+    assert rec.dropped["frames"] == 1 and rec._buffered_bytes == 0
+
+
+def test_frame_index_sync_flushes_chunk_bytes_first(tmp_path):
+    rec = EverrecWriter(tmp_path / "d.everrec", chunk_records=2)
+    rec.path.mkdir()
+    # drive the writer-thread side directly: the second index line triggers an fsync
+    rec._write_frame(0.0, _frame(0), None)
+    rec._write_frame(1.0, _frame(1), None)
+    index = _lines(rec.path / FRAME_INDEX)
+    assert len(index) == 2
+    # the chunk is still open (no rotation), yet every byte the index names is on disk
+    last = index[-1]
+    chunk = rec.path / frame_chunk_name(last["chunk"])
+    assert chunk.stat().st_size == last["offset"] + last["nbytes"]
+    rec.close()
+
+
+def test_event_streams(tmp_path):
+    out = tmp_path / "e.everrec"
+    with EverrecWriter(out, chunk_records=1) as rec:
+        rec.telemetry(1.0, "heartbeat", {"ok": True})
+        rec.input(2.0, {"kind": "key", "key": "F1"})
+        rec.log(3.0, b"You hit the rat.\r\n")
+    assert _lines(out / TELEMETRY_FILE) == [{"ts": 1.0, "topic": "heartbeat", "ok": True}]
+    assert _lines(out / INPUTS_FILE) == [{"ts": 2.0, "kind": "key", "key": "F1"}]
+    assert _lines(out / LOGS_FILE) == [{"ts": 3.0, "line": "You hit the rat."}]
+
+
+def test_unclosed_bundle_is_readable(tmp_path):
+    out = tmp_path / "crash.everrec"
+    rec = EverrecWriter(out, chunk_records=1, meta={"agent_id": "a1"}).start()
+    meta = json.loads((out / META_NAME).read_text("utf-8"))
+    assert meta["complete"] is False and meta["frames_mode"] == "raw" and meta["created"]
+    rec.log(3.0, "before the crash")
+    deadline = time.monotonic() + 5.0
+    while not (out / LOGS_FILE).is_file() or not (out / LOGS_FILE).stat().st_size:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    with ReplayReader(out, cache_index=False) as r:  # the writer was never closed
+        assert r.meta["agent_id"] == "a1" and r.count("logs") == 1
+    rec.close()
+    assert json.loads((out / META_NAME).read_text("utf-8"))["complete"] is True
+
+
+def test_closed_writer_rejects_records(tmp_path):
+    rec = EverrecWriter(tmp_path / "c.everrec").start()
+    rec.close()
+    with pytest.raises(RuntimeError):
+        rec.log(0.0, "late")
+    with pytest.raises(ValueError):
+        EverrecWriter(tmp_path / "x.everrec", frames="jpeg")  # type: ignore[arg-type]
+
+
+class _Clock(ClockPort):
+    def now(self) -> float:
+        return 42.0
+
+
+class _Pub(TelemetryPubPort):
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, dict]] = []
+
+    def publish(self, topic, payload) -> None:
+        self.messages.append((topic, dict(payload)))
+
+
+def test_recording_telemetry_pub_tees(tmp_path):
+    inner = _Pub()
+    with EverrecWriter(tmp_path / "t.everrec") as rec:
+        pub = RecordingTelemetryPub(inner, rec, _Clock())
+        pub.publish("state", {"state": "HOLD"})
+    assert inner.messages == [("state", {"state": "HOLD"})]
+    assert _lines(rec.path / TELEMETRY_FILE) == [{"ts": 42.0, "topic": "state", "state": "HOLD"}]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+from adapters.telemetry import FakeTelemetryPort
+from adapters.time import VirtualClockPort, VirtualSleeperPort
+from domain.agent import AgentService, FixedRateScheduler
+from shared.utils.histogram import Histogram
+
+
+def _sched(**kw) -> tuple[FixedRateScheduler, VirtualClockPort]:
+    clock = VirtualClockPort(100.0)
+    return FixedRateScheduler(clock, VirtualSleeperPort(clock), 10.0, **kw), clock
+
+
+def test_ticks_stay_on_the_absolute_grid_despite_late_wakeups():
+    sched, clock = _sched()
+    starts: list[float] = []
+
+    def work():
+        starts.append(round(clock.now(), 9))
+        clock.advance(0.03)  # every tick takes 30 ms of a 100 ms period
+
+    assert sched.run(work, seconds=1.0) == 10
+    assert starts == [round(100.0 + 0.1 * i, 9) for i in range(10)]
+    assert sched.overruns == 0 and sched.skipped == 0
+    assert abs(sched.work.percentile(0.5) - 0.03) < 0.005
+
+
+def test_skip_policy_drops_missed_slots_and_runs_the_latest_due():
+    sched, clock = _sched(overrun="skip")
+    starts: list[float] = []
+
+    def work():
+        starts.append(round(clock.now(), 9))
+        if len(starts) == 2:
+            clock.advance(0.35)  # blows through slots 2, 3 and 4's start
+
+    sched.run(work, ticks=4)
+    # slot 1 ends at 100.45: slots 2 and 3 are dropped, slot 4 (100.4) runs late
+    assert starts == [100.0, 100.1, 100.45, 100.5]
+    assert sched.overruns == 1 and sched.skipped == 2
+    assert sched.jitter.max == pytest.approx(0.05)
+
+
+def test_catch_up_policy_runs_missed_slots_back_to_back_up_to_a_limit():
+    sched, clock = _sched(overrun="catch_up", max_catch_up=1)
+    starts: list[float] = []
+
+    def work():
+        starts.append(round(clock.now(), 9))
+        if len(starts) == 1:
+            clock.advance(0.35)
+
+    sched.run(work, ticks=4)
+    # slots 1..3 are due at 100.35; one missed slot is caught up, one dropped
+    assert starts == [100.0, 100.35, 100.35, 100.4]
+    assert sched.skipped == 1 and sched.overruns == 1
+
+
+def test_due_and_done_for_polling_loops():
+    sched, clock = _sched()
+    sched.reset()
+    hits = 0
+    for _ in range(100):  # poll every 7 ms for 0.7 s
+        if sched.due():
+            hits += 1
+            sched.done()
+        clock.advance(0.007)
+    assert hits == 7
+    stats = sched.stats()
+    assert stats["ticks"] == 7 and stats["rate_hz"] == 10.0
+    assert 0 <= stats["jitter_max_ms"] <= 7.0 + 1e-6
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        _sched(overrun="later")
+
+
+def test_agent_service_publishes_tick_stats():
+    clock = VirtualClockPort(0.0)
+    telem = FakeTelemetryPort()
+    svc = AgentService(clock, VirtualSleeperPort(clock), telem, agent_id="vm1", heartbeat_hz=20)
+    assert svc.run_for(1.0) == 20
+    assert telem.records[0]["tick"] is None
+    tick = telem.records[-1]["tick"]
+    assert tick["ticks"] == 19 and tick["overruns"] == 0 and tick["rate_hz"] == 20.0
+
+
+def test_histogram_percentiles_are_within_a_bucket():
+    h = Histogram()
+    for i in range(1, 1001):
+        h.record(i / 1000)  # 1 ms .. 1 s
+    assert h.count == 1000 and h.min == 0.001 and h.max == 1.0
+    assert h.percentile(0.5) == pytest.approx(0.5, rel=0.13)
+    assert h.percentile(0.95) == pytest.approx(0.95, rel=0.13)
+    assert h.percentile(1.0) == 1.0
+    s = h.summary()
+    assert s["count"] == 1000 and s["max"] == 1000.0
+    other = Histogram()
+    other.record(5.0)
+    h.merge(other)
+    assert h.max == 5.0 and h.count == 1001
+    h.reset()
+    assert h.summary() == {"count": 0}
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from shared.utils.everrec import META_NAME, EverrecWriter
+from shared.utils.framestore import FRAME_STORE_DIR, FrameStore, frame_digest
+from shared.utils.replay import ReplayReader
+
+
+def _frame(i: int) -> np.ndarray:
+    return np.full((6, 10, 4), i, dtype=np.uint8)
+
+
+def test_put_dedups_and_reads_back(tmp_path):
+    store = FrameStore(tmp_path / "fs")
+    a = store.put(_frame(1))
+    assert store.put(_frame(1).tobytes()) == a == frame_digest(_frame(1).tobytes())
+    store.put(_frame(2))
+    assert store.stats() == {"objects": 2, "stored": 2, "deduped": 1}
+    assert bytes(store.get(a)) == _frame(1).tobytes()  # readable before sync
+    store.close()
+
+    again = FrameStore(tmp_path / "fs")
+    assert a in again and len(again) == 2
+    assert bytes(again.get(a)) == _frame(1).tobytes()
+    with pytest.raises(KeyError):
+        again.get("0" * 32)
+
+
+def test_unsynced_objects_are_not_indexed(tmp_path):
+    writer = FrameStore(tmp_path / "fs")
+    d = writer.put(_frame(3))
+    assert d not in FrameStore(tmp_path / "fs")
+    writer.sync()
+    assert d in FrameStore(tmp_path / "fs")
+    writer.close()
+
+
+def test_packs_rotate(tmp_path):
+    store = FrameStore(tmp_path / "fs", pack_bytes=_frame(0).nbytes * 2)
+    digests = [store.put(_frame(i)) for i in range(5)]
+    store.close()
+    assert len(list((tmp_path / "fs").glob("pack-*.bin"))) == 3
+    fresh = FrameStore(tmp_path / "fs")
+    assert [bytes(fresh.get(d)) for d in digests] == [_frame(i).tobytes() for i in range(5)]
+
+
+def test_bundles_share_one_library_store(tmp_path):
+    for name in ("a", "b"):
+        with EverrecWriter(tmp_path / f"{name}.everrec", frames="store") as rec:
+            for i in range(30):
+                rec.frame(float(i), _frame(i // 10))  # 3 distinct scenes
+                rec.frame(float(i), _frame(9)[:2, :3], roi=(4, 4, 3, 2))
+
+    packs = list((tmp_path / FRAME_STORE_DIR).glob("pack-*.bin"))
+    assert sum(p.stat().st_size for p in packs) == 3 * _frame(0).nbytes + _frame(9)[:2, :3].nbytes
+    meta_b = json.loads((tmp_path / "b.everrec" / META_NAME).read_text("utf-8"))
+    assert meta_b["frame_store"] == f"../{FRAME_STORE_DIR}"
+    assert meta_b["frame_store_stats"]["stored"] == 0  # fully deduplicated against "a"
+
+    with ReplayReader(tmp_path / "b.everrec") as r:
+        full = r.frame_at(25.0)
+        assert full is not None and np.array_equal(full.data["image"], _frame(2))
+        crop = r.frame_at(25.0, roi=(4, 4, 3, 2))
+        assert crop is not None and crop.data["image"].shape == (2, 3, 4)
+        assert r.frame_at(25.0, roi=(0, 0, 1, 1)) is None
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from adapters.telemetry import FakeMetricsPort
+from adapters.time import VirtualClockPort
+from adapters.win_input import FakeHumanInputPort, FakeKeyboardMousePort, KeyEventRecord
+from domain.input import HumanPreemption, InputExecutor
+
+
+class _SlowReleasePort(FakeKeyboardMousePort):
+    """key_up_all takes 2 ms of virtual time, like a real SendInput batch."""
+
+    def __init__(self, clock: VirtualClockPort) -> None:
+        super().__init__()
+        self.clock = clock
+
+    def key_up_all(self) -> None:
+        self.clock.advance(0.002)
+        super().key_up_all()
+
+
+def _harness():
+    clock = VirtualClockPort(50.0)
+    port = _SlowReleasePort(clock)
+    human = FakeHumanInputPort()
+    executor = InputExecutor(port, clock)
+    published: list[tuple[str, dict]] = []
+    holds: list[bool] = []
+    metrics = FakeMetricsPort()
+    preempt = HumanPreemption(
+        human,
+        executor,
+        clock,
+        publish=lambda topic, payload: published.append((topic, dict(payload))),
+        on_hold=lambda: holds.append(True),
+        metrics=metrics,
+        labels={"agent_id": "vm1"},
+    )
+    return clock, port, human, executor, preempt, published, holds, metrics
+
+
+def test_human_input_releases_keys_without_a_tick():
+    clock, port, human, executor, preempt, published, holds, _ = _harness()
+    executor.press(0x11)
+    executor.tap(0x1E)
+    executor.pump()
+    executor.press(0x20)  # queued, never sent
+    human.trigger()  # no pump in between
+    assert port.keys[-2:] == [KeyEventRecord(0x11, False), KeyEventRecord(0x1E, False)]
+    assert executor.held and executor.pending == 0 and holds == [True]
+    assert published == [
+        ("state", {"state": "HOLD", "hold": True, "reason": "human_input", "dropped": 1})
+    ]
+    clock.advance(1.0)
+    executor.pump()
+    assert KeyEventRecord(0x20, True) not in port.keys
+
+
+def test_repeated_signals_release_again_but_announce_once():
+    _, port, human, executor, preempt, published, holds, _ = _harness()
+    human.trigger()
+    human.trigger()
+    assert preempt.signals == 2 and preempt.preemptions == 1
+    assert len(published) == 1 and len(holds) == 1
+    preempt.resume()
+    assert not executor.held
+    human.trigger()
+    assert preempt.preemptions == 2 and len(published) == 2
+
+
+def test_latency_is_measured_and_exported():
+    _, _, human, _, preempt, _, _, metrics = _harness()
+    for _ in range(3):
+        human.trigger()
+    stats = preempt.stats()
+    assert abs(stats["latency_max_ms"] - 2.0) < 1e-6 and abs(stats["latency_p50_ms"] - 2.0) < 1e-6
+    assert preempt.latency.count == 3
+    assert [s[0] for s in metrics.samples] == ["preempt_latency_seconds"] * 3
+    assert metrics.samples[0][2] == {"agent_id": "vm1"}
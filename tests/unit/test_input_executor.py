@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from adapters.time import VirtualClockPort
+from adapters.win_input import FakeKeyboardMousePort, KeyEventRecord
+from domain.input import InputExecutor, Key, MousePathGenerator
+
+
+class _CountingPort(FakeKeyboardMousePort):
+    """Also remembers how the events were grouped into calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[tuple] = []
+
+    def send_keys(self, events):
+        events = list(events)
+        self.calls.append(("keys", tuple((e.scan, e.down) for e in events)))
+        super().send_keys(events)
+
+    def mouse_path(self, path):
+        self.calls.append(("path", len(path)))
+        super().mouse_path(path)
+
+    def key_up_all(self):
+        self.calls.append(("up_all",))
+        super().key_up_all()
+
+
+def _exec(**kw) -> tuple[InputExecutor, _CountingPort, VirtualClockPort]:
+    clock = VirtualClockPort(10.0)
+    port = _CountingPort()
+    return InputExecutor(port, clock, **kw), port, clock
+
+
+def test_adjacent_key_actions_go_out_in_one_batch():
+    ex, port, _ = _exec(burst=8)
+    ex.press(0x2A)
+    ex.tap(0x1E)
+    ex.keys([Key(0x30, True), Key(0x30, False)])
+    assert port.calls == []  # nothing happens until pumped
+    assert ex.pump() == 4
+    assert port.calls == [("keys", ((0x2A, True), (0x1E, True), (0x30, True), (0x30, False)))]
+    assert ex.stats()["batches"] == 1
+
+
+def test_tap_release_is_scheduled_not_slept():
+    ex, port, clock = _exec()
+    ex.tap(0x1E, down_ms=45)
+    ex.pump()
+    assert port.keys == [KeyEventRecord(0x1E, True)]
+    assert ex.next_due() == clock.now() + 0.045
+    clock.advance(0.03)
+    ex.pump()
+    assert len(port.keys) == 1
+    clock.advance(0.02)
+    ex.pump()
+    assert port.keys[-1] == KeyEventRecord(0x1E, False) and ex.pressed == frozenset()
+    assert ex.next_due() is None
+
+
+def test_cancelled_releases_are_not_reported_as_due():
+    ex, port, clock = _exec()
+    ex.tap(0x1E, down_ms=45)
+    ex.tap(0x30, down_ms=200)
+    ex.pump()
+    ex.release(0x1E)  # explicit release cancels the scheduled one at +45 ms
+    ex.pump()
+    assert ex.next_due() == clock.now() + 0.2
+    ex.release(0x30)
+    ex.pump()
+    assert ex.next_due() is None
+
+
+def test_retapping_a_held_key_releases_it_first():
+    ex, port, _ = _exec()
+    ex.tap(0x1E)
+    ex.tap(0x1E)
+    ex.pump()
+    assert port.calls == [("keys", ((0x1E, True), (0x1E, False), (0x1E, True)))]
+
+
+def test_paths_split_batches_in_order():
+    ex, port, _ = _exec()
+    ex.press(1)
+    ex.move(MousePathGenerator(seed=0).path((0, 0), (50, 50), duration_ms=40))
+    ex.release(1)
+    ex.pump()
+    assert [c[0] for c in port.calls] == ["keys", "path", "keys"]
+
+
+def test_rate_limit_spreads_actions_over_time():
+    ex, port, clock = _exec(max_rate_hz=10, burst=2)
+    for scan in range(6):
+        ex.press(scan)
+    assert ex.pump() == 2
+    assert ex.pending == 4 and ex.stats()["throttled"] == 1
+    assert abs(ex.next_due() - (clock.now() + 0.1)) < 1e-9
+    clock.advance(0.1)
+    assert ex.pump() == 1
+    clock.advance(0.3)
+    assert ex.pump() == 2  # the bucket never holds more than `burst`
+    assert [k.scan for k in port.keys] == [0, 1, 2, 3, 4]
+
+
+def test_hold_flushes_then_releases_everything_last():
+    ex, port, clock = _exec(max_rate_hz=10, burst=1)
+    ex.press(5)
+    ex.tap(6)
+    ex.pump()
+    clock.advance(0.1)
+    ex.pump()  # 6 is down, its release scheduled
+    ex.press(7)
+    assert ex.hold() == 1
+    assert port.calls[-1] == ("up_all",)
+    assert port.keys[-2:] == [KeyEventRecord(5, False), KeyEventRecord(6, False)]
+    assert not ex.tap(8) and ex.stats()["dropped"] == 2
+    clock.advance(1.0)
+    ex.pump()
+    assert port.calls[-1] == ("up_all",)  # no stale release after the hold
+    ex.resume()
+    assert ex.tap(8) and ex.pump() == 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import math
+
+from adapters.time import VirtualClockPort, VirtualSleeperPort
+from adapters.win_input import FakeKeyboardMousePort, KeyEventRecord
+from domain.input import InputTimeline, MousePath, PrecisionSleeper
+from ports.time import SleeperPort
+
+
+class _OsLikeSleeper(SleeperPort):
+    """Sleeps round up to a 15.625 ms tick; sleep(0) yields for 50 us."""
+
+    def __init__(self, clock: VirtualClockPort, quantum: float = 0.015625) -> None:
+        self.clock = clock
+        self.quantum = quantum
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            self.clock.advance(50e-6)
+        else:
+            self.clock.advance(math.ceil(seconds / self.quantum) * self.quantum)
+
+
+def test_plain_os_sleep_is_late_and_spinning_fixes_it():
+    clock = VirtualClockPort(0.0)
+    os_sleep = _OsLikeSleeper(clock)
+    os_sleep.sleep(0.020)
+    assert clock.now() - 0.020 > 0.010  # the problem: 11 ms late
+    spin_budget = PrecisionSleeper(clock, os_sleep, spin_s=0.016)
+    deadline = clock.now() + 0.020
+    late = spin_budget.sleep_until(deadline)
+    assert 0 <= late <= 50e-6 + 1e-12
+    assert spin_budget.coarse == 1 and spin_budget.spins > 0
+
+
+def test_small_spin_budget_still_suffers_coarse_oversleep():
+    clock = VirtualClockPort(0.0)
+    sleeper = PrecisionSleeper(clock, _OsLikeSleeper(clock), spin_s=0.001)
+    assert sleeper.sleep_until(0.020) > 0.010
+
+
+def test_virtual_sleeper_finishes_without_spinning_forever():
+    clock = VirtualClockPort(5.0)
+    sleeper = PrecisionSleeper(clock, VirtualSleeperPort(clock), spin_s=0.002)
+    sleeper.sleep(0.1)
+    assert clock.now() == 5.1 and sleeper.spins == 1
+
+
+def test_timeline_plays_taps_and_paths_at_absolute_times():
+    clock = VirtualClockPort(0.0)
+    port = FakeKeyboardMousePort()
+    moves: list[tuple[float, int, int]] = []
+    timeline = InputTimeline(clock, _OsLikeSleeper(clock), spin_s=0.016)
+    timeline.add_tap(port, 0x1E, at_s=0.010, down_ms=45)
+    path = MousePath([[0, 0], [5, 5], [10, 10]], [0, 8, 16])
+    timeline.add_path(path, lambda x, y: moves.append((clock.now(), x, y)), at_s=0.1)
+    assert len(timeline) == 5 and timeline.duration == 0.116
+    assert timeline.play(origin=0.0) == 5
+    assert port.keys == [KeyEventRecord(0x1E, True), KeyEventRecord(0x1E, False)]
+    assert [(x, y) for _, x, y in moves] == [(0, 0), (5, 5), (10, 10)]
+    for (t, _, _), want in zip(moves, (0.1, 0.108, 0.116), strict=True):
+        assert 0 <= t - want <= 50e-6 + 1e-9
+    stats = timeline.stats()
+    assert stats["played"] == 5 and stats["late_max_ms"] <= 0.05 + 1e-6
+    assert len(timeline) == 0
+
+
+def test_lateness_does_not_accumulate():
+    clock = VirtualClockPort(0.0)
+    timeline = InputTimeline(clock, _OsLikeSleeper(clock), spin_s=0.0)
+    fired: list[float] = []
+    for i in range(10):
+        timeline.at(i * 0.010, lambda: fired.append(clock.now()))
+    timeline.play(origin=0.0)
+    # each OS sleep is late, but every action aims at origin + offset, never at the last one
+    assert max(t - i * 0.010 for i, t in enumerate(fired)) < 0.015625 + 1e-9
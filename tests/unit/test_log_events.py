@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import pytest
+from adapters.logs_tail import FakeLogTailPort, LogEventMatcher, LogRule, load_log_rules
+from ports.logs import LogEvent
+
+from apps.agent.compose import build_log_matcher
+from apps.agent.settings import AgentSettings
+
+RULES = [
+    LogRule(
+        "damage_taken",
+        r"(?P<source>.+) hits you for (?P<amount>\d+) damage",
+        literals=(" hits you for ",),
+        types={"amount": "int"},
+    ),
+    LogRule(
+        "loot",
+        r"You loot (?P<count>\d+)x (?P<item>.+)\.",
+        literals=("You loot ",),
+        types={"count": "int"},
+    ),
+    LogRule("level_up", r"level (?P<level>\d+)!", literals=("level ",), types={"level": "int"}),
+]
+
+
+def test_typed_events_in_line_order():
+    m = LogEventMatcher(RULES)
+    lines = [
+        b"The wind howls.",
+        b"A rat hits you for 12 damage",
+        b"You loot 3x Rat Tail.",
+        b"You say: hello",
+        b"Welcome to level 7!",
+    ]
+    events = m.match_batch(lines, ts=5.0)
+    assert events == [
+        LogEvent("damage_taken", 5.0, {"source": "A rat", "amount": 12}, lines[1]),
+        LogEvent("loot", 5.0, {"count": 3, "item": "Rat Tail"}, lines[2]),
+        LogEvent("level_up", 5.0, {"level": 7}, lines[4]),
+    ]
+    assert m.lines == 5
+    assert m.candidate_lines == 3
+
+
+def test_prefilter_only_hands_rules_the_lines_with_their_literal():
+    m = LogEventMatcher(RULES)
+    noise = [f"chatter {i}".encode() for i in range(1000)]
+    m.match_batch([*noise, b"You loot 1x Coin.", *noise])
+    stats = {s.name: s for s in m.profile()}
+    assert m.candidate_lines == 1
+    assert stats["loot"].candidates == 1 and stats["loot"].hits == 1
+    assert stats["damage_taken"].candidates == 0
+    assert stats["level_up"].candidates == 0
+
+
+def test_first_matching_rule_wins_and_misses_fall_through():
+    rules = [
+        LogRule("crit", r"CRIT (?P<n>\d+)", literals=("CRIT",), types={"n": "int"}),
+        LogRule("any_hit", r"(?P<n>\d+)", literals=("hit",), types={"n": "int"}),
+    ]
+    m = LogEventMatcher(rules)
+    events = m.match_batch([b"hit CRIT 40", b"hit 5", b"CRIT but no number"])
+    assert [(e.kind, e.fields["n"]) for e in events] == [("crit", 40), ("any_hit", 5)]
+    stats = {s.name: s for s in m.profile()}
+    assert stats["crit"].candidates == 2 and stats["crit"].hits == 1
+    assert stats["any_hit"].candidates == 1
+
+
+def test_overlapping_literals_still_dispatch_every_rule():
+    rules = [
+        LogRule("error", r"error: (?P<msg>.+)", literals=("error",)),
+        LogRule("rror_code", r"rror code (?P<code>\d+)", literals=("rror code",)),
+    ]
+    m = LogEventMatcher(rules)
+    (ev,) = m.match_batch([b"fatal error code 42"])
+    assert ev.kind == "rror_code" and ev.fields == {"code": "42"}
+
+
+def test_rules_without_literals_see_every_line():
+    m = LogEventMatcher([LogRule("num", r"^(?P<v>-?\d+(\.\d+)?)$", types={"v": "float"}), *RULES])
+    events = m.match_batch([b"1.5", b"x", b"A bat hits you for 2 damage"])
+    assert [(e.kind, e.fields.get("v")) for e in events] == [("num", 1.5), ("damage_taken", None)]
+    assert m.candidate_lines == 3
+
+
+def test_conversion_errors_are_counted_not_raised():
+    m = LogEventMatcher([LogRule("n", r"n=(?P<n>\w+)", literals=("n=",), types={"n": "int"})])
+    assert [e.fields for e in m.match_batch([b"n=abc", b"n=4"])] == [{"n": 4}]
+    (stats,) = m.profile()
+    assert (stats.hits, stats.errors) == (1, 1)
+
+
+def test_profile_is_sorted_by_cost_and_summary_is_serialisable():
+    m = LogEventMatcher(RULES)
+    m.match_batch([b"You loot 2x Gem.", b"An orc hits you for 30 damage"] * 50)
+    prof = m.profile()
+    assert [s.cost_ns for s in prof] == sorted((s.cost_ns for s in prof), reverse=True)
+    assert prof[0].cost_ns > 0 and prof[0].mean_ns > 0
+    summary = m.summary()
+    assert summary["lines"] == 100
+    assert summary["rules"]["loot"]["hits"] == 50
+
+
+@pytest.mark.parametrize(
+    "rule, message",
+    [
+        (LogRule("r", r"(?P<a>x)", types={"b": "int"}), "unknown groups"),
+        (LogRule("r", r"(?P<a>x)", types={"a": "complex"}), "unknown type"),
+        (LogRule("r", r"x", literals=("",)), "literal"),
+    ],
+)
+def test_bad_rules_are_rejected_at_compile_time(rule, message):
+    with pytest.raises(ValueError, match=message):
+        LogEventMatcher([rule])
+
+
+def test_duplicate_rule_names_are_rejected():
+    with pytest.raises(ValueError, match="duplicate"):
+        LogEventMatcher([RULES[0], RULES[0]])
+
+
+def test_rules_load_from_toml_and_compose(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text(
+        "[[rule]]\n"
+        'name = "damage_taken"\n'
+        "pattern = '(?P<source>.+) hits you for (?P<amount>\\d+) damage'\n"
+        'literals = [" hits you for "]\n'
+        'types = { amount = "int" }\n',
+        encoding="utf-8",
+    )
+    (rule,) = load_log_rules(path)
+    assert rule == RULES[0]
+
+    assert build_log_matcher(AgentSettings()) is None
+    m = build_log_matcher(AgentSettings(log_rules=str(path)))
+    assert m is not None and m.rules == ["damage_taken"]
+    tail = FakeLogTailPort(["A wolf hits you for 9 damage", "quiet"])
+    (ev,) = m.match_batch(tail.read_batch(), ts=1.0)
+    assert ev.fields == {"source": "A wolf", "amount": 9}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+from adapters.logs_tail import FileTailLogPort
+
+from apps.agent.compose import build_log_tail
+from apps.agent.settings import AgentSettings
+
+
+def _append(path, text: str) -> None:
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+@pytest.fixture(params=["poll", "auto"])
+def watcher(request):
+    return request.param
+
+
+def test_follows_new_lines_only_by_default(tmp_path, watcher):
+    log = tmp_path / "game.log"
+    _append(log, "old line\n")
+    with FileTailLogPort(log, watcher=watcher, poll_interval_s=0.01) as tail:
+        assert tail.read_batch() == []
+        _append(log, "You hit the rat.\r\nThe rat di")
+        assert tail.read_batch() == [b"You hit the rat."]
+        _append(log, "es.\n")
+        assert tail.read_batch(timeout_s=0.5) == [b"The rat dies."]
+
+
+def test_batches_are_capped(tmp_path):
+    log = tmp_path / "game.log"
+    _append(log, "".join(f"line {i}\n" for i in range(25)))
+    tail = FileTailLogPort(log, from_start=True, max_batch_lines=10, read_size=4096)
+    sizes = [len(tail.read_batch()) for _ in range(4)]
+    assert sizes == [10, 10, 5, 0]
+    tail.close()
+
+
+def test_rotation_drains_old_file_then_reads_new(tmp_path):
+    log = tmp_path / "game.log"
+    _append(log, "")
+    tail = FileTailLogPort(log, watcher="poll")
+    _append(log, "a\nb\nunterminated")
+    os.replace(log, tmp_path / "game.log.1")
+    _append(log, "c\n")
+    assert tail.read_batch() == [b"a", b"b", b"unterminated", b"c"]
+    assert tail.rotations == 1
+    tail.close()
+
+
+def test_truncation_restarts_from_zero(tmp_path):
+    log = tmp_path / "game.log"
+    tail = FileTailLogPort(log, watcher="poll")  # file appears later
+    _append(log, "first session line\n")
+    assert tail.read_batch() == [b"first session line"]
+    with open(log, "wb") as f:
+        f.write(b"x\n")
+    assert tail.read_batch() == [b"x"]
+    assert tail.truncations == 1
+    tail.close()
+
+
+def test_offset_persists_across_restarts(tmp_path):
+    log, state = tmp_path / "game.log", tmp_path / "game.offset"
+    _append(log, "one\ntwo\n")
+    with FileTailLogPort(log, offset_path=state, from_start=True) as tail:
+        assert tail.read_batch() == [b"one", b"two"]
+    _append(log, "three\n")
+    with FileTailLogPort(log, offset_path=state) as tail:
+        assert tail.read_batch() == [b"three"]
+
+    os.replace(log, tmp_path / "game.log.1")  # rotated while we were down
+    _append(log, "fresh\n")
+    with FileTailLogPort(log, offset_path=state) as tail:
+        assert tail.read_batch() == [b"fresh"]
+
+
+def test_offset_save_errors_never_lose_the_batch(tmp_path):
+    log = tmp_path / "game.log"
+    _append(log, "one\ntwo\n")
+    state = tmp_path / "missing-dir" / "game.offset"  # can't be written
+    with FileTailLogPort(log, offset_path=state, from_start=True) as tail:
+        assert tail.read_batch() == [b"one", b"two"]
+        assert tail.persist_errors == 1
+        _append(log, "three\n")
+        assert tail.read_batch() == [b"three"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_wakes_without_polling(tmp_path):
+    log = tmp_path / "game.log"
+    _append(log, "")
+    with FileTailLogPort(log, watcher="inotify") as tail:
+        assert tail.watcher == "inotify"
+        t = time.monotonic()
+        assert tail.read_batch(timeout_s=0.05) == []
+        assert time.monotonic() - t >= 0.04
+        _append(log, "ping\n")
+        assert tail.read_batch(timeout_s=1.0) == [b"ping"]
+
+
+def test_build_log_tail(tmp_path):
+    assert build_log_tail(AgentSettings()) is None
+    log = tmp_path / "game.log"
+    _append(log, "x\n")
+    tail = build_log_tail(AgentSettings(log_path=str(log), log_from_start=True))
+    assert tail is not None and tail.read_batch() == [b"x"]
+    tail.close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import heapq
+import random
+from collections import deque
+from typing import NamedTuple
+
+from shared.utils.merge import StreamMerge, merge_by_ts, queue_source
+
+
+class Ev(NamedTuple):
+    ts: float
+    src: str
+    n: int = 0
+
+
+def _stream(src: str, times: list[float]) -> list[Ev]:
+    return [Ev(t, src, i) for i, t in enumerate(times)]
+
+
+def test_matches_stable_heapq_merge():
+    rng = random.Random(3)
+    streams = [
+        _stream(name, sorted(round(rng.uniform(0, 10), 1) for _ in range(200)))
+        for name in ("frames", "logs", "inputs", "telemetry")
+    ]
+    expected = list(heapq.merge(*streams, key=lambda e: e.ts))
+    assert list(merge_by_ts(streams)) == expected
+
+
+def test_pulls_lazily_one_item_ahead_per_stream():
+    pulled: list[str] = []
+
+    def gen(src: str, n: int):
+        for i in range(n):
+            pulled.append(src)
+            yield Ev(float(i), src)
+
+    merge: StreamMerge[Ev] = StreamMerge()
+    merge.add("a", gen("a", 1_000_000))
+    merge.add("b", gen("b", 1_000_000))
+    out = [merge.pull() for _ in range(6)]
+    assert [(e.ts, e.src) for _, e in out] == [
+        (0, "a"),
+        (0, "b"),
+        (1, "a"),
+        (1, "b"),
+        (2, "a"),
+        (2, "b"),
+    ]
+    assert len(pulled) <= 8  # never more than the heads (plus one to see past a tie)
+    assert merge.buffered <= 2
+
+
+def test_bounded_lookahead_reorders_within_the_window():
+    jittery = _stream("logs", [0.0, 0.3, 0.1, 0.5, 0.4, 0.9, 0.7, 1.0])
+    other = _stream("frames", [0.2, 0.6, 0.8])
+    merge: StreamMerge[Ev] = StreamMerge(lookahead=0.25)
+    merge.add("logs", jittery)
+    merge.add("frames", other)
+    out = [e.ts for _, e in merge]
+    assert out == sorted(out)
+    assert merge.late == 0 and merge.done
+
+
+def test_items_later_than_the_window_are_passed_through_and_counted():
+    merge: StreamMerge[Ev] = StreamMerge(lookahead=0.1)
+    merge.add("logs", _stream("logs", [0.0, 1.0, 2.0, 0.5, 3.0]))
+    out = [e.ts for _, e in merge]
+    assert sorted(out) == [0.0, 0.5, 1.0, 2.0, 3.0]
+    assert merge.late == 1
+
+
+def test_live_sources_wait_for_the_slowest_unless_now_covers_it():
+    frames: deque[Ev] = deque()
+    logs: deque[Ev] = deque()
+    merge: StreamMerge[Ev] = StreamMerge()
+    merge.add("frames", queue_source(frames))
+    merge.add("logs", queue_source(logs))
+
+    frames.extend(_stream("frames", [1.0, 2.0]))
+    assert list(merge.drain()) == []  # logs might still deliver something at t < 1
+    logs.append(Ev(1.5, "logs"))
+    assert [e.ts for _, e in merge.drain()] == [1.0, 1.5]  # 2.0 waits for logs to pass it
+    assert [e.ts for _, e in merge.drain(now=3.0)] == [2.0]  # both complete up to t=3
+    logs.append(Ev(2.5, "logs"))
+    assert [(n, e.ts) for n, e in merge.drain(now=3.0)] == [("logs", 2.5)]
+    assert merge.late == 0 and not merge.done
+
+
+def test_live_lookahead_holds_items_until_now_passes_the_window():
+    logs: deque[Ev] = deque()
+    merge: StreamMerge[Ev] = StreamMerge(lookahead=0.5)
+    merge.add("logs", queue_source(logs))
+    logs.extend(_stream("logs", [1.0, 1.2]))
+    assert [e.ts for _, e in merge.drain(now=1.6)] == [1.0]
+    logs.append(Ev(1.1, "logs"))  # late arrival, still inside the window
+    assert [e.ts for _, e in merge.drain(now=2.0)] == [1.1, 1.2]
+    assert merge.late == 0
+
+
+def test_max_buffered_caps_a_stream_that_never_catches_up():
+    merge: StreamMerge[Ev] = StreamMerge(lookahead=1e9, max_buffered=3)
+    merge.add("logs", _stream("logs", [float(i) for i in range(10)]))
+    merge.pull()
+    assert merge.buffered <= 3
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+from adapters.win_input import FakeKeyboardMousePort
+from domain.input import MousePath, MousePathGenerator, PathPoint
+
+
+def test_path_starts_and_ends_on_target_with_monotonic_time():
+    gen = MousePathGenerator(seed=1)
+    for kind in ("bezier", "min_jerk"):
+        p = gen.path((100, 200), (900, 650), kind=kind)
+        assert p.start == (100, 200) and p.end == (900, 650)
+        assert np.all(np.diff(p.t_ms) >= 0) and p.t_ms[0] == 0
+        assert p.duration_ms == round(gen.movement_ms(math.hypot(800, 450)))
+
+
+def test_velocity_is_bell_shaped():
+    gen = MousePathGenerator(seed=2, noise_px=0.0, step_ms=5)
+    p = gen.path((0, 0), (1000, 0), duration_ms=500)
+    speed = np.hypot(*np.diff(p.xy.astype(float), axis=0).T)
+    n = len(speed)
+    assert speed[n // 2] > 4 * speed[:3].mean() and speed[n // 2] > 4 * speed[-3:].mean()
+
+
+def test_shapes_are_cached_and_reused_across_endpoints():
+    gen = MousePathGenerator(seed=3, variants=4, max_shapes=2)
+    a = gen.path((0, 0), (300, 0), duration_ms=200)
+    b = gen.path((50, 50), (50, 400), duration_ms=200)  # rotated 90 degrees, same shapes
+    assert gen.stats() == {"shapes": 1, "hits": 1, "misses": 1}
+    assert len(a) == len(b) == 26
+    gen.path((0, 0), (1, 1), duration_ms=100)
+    gen.path((0, 0), (1, 1), duration_ms=300)
+    assert gen.stats()["shapes"] == 2  # LRU bound
+
+
+def test_rotation_keeps_the_shape():
+    gen = MousePathGenerator(seed=4, variants=1, noise_px=0.0)
+    a = gen.path((0, 0), (400, 0), duration_ms=160).xy.astype(float)
+    b = gen.path((0, 0), (0, 400), duration_ms=160).xy.astype(float)
+    # (x, y) rotated by +90 degrees is (-y, x)
+    assert np.abs(np.stack([-a[:, 1], a[:, 0]], axis=1) - b).max() <= 1.0
+
+
+def test_mouse_path_is_a_compact_sequence():
+    p = MousePath(np.array([[1, 2], [3, 4], [5, 6]]), np.array([0, 8, 16]))
+    assert len(p) == 3 and p[1] == PathPoint(3, 4, 8)
+    assert list(p) == [PathPoint(1, 2, 0), PathPoint(3, 4, 8), PathPoint(5, 6, 16)]
+    assert isinstance(p[1:], MousePath) and p[1:].start == (3, 4)
+    assert p.xy.dtype == np.int32
+    with pytest.raises(ValueError):
+        MousePath(np.zeros((3, 2)), np.zeros(2))
+
+
+def test_port_accepts_generated_paths():
+    port = FakeKeyboardMousePort()
+    p = MousePathGenerator(seed=5).path((10, 10), (200, 120))
+    port.mouse_path(p)
+    rec = port.paths[0].path
+    assert rec[0] == (10, 10, 0) and rec[-1] == (200, 120, p.duration_ms) and len(rec) == len(p)
+
+
+def test_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        MousePathGenerator(kind="spline")  # type: ignore[arg-type]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from adapters.telemetry import FakeMetricsPort, FakeTelemetryPort
+from adapters.time import VirtualClockPort, VirtualSleeperPort
+from domain.agent import AgentService
+from domain.policies import (
+    Action,
+    BehaviorTree,
+    Condition,
+    MemoizedPolicy,
+    Selector,
+    Sequence,
+    Status,
+    bucket,
+    thresholds,
+)
+
+
+def _tree(calls: list[int]) -> BehaviorTree:
+    def low(bb):
+        calls.append(bb["hp"])
+        return bb["hp"] is not None and bb["hp"] < 30
+
+    return BehaviorTree(
+        Selector(
+            "root",
+            (
+                Sequence("heal", (Condition("low", ("hp",), low), Action("potion"))),
+                Action("attack", ("target",), lambda bb: bool(bb.get("target"))),
+                Action("idle"),
+            ),
+        )
+    )
+
+
+def test_quantizers():
+    q = bucket(10)
+    assert (q(0), q(9.9), q(10), q(None)) == (0, 0, 1, None)
+    t = thresholds(30, 70)
+    assert [t(v) for v in (5, 30, 69, 70, 100)] == [0, 1, 1, 2, 2]
+
+
+def test_observations_in_the_same_bucket_hit_the_cache():
+    calls: list[int] = []
+    clock = VirtualClockPort()
+    memo = MemoizedPolicy(
+        _tree(calls), {"hp": bucket(10), "target": None}, clock, max_entries=16, ttl_s=60
+    )
+    for hp in (81, 83, 88, 84):
+        assert memo.tick({"hp": hp, "target": "rat"}).actions == ("attack",)
+    assert calls == [81]
+    assert (memo.hits, memo.misses) == (3, 1)
+    assert memo.tick({"hp": 12, "target": "rat"}).actions == ("potion",)
+    assert memo.tick({"hp": 85, "target": "rat"}).actions == ("attack",)  # still cached
+    assert memo.stats()["entries"] == 2 and memo.hit_rate == 4 / 6
+
+
+def test_entries_expire_after_ttl_and_lru_evicts():
+    calls: list[int] = []
+    clock = VirtualClockPort()
+    memo = MemoizedPolicy(_tree(calls), {"hp": bucket(10)}, clock, max_entries=2, ttl_s=1.0)
+    memo.tick({"hp": 50, "target": None})
+    clock.advance(1.5)
+    memo.tick({"hp": 50, "target": None})
+    assert memo.expirations == 1 and memo.misses == 2
+    memo.tick({"hp": 60, "target": None})
+    memo.tick({"hp": 70, "target": None})
+    assert memo.evictions == 1 and memo.stats()["entries"] == 2
+
+
+def test_running_decisions_are_not_cached():
+    ticks = {"n": 0}
+
+    def channel(bb):
+        ticks["n"] += 1
+        return Status.RUNNING
+
+    memo = MemoizedPolicy(
+        BehaviorTree(Action("channel", ("x",), channel)), {"x": None}, VirtualClockPort()
+    )
+    for _ in range(3):
+        assert memo.tick({"x": 1}).status == Status.RUNNING
+    assert ticks["n"] == 3 and memo.hits == 0
+
+
+def test_changes_seen_during_hits_reach_the_policy_on_the_next_miss():
+    calls: list[int] = []
+    tree = _tree(calls)
+    memo = MemoizedPolicy(tree, {"hp": bucket(50), "target": None}, VirtualClockPort())
+    bb = {"hp": 10, "target": None}
+    assert memo.tick(bb, ["hp", "target"]).actions == ("potion",)
+    bb["hp"] = 20  # same bucket: cache hit, tree not ticked
+    assert memo.tick(bb, ["hp"]).actions == ("potion",)
+    bb["hp"] = 90
+    assert memo.tick(bb, ["hp"]).actions == ("idle",)
+    assert calls == [10, 90]
+    bb["hp"] = 20  # bucket 0 again: served from cache, though the tree's hp moved on
+    assert memo.tick(bb, ["hp"]).actions == ("potion",)
+
+
+def test_export_and_agent_service_integration():
+    clock = VirtualClockPort()
+    calls: list[int] = []
+    memo = MemoizedPolicy(_tree(calls), {"hp": bucket(10), "target": None}, clock, ttl_s=60)
+    svc = AgentService(clock, VirtualSleeperPort(clock), FakeTelemetryPort(), "vm1", policy=memo)
+    svc.run_for(1.0)
+    assert svc.decision is not None and svc.decision.actions == ("idle",)
+    assert memo.misses == 1 and memo.hits == 4
+    metrics = FakeMetricsPort()
+    memo.export(metrics, agent_id="vm1")
+    assert ("policy_memo_hits", 4.0, {"agent_id": "vm1"}) in metrics.samples
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from shared.utils.everrec import LOGS_FILE, META_NAME, EverrecWriter, frame_chunk_name
+from shared.utils.replay import INDEX_NAME, ReplayReader
+
+from apps.tools.record_replay.main import main as replay_main
+
+
+def _frame(i: int) -> np.ndarray:
+    return np.full((6, 10, 4), i, dtype=np.uint8)
+
+
+def _record(path, frames="raw"):
+    with EverrecWriter(path, frames=frames, chunk_bytes=3 * _frame(0).nbytes) as rec:
+        for i in range(20):
+            ts = float(i)
+            rec.frame(ts, _frame(i))
+            rec.telemetry(ts + 0.5, "heartbeat", {"n": i})
+            if i % 5 == 0:
+                rec.log(ts + 0.25, f"line {i}")
+    return path
+
+
+def test_window_merges_streams_in_order(tmp_path):
+    with ReplayReader(_record(tmp_path / "a.everrec")) as r:
+        assert r.streams == ["frames", "logs", "telemetry"]
+        assert (r.count("frames"), r.count("logs"), r.count("telemetry")) == (20, 4, 20)
+        got = [(x.ts, x.stream) for x in r.window(5.0, 6.0)]
+        assert got == [(5.0, "frames"), (5.25, "logs"), (5.5, "telemetry")]
+        assert [x.ts for x in r.window(0.0, 2.0, streams=["telemetry"])] == [0.5, 1.5]
+        assert (r.t0, r.t1) == (0.0, 19.5)
+
+
+def test_seek_and_frames_are_mapped(tmp_path):
+    with ReplayReader(_record(tmp_path / "b.everrec")) as r:
+        first = next(iter(r.seek(17.6)))
+        assert (first.ts, first.stream) == (18.0, "frames")
+        img = first.data["image"]
+        assert isinstance(img, np.ndarray) and not img.flags.writeable
+        assert np.array_equal(img, _frame(18))
+        assert [x.ts for x in r] == [18.0, 18.5, 19.0, 19.5]
+        hit = r.frame_at(7.9)
+        assert hit is not None and np.array_equal(hit.data["image"], _frame(7))
+        assert r.frame_at(-1.0) is None
+
+
+def test_hash_mode_has_no_pixels(tmp_path):
+    with ReplayReader(_record(tmp_path / "c.everrec", frames="hash")) as r:
+        rec = r.get("frames", 3)
+        assert rec.data["image"] is None and len(rec.data["hash"]) == 32
+
+
+def test_index_is_cached_and_invalidated(tmp_path):
+    path = _record(tmp_path / "d.everrec")
+    ReplayReader(path).close()
+    assert (path / INDEX_NAME).is_file()
+    with ReplayReader(path) as r:
+        assert r.count("logs") == 4
+    with open(path / LOGS_FILE, "ab") as f:
+        f.write(b'{"ts":2.75,"line":"late"}\n{"ts":99,')  # appended + torn tail
+    with ReplayReader(path) as r:
+        assert r.count("logs") == 5
+        assert [x.data["line"] for x in r.window(2.0, 3.0, ["logs"])] == ["late"]
+
+
+def test_rejects_non_bundle(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ReplayReader(tmp_path)
+
+
+def test_replay_cli_dumps_window(tmp_path, capsys):
+    path = _record(tmp_path / "e.everrec")
+    assert replay_main([str(path), "--dump", "--t0", "3", "--t1", "4"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(x)["stream"] for x in lines] == ["frames", "telemetry"]
+    assert replay_main([str(tmp_path)]) == 2
+
+
+def test_frame_at_looks_up_rois_in_the_index(tmp_path, monkeypatch):
+    path = tmp_path / "f.everrec"
+    with EverrecWriter(path) as rec:
+        for i in range(50):
+            rec.frame(float(i), _frame(i)[:2, :2], roi=(1, 2, 2, 2))
+        rec.frame(10.0, _frame(99))
+    for _ in range(2):  # fresh index, then the cached one
+        with ReplayReader(path) as r:
+            monkeypatch.setattr(type(r._streams["frames"]), "line", _count_lines(r))
+            hit = r.frame_at(30.5, roi=[1, 2, 2, 2])
+            assert hit is not None and hit.ts == 30.0 and hit.data["roi"] == [1, 2, 2, 2]
+            assert r.frame_at(5.0) is None and r.frame_at(49.0, roi=(0, 0, 1, 1)) is None
+            full = r.frame_at(49.0)
+            assert full is not None and np.array_equal(full.data["image"], _frame(99))
+            assert r.decoded == 2  # only the two hits were parsed
+
+
+def _count_lines(r):
+    line = type(r._streams["frames"]).line
+    r.decoded = 0
+
+    def counted(self, i):
+        r.decoded += 1
+        return line(self, i)
+
+    return counted
+
+
+def test_incomplete_recording_is_recovered(tmp_path, capsys):
+    path = _record(tmp_path / "g.everrec")
+    (path / META_NAME).unlink()  # cut off before the writer got to meta.json
+    with open(path / frame_chunk_name(6), "r+b") as f:
+        f.truncate(_frame(0).nbytes // 2)  # frame 18's pixels never hit the disk
+    with ReplayReader(path) as r:
+        assert not r.complete and r.meta["frames_mode"] == "raw"
+        assert (r.count("frames"), r.count("logs")) == (20, 4)
+        assert np.array_equal(r.get("frames", 17).data["image"], _frame(17))
+        assert r.get("frames", 18).data["image"] is None
+    assert replay_main([str(path)]) == 0
+    assert "incomplete recording" in capsys.readouterr().out
+    with ReplayReader(_record(tmp_path / "h.everrec")) as r:
+        assert r.complete
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from shared.utils.everrec import EverrecWriter
+
+from apps.tools.replay_runner.main import main as replay_run_main
+from apps.tools.replay_runner.runner import (
+    TIMINGS_NAME,
+    discover,
+    estimate_costs,
+    run_replays,
+    shard,
+)
+
+
+def _clip(path: Path, frames: int, hp: int = 80) -> Path:
+    with EverrecWriter(path) as rec:
+        for i in range(frames):
+            rec.frame(float(i), np.zeros((4, 4, 4), dtype=np.uint8))
+            rec.telemetry(float(i), "heartbeat", {"hp": hp})
+    return path
+
+
+def check_hp_above_50(reader, clock) -> None:
+    # Step the virtual clock through the clip like a live agent would.
+    for rec in reader.window(clock.now(), streams=["telemetry"]):
+        clock.advance_to(rec.ts)
+        assert rec.data["hp"] > 50, f"hp {rec.data['hp']} at t={clock.now()}"
+
+
+def test_shard_balances_by_cost():
+    costs = {Path(n): c for n, c in [("a", 8.0), ("b", 7.0), ("c", 6.0), ("d", 5.0), ("e", 4.0)]}
+    shards = shard(costs, 2)
+    loads = sorted(sum(costs[c] for c in s) for s in shards)
+    assert loads == [13.0, 17.0]  # LPT: within 4/3 of optimal
+    assert len(shard(costs, 16)) == 5
+
+
+def test_costs_prefer_previous_timings(tmp_path):
+    a = _clip(tmp_path / "a.everrec", 10)
+    b = _clip(tmp_path / "b.everrec", 10)
+    size = sum(p.stat().st_size for p in a.rglob("*") if p.is_file())
+    costs = estimate_costs([a, b], {"a.everrec": {"seconds": 2.0, "bytes": size}}, tmp_path)
+    assert costs[a] == 2.0
+    assert costs[b] == pytest.approx(2.0)  # unseen clip: same size x measured rate
+
+
+def test_run_merges_results_across_workers(tmp_path):
+    for i in range(4):
+        _clip(tmp_path / f"ok{i}.everrec", 5 + i)
+    _clip(tmp_path / "nested" / "low.everrec", 5, hp=30)
+    assert len(discover([tmp_path])) == 5
+
+    report = run_replays([tmp_path], check_hp_above_50, workers=2)
+    assert report.shards == 2 and len(report.results) == 5
+    assert not report.ok
+    (bad,) = report.failed
+    assert bad.clip.endswith("low.everrec") and "hp 30 at t=0.0" in (bad.error or "")
+    assert "4/5 clips passed" in report.summary()
+
+    timings = json.loads((tmp_path / TIMINGS_NAME).read_text("utf-8"))
+    assert set(timings) == {
+        "ok0.everrec",
+        "ok1.everrec",
+        "ok2.everrec",
+        "ok3.everrec",
+        "nested/low.everrec",
+    }
+
+
+def test_cli_exit_code_reflects_failures(tmp_path, capsys):
+    _clip(tmp_path / "a.everrec", 3)
+    check = f"{__name__}:check_hp_above_50"
+    assert replay_run_main([str(tmp_path), "--check", check, "--workers", "1"]) == 0
+    assert "1/1 clips passed" in capsys.readouterr().out
+    assert replay_run_main([str(tmp_path), "--check", "nope"]) == 2
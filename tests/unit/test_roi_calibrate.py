@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from adapters.vision_numpy import NumpyBarReader
+from shared.config.loader import load_roi_profile
+
+from apps.tools.roi_calibrate.main import dump_toml, main, scale_profile
+
+ANCHOR_AT = (37, 181)  # (x, y) of the HUD anchor in the recorded frames
+RED = (196, 36, 36)
+
+
+def _frames(n: int = 3) -> tuple[list[np.ndarray], np.ndarray]:
+    rng = np.random.default_rng(7)
+    hud = (rng.random((24, 40, 3)) * 255).astype(np.uint8)
+    out = []
+    for _ in range(n):
+        f = (rng.random((240, 320, 3)) * 60).astype(np.uint8)
+        x, y = ANCHOR_AT
+        f[y : y + 24, x : x + 40] = hud
+        f[y + 30 : y + 36, x : x + 60] = RED  # full HP bar under the HUD
+        out.append(f)
+    return out, hud
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    frames, hud = _frames()
+    fdir = tmp_path / "frames"
+    fdir.mkdir()
+    for i, f in enumerate(frames):
+        np.save(fdir / f"{i:04d}.npy", f)
+    np.save(tmp_path / "hud.npy", hud)
+    (tmp_path / "spec.toml").write_text(
+        """
+        [anchors.hud]
+        template = "hud.npy"
+        threshold = 0.9
+
+        [rois.bars.hp]
+        anchor = "hud"
+        offset = [0, 30, 60, 6]
+        color = [196, 36, 36]
+        tolerance = 40
+        rate_hz = 20.0
+        """,
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def test_calibrates_and_writes_scaled_profiles(recorded, capsys):
+    out = recorded / "rois"
+    rc = main(
+        [
+            "--frames",
+            str(recorded / "frames"),
+            "--spec",
+            str(recorded / "spec.toml"),
+            "--out",
+            str(out),
+            "--targets",
+            "640x480,160x120",
+        ]
+    )
+    assert rc == 0
+    env = {"EVQ_ROIS_DIR": str(out)}
+
+    base = load_roi_profile("320x240", env=env)
+    assert base["resolution"] == [320, 240]
+    assert base["anchors"]["hud"]["roi"] == [37, 181, 40, 24]
+    assert base["bars"]["hp"]["roi"] == [37, 211, 60, 6]
+    assert base["bars"]["hp"]["rate_hz"] == 20.0
+
+    big = load_roi_profile("640x480", env=env)
+    assert big["scaled_from"] == "320x240"
+    assert big["bars"]["hp"]["roi"] == [74, 422, 120, 12]
+    assert load_roi_profile("160x120", env=env)["bars"]["hp"]["roi"][2:] == [30, 3]
+
+    # The written profile plugs straight into the bar reader.
+    reader = NumpyBarReader.from_profile(base)
+    assert reader.read(_frames(1)[0][0])["hp"] == pytest.approx(1.0)
+
+
+def test_missing_anchor_fails_cleanly(recorded, capsys):
+    np.save(recorded / "hud.npy", np.eye(24, 40, dtype=np.uint8) * 255)
+    args = ["--frames", str(recorded / "frames"), "--spec", str(recorded / "spec.toml")]
+    assert main([*args, "--out", str(recorded / "rois")]) == 2
+    assert "hud" in capsys.readouterr().err
+
+
+def test_scale_and_dump_roundtrip():
+    import tomllib
+
+    prof = {"resolution": [100, 50], "bars": {"hp": {"roi": [10, 10, 20, 4], "direction": "ltr"}}}
+    scaled = scale_profile(prof, 200, 100)
+    assert tomllib.loads(dump_toml(scaled)) == {
+        "resolution": [200, 100],
+        "scaled_from": "100x50",
+        "bars": {"hp": {"roi": [20, 20, 40, 8], "direction": "ltr"}},
+    }
+
+
+def test_existing_profiles_are_kept_without_force(recorded, capsys):
+    out = recorded / "rois"
+    out.mkdir()
+    tuned = out / "320x240.toml"
+    tuned.write_text("# hand-tuned\n", encoding="utf-8")
+    args = ["--frames", str(recorded / "frames"), "--spec", str(recorded / "spec.toml")]
+    assert main([*args, "--out", str(out), "--targets", "640x480"]) == 2
+    assert "--force" in capsys.readouterr().err
+    assert tuned.read_text("utf-8") == "# hand-tuned\n" and not (out / "640x480.toml").exists()
+    assert main([*args, "--out", str(out), "--force"]) == 0
+    assert "roi_calibrate" in tuned.read_text("utf-8")
+
+
+def test_dump_quotes_keys_that_are_not_bare():
+    import tomllib
+
+    data = {"bars": {"hp bar": {"roi": [1, 2, 3, 4], 'x.y"z': 1}}, "über": True}
+    assert tomllib.loads(dump_toml(data)) == data
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+from adapters.telemetry import FakeTelemetryPort
+from adapters.time import FakeClockPort, FakeSleeperPort
+from domain.agent import AgentService
+from domain.policies import BehaviorTree, Condition
+from domain.state import HamtMap, StateStore
+
+
+class _Collide:
+    """Distinct keys with one hash, to exercise collision buckets."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __hash__(self) -> int:
+        return 42
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Collide) and other.name == self.name
+
+
+def test_hamt_behaves_like_a_dict_under_random_edits():
+    rng = random.Random(7)
+    ref: dict[object, int] = {}
+    m = HamtMap()
+    for step in range(5000):
+        k = rng.randrange(600)
+        if rng.random() < 0.3:
+            ref.pop(k, None)
+            m = m.delete(k)
+        else:
+            ref[k] = step
+            m = m.set(k, step)
+    assert len(m) == len(ref)
+    assert dict(m.items()) == ref
+    assert all(m[k] == v for k, v in ref.items())
+    assert 10_000 not in m
+
+
+def test_hamt_collisions_and_deep_paths():
+    a, b, c = _Collide("a"), _Collide("b"), _Collide("c")
+    m = HamtMap().set(a, 1).set(b, 2).set(c, 3)
+    assert (m[a], m[b], m[c], len(m)) == (1, 2, 3, 3)
+    m2 = m.delete(b)
+    assert b not in m2 and m2[a] == 1 and m2[c] == 3 and len(m2) == 2
+    assert m2.delete(a).delete(c) == {}
+    assert b in m  # the old version is untouched
+
+
+def test_hamt_updates_share_structure_and_no_op_writes_return_self():
+    m = HamtMap({f"k{i}": i for i in range(10_000)})
+    assert m.set("k5", 5) is m
+    assert m.delete("absent") is m
+    m2 = m.set("k5", -5)
+    shared = sum(x is y for x, y in zip(m._root.entries, m2._root.entries, strict=True))
+    assert shared == len(m._root.entries) - 1  # only the path to k5 was copied
+    assert m["k5"] == 5 and m2["k5"] == -5
+
+
+def test_hamt_diff_reports_changes_and_removals():
+    m = HamtMap({f"k{i}": i for i in range(1000)})
+    m2 = m.set("k1", "one").delete("k2").set("new", 0).set("k3", 3)
+    changed, removed = m.diff(m2)
+    assert changed == {"k1": "one", "new": 0}
+    assert removed == {"k2"}
+    assert m2.diff(m2) == ({}, frozenset())
+
+
+def test_store_versions_are_monotonic_and_skip_no_op_writes():
+    store = StateStore()
+    assert store.version == 0
+    v1 = store.update(hp=50, mana=20)
+    assert v1 == 1
+    assert store.set("hp", 50) == 1  # same value: no new version
+    assert store.set("hp", 40) == 2
+    assert store.delete("mana", "absent") == 3
+    assert store.delete("mana") == 3
+    assert dict(store.snapshot()) == {"hp": 40}
+
+
+def test_snapshots_are_immutable_views():
+    store = StateStore({"hp": 100})
+    snap = store.snapshot()
+    store.set("hp", 10)
+    assert snap["hp"] == 100 and snap.version == 1
+    assert store.snapshot()["hp"] == 10
+    assert store.at(1)["hp"] == 100
+
+
+def test_diff_since_a_version_only_names_changed_keys():
+    store = StateStore({f"k{i}": i for i in range(5000)})
+    seen = store.version
+    store.update(k1=-1, k2=-2)
+    store.set("k1", 1)  # back to the original value
+    store.delete("k3")
+    d = store.diff(seen)
+    assert d.changed == {"k2": -2}
+    assert d.removed == {"k3"}
+    assert d.keys == {"k2", "k3"} and not d.full
+    assert not store.diff(store.version)
+
+
+def test_diff_beyond_history_is_full():
+    store = StateStore(history=3)
+    for i in range(10):
+        store.set("n", i)
+    store.set("other", 1)
+    d = store.diff(1)
+    assert d.full and d.changed == {"n": 9, "other": 1}
+    with pytest.raises(KeyError):
+        store.at(1)
+
+
+def test_array_values_compare_by_identity_not_truthiness():
+    store = StateStore()
+    arr = np.zeros(3)
+    store.set("mask", arr)
+    v = store.version
+    assert store.set("mask", arr) == v
+    assert store.set("mask", np.zeros(3)) == v + 1  # can't be compared plainly: changed
+
+
+def test_agent_service_feeds_policy_only_changed_keys():
+    calls: list[str] = []
+
+    def check(name, key):
+        def fn(bb):
+            calls.append(name)
+            return bb.get(key) == "ASSIST"
+
+        return Condition(name, (key,), fn)
+
+    tree = BehaviorTree(check("is_assist", "state"))
+    svc = AgentService(
+        FakeClockPort(), FakeSleeperPort(), FakeTelemetryPort(), agent_id="vm1", policy=tree
+    )
+    svc.tick()
+    svc.tick()
+    assert calls == ["is_assist"]  # second tick: nothing changed, cached
+    svc.state.set("state", "ACTIVE")
+    svc.ctx.state = "ACTIVE"
+    svc.tick()
+    assert calls == ["is_assist", "is_assist"]
+    assert svc.blackboard["state"] == "ACTIVE"
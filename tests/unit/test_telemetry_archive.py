@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+import numpy as np
+from shared.telemetry import TelemetryArchive
+from shared.telemetry.archive import INDEX_NAME
+
+from apps.coordinator.compose import build_archive
+from apps.coordinator.settings import CoordinatorSettings
+from apps.tools.telemetry_query.main import main as query_main
+
+
+def _fill(archive: TelemetryArchive, n: int = 100) -> None:
+    for i in range(n):
+        agent = "vm1" if i % 2 == 0 else "vm2"
+        archive.append(
+            "heartbeat", {"agent_id": agent, "ok": True, "hp": i, "hold": False}, ts=1000.0 + i
+        )
+        if i % 10 == 0:
+            archive.append(
+                "vision", {"agent_id": agent, "tasks": {"hp": {"runs": i}}}, ts=1000.0 + i
+            )
+
+
+def test_segments_rotate_by_rows_and_age(tmp_path):
+    with TelemetryArchive(tmp_path, segment_rows=30, segment_s=1e9) as a:
+        _fill(a)
+    segs = a.segments()
+    assert len(segs) == 4  # 110 rows / 30
+    assert [s["seq"] for s in segs] == [1, 2, 3, 4]
+    assert segs[0]["topics"]["heartbeat"]["fields"] == {"ok": "bool", "hp": "int", "hold": "bool"}
+
+    b = TelemetryArchive(tmp_path / "age", segment_s=10.0)
+    for i in range(25):
+        b.append("heartbeat", {"n": i}, ts=float(i))
+    b.close()
+    assert [(s["t0"], s["t1"]) for s in b.segments()] == [(0.0, 10.0), (11.0, 21.0), (22.0, 24.0)]
+
+
+def test_query_reads_only_overlapping_segments(tmp_path):
+    with TelemetryArchive(tmp_path, segment_rows=30) as a:
+        _fill(a)
+    r = a.query("heartbeat", agent_id="vm1", t0=1040.0, t1=1050.0, fields=["hp"])
+    assert r.segments_read == 1
+    assert list(r.columns) == ["ts", "agent_id", "hp"]
+    assert r.columns["hp"].tolist() == [40, 42, 44, 46, 48]
+    assert set(r.columns["agent_id"].tolist()) == {"vm1"}
+
+    everything = a.query("heartbeat")
+    assert len(everything) == 100 and np.all(np.diff(everything.columns["ts"]) > 0)
+    nested = a.query("vision", agent_id="vm2")
+    assert [row["tasks"]["hp"]["runs"] for row in nested.rows()] == []  # vision only on even i
+    assert next(a.query("vision").rows())["tasks"] == {"hp": {"runs": 0}}
+
+
+def test_missing_fields_are_masked_and_types_can_drift(tmp_path):
+    with TelemetryArchive(tmp_path, segment_rows=2) as a:
+        a.append("state", {"state": "RUN"}, ts=1.0)
+        a.append("state", {"state": "HOLD", "reason": "human"}, ts=2.0)
+        a.append("state", {"state": 3}, ts=3.0)  # drifted type in a later segment
+    rows = list(a.query("state").rows())
+    assert [r["reason"] for r in rows] == [None, "human", None]
+    assert [r["state"] for r in rows] == ["RUN", "HOLD", 3]
+
+
+def test_payload_ts_and_torn_index_tail(tmp_path):
+    a = TelemetryArchive(tmp_path)
+    a.record({"topic": "heartbeat", "data": {"agent_id": "vm1", "ts": 5.5, "ok": True}})
+    a.flush()
+    with open(tmp_path / INDEX_NAME, "ab") as f:
+        f.write(b'{"segment":"seg-0000')
+    assert a.query("heartbeat").columns["ts"].tolist() == [5.5]
+    assert a.query("nope").columns["ts"].size == 0
+    assert len(a.query("heartbeat", t0=6.0)) == 0
+
+
+def test_build_archive_and_query_cli(tmp_path, capsys):
+    assert build_archive(CoordinatorSettings()) is None
+    a = build_archive(CoordinatorSettings(archive_segment_rows=50), str(tmp_path))
+    assert a is not None and a.segment_rows == 50
+    _fill(a, 20)
+    a.close()
+
+    assert (
+        query_main(
+            [
+                str(tmp_path),
+                "--topic",
+                "heartbeat",
+                "--agent",
+                "vm2",
+                "--t1",
+                "1004",
+                "--fields",
+                "hp",
+            ]
+        )
+        == 0
+    )
+    out = capsys.readouterr().out.splitlines()
+    assert [json.loads(x) for x in out] == [
+        {"ts": 1001.0, "agent_id": "vm2", "hp": 1},
+        {"ts": 1003.0, "agent_id": "vm2", "hp": 3},
+    ]
+    assert query_main([str(tmp_path)]) == 0
+    assert "seg-000001" in capsys.readouterr().out
+    assert query_main([str(tmp_path / "missing")]) == 2
+
+
+def test_record_stamps_rows_with_the_envelope_ts(tmp_path):
+    a = TelemetryArchive(tmp_path)
+    envelope = {"ts": "2026-01-02T03:04:05.500000Z", "topic": "state", "data": {}}
+    a.record({"topic": "state", "data": {"agent_id": "vm1"}, "envelope": envelope})
+    a.record({"topic": "state", "data": {"agent_id": "vm2"}, "envelope": {"ts": 12.5}})
+    a.flush()
+    want = datetime(2026, 1, 2, 3, 4, 5, 500000, tzinfo=UTC).timestamp()
+    assert a.query("state").columns["ts"].tolist() == [12.5, want]
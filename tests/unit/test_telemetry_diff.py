@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+
+from shared.utils.everrec import EverrecWriter
+from shared.utils.telemetry_diff import TelemetryDiff, diff_telemetry
+
+from apps.tools.record_replay.main import main as replay_main
+
+
+def _hb(ts: float, hp: float | None = 80.0, agent: str = "vm1", **kw) -> dict:
+    return {"ts": ts, "topic": "heartbeat", "agent_id": agent, "hp": hp, "ok": True, **kw}
+
+
+def test_identical_streams_with_clock_jitter_match():
+    expected = [_hb(i * 0.2) for i in range(50)]
+    produced = [_hb(i * 0.2 + 0.0004) for i in range(50)]
+    report = diff_telemetry(expected, produced, ts_tol=1e-3)
+    assert report.ok and report.matched == 50
+    assert "50 matched" in report.summary()
+
+
+def test_first_divergence_and_field_stats():
+    expected = [_hb(float(i), hp=float(i)) for i in range(20)]
+    produced = [_hb(float(i), hp=float(i) + (0.5 if i >= 12 else 0.0)) for i in range(20)]
+    produced[15]["ok"] = False
+    report = TelemetryDiff(atol=0.1, batch=4).run(expected, produced)
+    assert not report.ok
+    assert report.first is not None
+    assert (report.first.ts, report.first.field) == (12.0, "hp")
+    assert (report.first.expected, report.first.produced) == (12.0, 12.5)
+    assert report.field_mismatches == {"hp": 8, "ok": 1}
+    assert report.mismatched_rows == 8
+    assert report.max_abs_error["hp"] == 0.5
+
+
+def test_missing_extra_and_keys():
+    expected = [_hb(0.0), _hb(1.0), _hb(2.0), _hb(1.0, agent="vm2")]
+    expected.sort(key=lambda r: r["ts"])
+    produced = [_hb(0.0), _hb(2.0), _hb(3.0), _hb(1.0005, agent="vm2")]
+    produced.sort(key=lambda r: r["ts"])
+    report = diff_telemetry(expected, produced)
+    assert (report.matched, report.missing, report.extra) == (3, 1, 1)
+    assert report.first is not None and (report.first.kind, report.first.ts) == ("missing", 1.0)
+    assert report.first.key == ("heartbeat", "vm1")
+
+
+def test_none_nan_and_non_numeric_fields():
+    e = [_hb(0.0, hp=None, state="RUN"), _hb(1.0, hp=float("nan"), state="RUN")]
+    p = [_hb(0.0, hp=None, state="RUN"), _hb(1.0, hp=float("nan"), state="HOLD")]
+    report = diff_telemetry(e, p)
+    assert report.field_mismatches == {"state": 1}
+
+
+def test_streams_in_constant_memory():
+    n = 200_000
+
+    def gen(offset: float):
+        for i in range(n):
+            yield {"ts": i * 0.01 + offset, "topic": "heartbeat", "hp": i % 100}
+
+    tracemalloc.start()
+    report = diff_telemetry(gen(0.0), gen(0.0001), batch=1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert report.ok and report.matched == n
+    assert peak < 8 * 1024 * 1024
+
+
+def test_one_sided_keys_expire_in_constant_memory():
+    n = 50_000
+
+    def expected():
+        for i in range(n):
+            yield _hb(i * 0.01)
+            yield {"ts": i * 0.01 + 0.005, "topic": "vision", "agent_id": "vm1", "fps": 30}
+
+    def produced():
+        for i in range(n):
+            yield _hb(i * 0.01 + 0.0001)  # never publishes "vision"
+
+    tracemalloc.start()
+    report = diff_telemetry(expected(), produced(), batch=1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert (report.matched, report.missing, report.extra) == (n, n, 0)
+    assert report.first is not None and report.first.key == ("vision", "vm1")
+    assert peak < 2 * 1024 * 1024
+
+
+def test_replay_cli_diff(tmp_path, capsys):
+    bundle = tmp_path / "a.everrec"
+    with EverrecWriter(bundle) as rec:
+        for i in range(5):
+            rec.telemetry(float(i), "heartbeat", {"agent_id": "vm1", "hp": 80})
+    produced = tmp_path / "produced.jsonl"
+    rows = [{"ts": float(i), "topic": "heartbeat", "agent_id": "vm1", "hp": 80} for i in range(5)]
+    rows[3]["hp"] = 10
+    produced.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    assert replay_main([str(bundle), "--diff", str(produced)]) == 1
+    assert "t=3.000000 heartbeat/vm1 hp: expected 80, got 10" in capsys.readouterr().out
+    assert replay_main([str(bundle), "--diff", str(produced), "--t1", "3"]) == 0
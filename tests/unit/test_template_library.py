@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from adapters.dx_capture import FakeScreenCapturePort
+from adapters.vision_numpy import TemplateLibrary, compile_library
+from ports.time import ClockPort
+from ports.vision import Frame
+
+from apps.agent.compose import build_template_library, build_vision, build_vision_scheduler
+from apps.agent.settings import AgentSettings
+from apps.tools.template_lib.main import main as template_lib_main
+
+
+def _scene(h: int = 240, w: int = 320) -> np.ndarray:
+    g = np.kron(np.random.default_rng(0).random((h // 4, w // 4)), np.ones((4, 4)))
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    img[...] = (g[..., None] * 255).astype(np.uint8)
+    return img
+
+
+ICONS = {"bag": (20, 30, 32, 32), "map": (100, 200, 24, 40), "quest": (180, 12, 40, 48)}
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    img = _scene()
+    src = tmp_path / "icons"
+    src.mkdir()
+    for name, (y, x, h, w) in ICONS.items():
+        np.save(src / f"{name}.npy", img[y : y + h, x : x + w])
+    compile_library(src, tmp_path / "lib")
+    return img, tmp_path / "lib"
+
+
+def test_compile_writes_single_bundle_and_manifest(compiled):
+    _, lib_dir = compiled
+    manifest = json.loads((lib_dir / "manifest.json").read_text("utf-8"))
+    assert sorted(manifest["templates"]) == sorted(ICONS)
+    total = sum(h * w for (_, _, h, w) in ICONS.values())
+    assert np.load(lib_dir / "templates.npy").shape == (total,)
+
+
+def test_library_opens_lazily_and_memory_maps(compiled):
+    _, lib_dir = compiled
+    lib = TemplateLibrary(lib_dir)
+    assert not lib.loaded
+    tpl = lib.get("map")
+    assert lib.loaded
+    assert tpl.shape == (24, 40)
+    assert isinstance(tpl.base, np.memmap) or isinstance(tpl.base.base, np.memmap)
+    assert "bag" in lib and "nope" not in lib
+    with pytest.raises(KeyError):
+        lib.get("nope")
+
+
+def test_match_all_returns_positions_and_scores(compiled):
+    img, lib_dir = compiled
+    lib = TemplateLibrary(lib_dir)
+    out = lib.match_all(img)
+    assert set(out) == set(ICONS)
+    for name, (y, x, _, _) in ICONS.items():
+        res = out[name]
+        assert res is not None
+        assert (res.x, res.y) == (x, y)
+        assert res.score == pytest.approx(1.0, abs=1e-4)
+
+    subset = lib.match_all(img, ["bag"])
+    assert list(subset) == ["bag"]
+
+
+def test_compose_and_cli(compiled, tmp_path, capsys):
+    _, lib_dir = compiled
+    assert build_template_library(AgentSettings()) is None
+    lib = build_template_library(AgentSettings(template_library=str(lib_dir)))
+    assert lib is not None and not lib.loaded
+
+    assert template_lib_main([str(tmp_path / "icons"), str(tmp_path / "lib2")]) == 0
+    assert "3 templates" in capsys.readouterr().out
+    assert template_lib_main([str(tmp_path / "missing"), str(tmp_path / "lib3")]) == 2
+
+
+class _SceneCapture(FakeScreenCapturePort):
+    def __init__(self, img: np.ndarray) -> None:
+        super().__init__()
+        self.img = img
+
+    def grab(self, roi=None):
+        return Frame(self.img, 0.0)
+
+
+class _Clock(ClockPort):
+    def now(self) -> float:
+        return 100.0
+
+
+def test_agent_scheduler_matches_the_library_lazily(compiled):
+    img, lib_dir = compiled
+    settings = AgentSettings(template_library=str(lib_dir))
+    lib = build_template_library(settings)
+    assert lib is not None
+    _, bars = build_vision(settings)
+    sched = build_vision_scheduler(settings, _Clock(), _SceneCapture(img), bars, lib)
+    assert "templates" in sched.stats() and not lib.loaded
+    sched.run_pending()
+    hits = sched.latest["templates"]
+    assert sorted(hits) == sorted(ICONS)
+    assert hits["map"][:2] == [200, 100] and hits["map"][2] == pytest.approx(1.0, abs=1e-3)
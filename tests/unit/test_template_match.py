@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from adapters.vision_numpy import NumpyTemplateMatcher, PreparedImage, PreparedTemplate
+from ports.vision import TemplateMatchPort
+
+
+def _scene(h: int = 240, w: int = 320, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    g = rng.random((h // 4, w // 4))
+    # Blocky texture: smooth enough for the pyramid, distinctive enough to match.
+    g = np.kron(g, np.ones((4, 4)))
+    img = np.zeros((h, w, 4), dtype=np.uint8)
+    img[..., :3] = (g[..., None] * 255).astype(np.uint8)
+    img[..., 3] = 255
+    return img
+
+
+def _brute_ncc(gray: np.ndarray, tpl: np.ndarray) -> np.ndarray:
+    th, tw = tpl.shape
+    t = tpl - tpl.mean()
+    out = np.zeros((gray.shape[0] - th + 1, gray.shape[1] - tw + 1))
+    for y in range(out.shape[0]):
+        for x in range(out.shape[1]):
+            win = gray[y : y + th, x : x + tw]
+            wz = win - win.mean()
+            den = np.sqrt((wz * wz).sum()) * np.sqrt((t * t).sum())
+            out[y, x] = (wz * t).sum() / den if den > 1e-9 else 0.0
+    return out
+
+
+def test_ncc_map_matches_brute_force():
+    rng = np.random.default_rng(3)
+    gray = rng.random((30, 41))
+    tpl = gray[7:16, 11:23].copy()
+    fast = PreparedImage(gray).ncc(PreparedTemplate(tpl))
+    np.testing.assert_allclose(fast, _brute_ncc(gray, tpl), atol=1e-9)
+
+
+@pytest.mark.parametrize("max_levels", [0, 3])
+def test_finds_template_with_and_without_pyramid(max_levels):
+    img = _scene()
+    tpl = img[101:149, 203:267].copy()  # 48x64, odd offset
+    m = NumpyTemplateMatcher(max_levels=max_levels, track=False)
+    assert isinstance(m, TemplateMatchPort)
+    assert m.match(img, tpl, threshold=0.95) == (203, 101)
+    res = m.best(img, tpl)
+    assert res is not None and res.score == pytest.approx(1.0)
+
+
+def test_threshold_rejects_absent_template():
+    img = _scene(seed=1)
+    other = _scene(seed=2)[40:88, 40:104].copy()
+    m = NumpyTemplateMatcher(track=False)
+    assert m.match(img, other, threshold=0.9) is None
+
+
+def test_noisy_frame_still_matches():
+    img = _scene()
+    tpl = img[60:92, 40:88].copy()
+    noisy = img.astype(np.int16)
+    noisy[..., :3] += np.random.default_rng(5).integers(-12, 12, size=noisy[..., :3].shape)
+    noisy = np.clip(noisy, 0, 255).astype(np.uint8)
+    m = NumpyTemplateMatcher(track=False)
+    assert m.match(noisy, tpl, threshold=0.8) == (40, 60)
+
+
+def test_hint_and_tracking_use_window_first():
+    img = _scene()
+    tpl = img[120:152, 200:248].copy()
+    m = NumpyTemplateMatcher()
+    assert m.match(img, tpl) == (200, 120)
+
+    prepared = m.prepare(tpl)
+    assert prepared is m.prepare(tpl.copy())  # cached by content
+    assert prepared.last == (200, 120)
+
+    # Shift the scene: the tracked window misses, global search recovers.
+    shifted = np.roll(img, shift=(30, -50), axis=(0, 1))
+    assert m.match(shifted, tpl) == (150, 150)
+    # A hint near the true spot is honoured even with tracking disabled.
+    m2 = NumpyTemplateMatcher(track=False)
+    assert m2.match(shifted, tpl, hint=(145, 155)) == (150, 150)
+
+
+def test_flat_or_oversized_template_is_no_match():
+    img = _scene(64, 64)
+    m = NumpyTemplateMatcher()
+    assert m.match(img, np.full((8, 8), 7, dtype=np.uint8)) is None
+    assert m.match(img, np.zeros((80, 10), dtype=np.uint8)) is None
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+
+from adapters.telemetry import FakeTelemetryPort
+from adapters.time import VirtualClockPort, VirtualSleeperPort
+from domain.agent import AgentService
+
+
+def test_sleep_advances_instantly():
+    clock = VirtualClockPort(start=100.0)
+    sleeper = VirtualSleeperPort(clock)
+    t = time.perf_counter()
+    sleeper.sleep(3600.0)
+    assert time.perf_counter() - t < 0.1
+    assert clock.now() == 3700.0 and sleeper.slept == 3600.0
+    sleeper.sleep(-1.0)
+    assert clock.now() == 3700.0
+
+
+def test_timers_fire_in_order_at_their_deadlines():
+    clock = VirtualClockPort()
+    seen: list[tuple[str, float]] = []
+
+    def at(name: str):
+        return lambda: seen.append((name, clock.now()))
+
+    clock.call_at(2.0, at("b"))
+    clock.call_at(1.0, at("a"))
+    clock.call_at(2.0, at("c"))  # same deadline: scheduling order
+    clock.call_later(5.0, at("late"))
+    assert clock.advance(3.0) == 3
+    assert seen == [("a", 1.0), ("b", 2.0), ("c", 2.0)]
+    assert clock.now() == 3.0 and clock.next_deadline() == 5.0
+
+
+def test_callbacks_can_reschedule_and_cancel():
+    clock = VirtualClockPort()
+    ticks: list[float] = []
+
+    def every_second() -> None:
+        ticks.append(clock.now())
+        clock.call_later(1.0, every_second)
+
+    clock.call_later(1.0, every_second)
+    dropped = clock.call_at(2.5, lambda: ticks.append(-1.0))
+    dropped.cancel()
+    clock.advance_to(4.0)
+    assert ticks == [1.0, 2.0, 3.0, 4.0]
+    assert clock.run_until_idle(limit=6.0) == 2 and clock.now() == 6.0
+
+
+def test_agent_service_runs_replay_timeline_at_cpu_speed():
+    clock = VirtualClockPort(start=10.0)
+    telem = FakeTelemetryPort()
+    svc = AgentService(clock, VirtualSleeperPort(clock), telem, agent_id="vm1", heartbeat_hz=5.0)
+    t = time.perf_counter()
+    assert svc.run_for(120.0) == 600
+    assert time.perf_counter() - t < 1.0
+    stamps = [r["ts"] for r in telem.records]
+    assert stamps[:3] == [10.0, 10.2, 10.4]
+    assert stamps[-1] == 10.0 + 599 * 0.2
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from adapters.vision_numpy import BarSpec, NumpyBarReader
+from ports.vision import ROI
+from shared.config.loader import load_roi_profile
+
+RED = (196, 36, 36)
+BLUE = (40, 84, 204)
+
+
+def _frame(w: int = 400, h: int = 100) -> np.ndarray:
+    img = np.zeros((h, w, 4), dtype=np.uint8)
+    img[..., 3] = 255
+    return img
+
+
+def _paint_bar(img: np.ndarray, roi: ROI, color, fill: float, direction: str = "ltr") -> None:
+    x, y, w, h = roi
+    if direction == "ltr":
+        img[y : y + h, x : x + int(round(w * fill)), :3] = color
+    elif direction == "btt":
+        n = int(round(h * fill))
+        img[y + h - n : y + h, x : x + w, :3] = color
+
+
+def test_horizontal_fill_ratio():
+    roi = ROI(10, 20, 200, 10)
+    img = _frame()
+    _paint_bar(img, roi, RED, 0.4)
+    reader = NumpyBarReader([BarSpec(name="hp", roi=roi, color=RED)])
+    assert reader.read(img)["hp"] == pytest.approx(0.4)
+
+
+def test_tolerates_noise_and_partial_occlusion():
+    roi = ROI(0, 0, 100, 10)
+    img = _frame()
+    _paint_bar(img, roi, RED, 0.75)
+    rng = np.random.default_rng(1)
+    img[:10, :75, :3] = np.clip(
+        img[:10, :75, :3].astype(np.int16) + rng.integers(-20, 20, size=(10, 75, 3)), 0, 255
+    ).astype(np.uint8)
+    img[0:3, 30:40, :3] = 255  # text overlay across a few rows only
+    reader = NumpyBarReader([BarSpec(name="hp", roi=roi, color=RED, tolerance=30)])
+    assert reader.read(img)["hp"] == pytest.approx(0.75)
+
+
+def test_vertical_orb_and_multiple_bars():
+    hp = ROI(0, 0, 20, 50)
+    mana = ROI(100, 0, 300, 8)
+    img = _frame()
+    _paint_bar(img, hp, RED, 0.3, direction="btt")
+    _paint_bar(img, mana, BLUE, 1.0)
+    reader = NumpyBarReader(
+        [
+            BarSpec(name="hp", roi=hp, color=RED, direction="btt"),
+            BarSpec(name="mana", roi=mana, color=BLUE),
+        ]
+    )
+    out = reader.read(img)
+    assert out["hp"] == pytest.approx(0.3)
+    assert out["mana"] == pytest.approx(1.0)
+
+
+def test_no_image_or_roi_outside_frame_gives_none():
+    reader = NumpyBarReader([BarSpec(name="hp", roi=ROI(1000, 1000, 10, 10), color=RED)])
+    assert reader.read(None) == {"hp": None}
+    assert reader.read(_frame()) == {"hp": None}
+
+
+def test_bad_spec_rejected():
+    with pytest.raises(ValueError):
+        NumpyBarReader([BarSpec(name="hp", roi=ROI(0, 0, 0, 10), color=RED)])
+
+
+def test_from_shipped_roi_profile():
+    profile = load_roi_profile("1600x900", env={"EVQ_PROFILE": "dev"})
+    reader = NumpyBarReader.from_profile(profile)
+    assert set(reader.names) == {"hp", "mana"}
+
+    img = _frame(1600, 900)
+    hp = BarSpec.from_table("hp", profile["bars"]["hp"])
+    _paint_bar(img, hp.roi, hp.color, 0.5)
+    out = reader.read(img)
+    assert out["hp"] == pytest.approx(0.5)
+    assert out["mana"] == 0.0
+
+
+def test_missing_roi_profile_is_empty(tmp_path):
+    assert load_roi_profile("640x480", env={"EVQ_ROIS_DIR": str(tmp_path)}) == {}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from adapters.dx_capture import FakeScreenCapturePort
+from domain.agent import VisionScheduler, VisionTask
+from ports.time import ClockPort
+from ports.vision import ROI
+
+from apps.agent.compose import build_vision, build_vision_scheduler
+from apps.agent.settings import AgentSettings
+
+
+class _Clock(ClockPort):
+    def __init__(self) -> None:
+        self.t = 100.0
+
+    def now(self) -> float:
+        return self.t
+
+
+class _Capture(FakeScreenCapturePort):
+    def __init__(self) -> None:
+        super().__init__()
+        self.grabs: list[ROI | None] = []
+
+    def grab(self, roi=None):
+        self.grabs.append(roi)
+        return super().grab(roi)
+
+
+def _run_for(sched: VisionScheduler, clock: _Clock, seconds: float, step: float, **kw) -> None:
+    end = clock.t + seconds
+    while clock.t < end - 1e-9:
+        sched.run_pending(**kw)
+        clock.t = round(clock.t + step, 9)
+
+
+def test_tasks_run_at_their_own_rates():
+    clock = _Clock()
+    calls: dict[str, int] = {"hp": 0, "inv": 0}
+
+    def count(name):
+        def analyze(frame):
+            calls[name] += 1
+            return name
+
+        return analyze
+
+    sched = VisionScheduler(
+        clock,
+        _Capture(),
+        [
+            VisionTask("hp", rate_hz=20.0, analyze=count("hp")),
+            VisionTask("inv", rate_hz=1.0, analyze=count("inv"), priority=5),
+        ],
+    )
+    _run_for(sched, clock, 2.0, 0.005)
+    assert calls == {"hp": 40, "inv": 2}
+    stats = sched.stats()
+    assert abs(stats["hp"]["actual_hz"] - 20.0) < 0.5
+    assert stats["hp"]["skipped"] == 0
+    assert sched.latest == {"hp": "hp", "inv": "inv"}
+
+
+def test_absolute_deadlines_do_not_drift_and_count_missed_slots():
+    clock = _Clock()
+    runs: list[float] = []
+    sched = VisionScheduler(
+        clock, _Capture(), [VisionTask("hp", rate_hz=10.0, analyze=lambda f: runs.append(clock.t))]
+    )
+    # Wake up 30 ms late every time: samples stay on the 100 ms grid.
+    for k in range(5):
+        clock.t = 100.0 + k * 0.1 + 0.03
+        sched.run_pending()
+    assert sched.next_deadline() == 100.5
+    # A 350 ms stall skips three slots instead of bunching them up.
+    clock.t = 100.85
+    sched.run_pending()
+    assert sched.stats()["hp"]["skipped"] == 3
+    assert sched.next_deadline() == 100.9
+
+
+def test_overrun_sheds_low_priority_but_never_critical():
+    clock = _Clock()
+    order: list[str] = []
+
+    def slow(name, cost):
+        def analyze(frame):
+            order.append(name)
+            clock.t += cost
+
+        return analyze
+
+    sched = VisionScheduler(
+        clock,
+        _Capture(),
+        [
+            VisionTask("inv", rate_hz=1.0, analyze=slow("inv", 0.0), priority=9),
+            VisionTask("hp", rate_hz=1.0, analyze=slow("hp", 0.02), priority=0),
+            VisionTask("mana", rate_hz=1.0, analyze=slow("mana", 0.0), priority=1),
+        ],
+    )
+    assert sched.run_pending(budget_s=0.01) == 1
+    assert order == ["hp"]
+    stats = sched.stats()
+    assert stats["mana"]["shed"] == 1 and stats["inv"]["shed"] == 1
+    assert stats["hp"]["shed"] == 0
+
+
+def test_one_grab_per_roi_per_tick():
+    clock = _Clock()
+    capture = _Capture()
+    roi = ROI(0, 0, 10, 10)
+    sched = VisionScheduler(
+        clock,
+        capture,
+        [
+            VisionTask("a", rate_hz=5.0, analyze=lambda f: 1, roi=roi),
+            VisionTask("b", rate_hz=5.0, analyze=lambda f: 2, roi=roi),
+            VisionTask("c", rate_hz=5.0, analyze=lambda f: 3),
+        ],
+    )
+    sched.run_pending()
+    assert capture.grabs == [roi, None]
+
+
+def test_composed_scheduler_has_bar_tasks_from_profile():
+    settings = AgentSettings(roi_profile="1600x900")
+    clock = _Clock()
+    capture, bars = build_vision(settings)
+    sched = build_vision_scheduler(settings, clock, capture, bars)
+    stats = sched.stats()
+    assert stats["hp"]["target_hz"] == 20.0
+    assert stats["mana"]["target_hz"] == 10.0
+    sched.run_pending()
+    assert sched.latest == {"hp": None, "mana": None}  # fake capture has no pixels